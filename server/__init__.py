@@ -22,6 +22,9 @@ def create_app():
     # Add paths to API endpoints
     add_api_endpoints(app)
 
+    # Background jobs configuration
+    add_job_handlers(app)
+
     # Swagger configuration
     Swagger(app)
 
@@ -34,7 +37,12 @@ def add_api_endpoints(app):
     api = Api(app)
 
     from server.api.documents.resources import DocumentApi
-    from server.api.wiki_documents.resources import WikiDocumentApi
+    from server.api.wiki_documents.resources import (
+        WikiDocumentApi,
+        WikiDocumentBulkApi
+    )
+    from server.api.wiki_metrics.resources import WikiMetricsApi
+    from server.api.jobs.resources import JobApi
 
     api.add_resource(
         DocumentApi,
@@ -61,3 +69,37 @@ def add_api_endpoints(app):
         methods=["PATCH"],
         endpoint="update_wiki_doc"
     )
+    api.add_resource(
+        WikiDocumentBulkApi,
+        "/wiki-document/bulk/",
+        methods=["POST"],
+        endpoint="bulk_wiki_docs"
+    )
+    api.add_resource(
+        WikiMetricsApi,
+        "/wiki-metrics/",
+        methods=["GET"]
+    )
+    api.add_resource(
+        JobApi,
+        "/jobs/<string:job_id>",
+        methods=["GET"]
+    )
+
+
+def add_job_handlers(app):
+    from server.services.job_service import job_service
+    from server.services.github_service import GithubService
+    from server.services.wiki_document_service import WikiDocumentService
+
+    job_service.register_handler(
+        "github_document",
+        GithubService.create_document_file
+    )
+    job_service.register_handler(
+        "wiki_document",
+        lambda document_data: (
+            WikiDocumentService().create_document_job(document_data)
+        )
+    )
+    job_service.init_app(app)
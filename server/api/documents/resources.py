@@ -11,6 +11,11 @@ from server.models.serializers.document import (
     is_known_document_content_type,
     turn_fields_optional
 )
+from server.services.job_service import job_service
+from server.api.jobs.resources import (
+    is_async_request,
+    job_accepted_response
+)
 from flask import current_app
 
 
@@ -24,6 +29,11 @@ class DocumentApi(Resource):
         produces:
             - application/json
         parameters:
+            - in: query
+              name: async
+              type: boolean
+              required: false
+              description: Create the file in a background job
             - in: body
               name: body
               required: true
@@ -111,32 +121,22 @@ class DocumentApi(Resource):
         responses:
             201:
                 description: Document created in github
+            202:
+                description: Job creating the document accepted
             409:
                 description: Document already exists in github
             400:
                 description: Error validating request
         """
         try:
-            document_schema = DocumentSchema()
-            document = (
+            if is_async_request():
+                # Reject invalid documents before queueing them
+                document_schema = DocumentSchema()
                 document_schema.load(request.json)
-            )
+                job = job_service.submit("github_document", request.json)
+                return job_accepted_response(job)
 
-            project_information = {
-                "platform": {
-                    "name": document["platform"]["name"]
-                },
-                "organisation": {
-                    "name": document["organisation"]["name"]
-                },
-                "project": {
-                    "id": document["project"]["project_id"]
-                }
-            }
-            github = GithubService(project_information)
-            github_file = github.create_file(
-                document
-            )
+            github_file = GithubService.create_document_file(request.json)
             return {"Success": f"File created {github_file}"}, 201
         except GithubServiceError as e:
             current_app.logger.error(f"Error validating document: {str(e)}")
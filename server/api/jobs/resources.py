@@ -0,0 +1,57 @@
+from flask_restful import Resource, request
+
+from server.services.job_service import job_service, JobService
+
+
+def is_async_request() -> bool:
+    """
+    Check if the client asked for the request to be run as a job
+
+    Returns:
+    bool -- Boolean indicating if the request must be run as a job
+    """
+    return request.args.get("async", "false").lower() in ("true", "1")
+
+
+def job_accepted_response(job: dict) -> tuple:
+    """
+    Generate the response for a request accepted as a job
+
+    Keyword arguments:
+    job -- The queued job
+
+    Returns:
+    tuple -- The response body and status code
+    """
+    return {
+        "jobId": job["id"],
+        "status": job["status"],
+        "location": f"/jobs/{job['id']}"
+    }, 202
+
+
+class JobApi(Resource):
+    def get(self, job_id: str):
+        """
+        Get the status and timings of a job
+        ---
+        tags:
+            - jobs
+        produces:
+            - application/json
+        parameters:
+            - in: path
+              name: job_id
+              description: The id of the job
+              required: true
+              type: string
+        responses:
+            200:
+                description: Job status, timings and outcome
+            404:
+                description: Job not found
+        """
+        job = job_service.get_job(job_id)
+        if job is None:
+            return {"Error": "Job not found"}, 404
+        return JobService.describe_job(job), 200
@@ -1,8 +1,6 @@
 from flask_restful import Resource, request
-from flask import current_app
-from server.services.overview_page_service import OverviewPageService
-from server.services.organisation_page_service import OrganisationPageService
-from server.services.project_page_service import ProjectPageService
+from flask import Response, current_app, stream_with_context
+import json
 import time
 from server.models.serializers.document import (
     DocumentSchema,
@@ -10,7 +8,12 @@ from server.models.serializers.document import (
     turn_fields_optional
 )
 from flask import current_app
-from server.services.wiki_service import WikiService
+from server.services.wiki_document_service import WikiDocumentService
+from server.services.job_service import job_service
+from server.api.jobs.resources import (
+    is_async_request,
+    job_accepted_response
+)
 
 
 class WikiDocumentApi(Resource):
@@ -18,18 +21,25 @@ class WikiDocumentApi(Resource):
         try:
             start = time.time()
 
-            overview_page = OverviewPageService()
-            overview_page.create_page(request.json)
-
-            organisation_page = OrganisationPageService()
-            organisation_page.create_page(request.json)
+            wiki_document_service = WikiDocumentService()
+            if is_async_request():
+                # Reject invalid documents before queueing them
+                wiki_document_service.validate_document(request.json)
+                job = job_service.submit("wiki_document", request.json)
+                return job_accepted_response(job)
 
-            project_page = ProjectPageService()
-            project_page.create_page(request.json)
+            page_results = wiki_document_service.create_document(
+                request.json
+            )
 
             end = time.time()
             current_app.logger.debug(f"TIME: {end - start}")
-            return {"msg": "success"}, 201
+            if wiki_document_service.is_successful(page_results):
+                return {"msg": "success", "pages": page_results}, 201
+            return {
+                "Error": "Error processing request",
+                "pages": page_results
+            }, 404
         except Exception:
             return {"Error": "Error processing request"}, 404
         # except InvalidMediaWikiToken as e:
@@ -45,66 +55,53 @@ class WikiDocumentApi(Resource):
         #     return {"Error": str(e)}, 409
 
     def patch(self, organisation_name: str, project_name: str):
-        # method
-        activities_list_page = "Organised_Editing/Activities"
-        organisation_page_title = f"{activities_list_page}/{organisation_name}"
-        organisation_page = OrganisationPageService()
-        org_page_dictionary = organisation_page.wikitext_to_dict(organisation_page_title)
-        organisation_fields = organisation_page.parse_page_to_serializer(org_page_dictionary)
-
-
-        # method
-        project_page = ProjectPageService()
-        project_page_title = project_name.capitalize().replace(" ", "_")
-        proj_page_dictionary = project_page.wikitext_to_dict(project_name)
-        project_fields = project_page.parse_page_to_serializer(proj_page_dictionary)
-        project_page_fields = project_page.get_page_fields()
+        try:
+            document_schema = DocumentSchema(partial=True)
+            # The fields are validated and written back in the
+            # camel-case keys of the documents
+            update_fields = document_schema.dump(
+                document_schema.load(request.json)
+            )
+
+            wiki_document_service = WikiDocumentService()
+            page_results = wiki_document_service.update_document(
+                organisation_name, project_name, update_fields
+            )
+            if wiki_document_service.is_update_successful(page_results):
+                return {"msg": "success", "pages": page_results}, 201
+            return {
+                "Error": "Error processing request",
+                "pages": page_results
+            }, 404
+        except Exception:
+            return {"Error": "Error processing request"}, 404
 
 
-        document_schema = DocumentSchema(
-            partial=True
-        )
-        updated_fields = (
-            document_schema.load(request.json)
+class WikiDocumentBulkApi(Resource):
+    def post(self):
+        """
+        Write the wiki pages of many documents read from a NDJSON body,
+        one document per line
+        ---
+        tags:
+            - wiki
+        consumes:
+            - application/x-ndjson
+        produces:
+            - application/x-ndjson
+        responses:
+            200:
+                description: NDJSON stream with the result of each
+                             document, written as its batch is done
+        """
+        wiki_document_service = WikiDocumentService()
+        document_results = wiki_document_service.create_documents_stream(
+            request.stream
         )
-
-        # new method
-        if "project" in updated_fields.keys() and "name" in updated_fields["project"].keys():
-            pass
-        
-        # method
-        all_project_fields = {
-            **project_fields["project"], **organisation_fields["project"]
-        }
-
-        old_complete_document = {
-            "project": all_project_fields,
-            "organisation":  organisation_fields["organisation"],
-            "platform":  organisation_fields["platform"]
-        }
-
-
-        document_schema = DocumentSchema()
-        serialized_document = (
-            document_schema.load(old_complete_document)
+        return Response(
+            stream_with_context(
+                json.dumps(document_result) + "\n"
+                for document_result in document_results
+            ),
+            mimetype="application/x-ndjson"
         )
-        for key in updated_fields.keys():
-            for nested_key, value in updated_fields[key].items():
-                if isinstance(updated_fields[key][nested_key], list):
-                    serialized_document[key][nested_key] = list(value)
-                elif isinstance(updated_fields[key][nested_key], dict):
-                    for nested_dict_key in updated_fields[key][nested_key]:
-                        serialized_document[key][nested_key][nested_dict_key] = (
-                             updated_fields[key][nested_key][nested_dict_key]
-                        )
-                else:
-                    serialized_document[key][nested_key] = value
-
-
-        overview_page = OverviewPageService()
-        overview_page.edit_page(serialized_document, updated_fields, old_complete_document)
-
-        organisation_page.edit_page(serialized_document, updated_fields, old_complete_document)
-
-        project_page.edit_page(serialized_document)
-        return {"msg": "success"}, 201
@@ -0,0 +1,32 @@
+from flask_restful import Resource
+
+from server.services.wiki_service import session_pool
+from server.services.page_lane_dispatcher import page_lane_dispatcher
+from server.services.page_write_coalescer import (
+    get_page_write_coalescers_stats
+)
+
+
+class WikiMetricsApi(Resource):
+    def get(self):
+        """
+        Get usage metrics of the MediaWiki API client
+        ---
+        tags:
+            - wiki
+        produces:
+            - application/json
+        responses:
+            200:
+                description: MediaWiki API client metrics
+        """
+        metrics = {
+            "sessionPool": session_pool.get_stats(),
+            "csrfToken": session_pool.token_cache.get_stats(),
+            "pageCache": session_pool.page_cache.get_stats(),
+            "requestScheduler": session_pool.scheduler.get_stats(),
+            "noopEdits": session_pool.noop_edit_filter.get_stats(),
+            "pageWriteCoalescers": get_page_write_coalescers_stats(),
+            "pageLanes": page_lane_dispatcher.get_stats()
+        }
+        return metrics, 200
@@ -26,6 +26,14 @@ class EnvironmentConfig:
         os.path.join(os.path.dirname(__file__), "..", "my_ssh_executable.sh")
     )
 
+    # Durable queue of the background jobs
+    JOB_QUEUE_PATH = os.getenv(
+        "JOB_QUEUE_PATH",
+        os.path.normpath(
+            os.path.join(os.path.dirname(__file__), "..", "jobs.sqlite3")
+        )
+    )
+
     SQLALCHEMY_DATABASE_URI = (
         f"postgresql://{POSTGRES_USER}"
         + f":{POSTGRES_PASSWORD}"
@@ -8,3 +8,18 @@ GITHUB_API_ENDPOINT = "https://api.github.com/"
 WIKI_API_ENDPOINT = os.getenv("WIKI_API_ENDPOINT")
 BOT_NAME = os.getenv("MEDIAWIKI_BOT_NAME")
 BOT_PASSWORD = os.getenv("MEDIAWIKI_BOT_PASSWORD")
+WIKI_SESSION_POOL_SIZE = int(os.getenv("WIKI_SESSION_POOL_SIZE", "10"))
+WIKI_TOKEN_TTL = int(os.getenv("WIKI_TOKEN_TTL", "3600"))
+WIKI_PAGE_CACHE_BYTES = int(os.getenv("WIKI_PAGE_CACHE_BYTES", "16777216"))
+WIKI_PAGE_CACHE_TTL = float(os.getenv("WIKI_PAGE_CACHE_TTL", "5"))
+WIKI_PAGE_WRITE_WORKERS = int(os.getenv("WIKI_PAGE_WRITE_WORKERS", "6"))
+WIKI_COALESCE_WINDOW = float(os.getenv("WIKI_COALESCE_WINDOW", "1"))
+WIKI_COALESCE_MAX_CHANGES = int(os.getenv("WIKI_COALESCE_MAX_CHANGES", "20"))
+WIKI_MAXLAG = int(os.getenv("WIKI_MAXLAG", "5"))
+WIKI_MAX_RETRIES = int(os.getenv("WIKI_MAX_RETRIES", "3"))
+WIKI_EDIT_CONCURRENCY_MAX = int(os.getenv("WIKI_EDIT_CONCURRENCY_MAX", "8"))
+WIKI_EDIT_LATENCY_TARGET = float(os.getenv("WIKI_EDIT_LATENCY_TARGET", "3"))
+WIKI_EDIT_CONFLICT_RETRIES = int(os.getenv("WIKI_EDIT_CONFLICT_RETRIES", "3"))
+WIKI_BULK_BATCH_SIZE = int(os.getenv("WIKI_BULK_BATCH_SIZE", "50"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_SHUTDOWN_TIMEOUT = float(os.getenv("JOB_SHUTDOWN_TIMEOUT", "30"))
@@ -17,6 +17,8 @@ from os import listdir
 from os.path import isfile, join
 from git import Repo
 import shutil
+import threading
+from server.models.serializers.document import DocumentSchema
 
 
 class GithubServiceError(Exception):
@@ -29,6 +31,9 @@ class GithubServiceError(Exception):
 
 
 class GithubService:
+    # All writes go through the same local clone of the repository
+    repository_lock = threading.Lock()
+
     def __init__(self, project_information):
         self.file_folder = "github_files"
         self.platform_name = (
@@ -84,6 +89,38 @@ class GithubService:
         commit_message = f"Add project {str(self.project_id)}"
         self.commit_file(commit_message)
 
+    @classmethod
+    def create_document_file(cls, document_data: dict) -> None:
+        """
+        Validate a document and create its file in the git repository
+
+        Keyword arguments:
+        document_data -- All required data for a project using
+                         Organised Editing Guidelines
+
+        Raises:
+        ValidationError -- Exception raised when the document is invalid
+        """
+        document_schema = DocumentSchema()
+        document = (
+            document_schema.load(document_data)
+        )
+
+        project_information = {
+            "platform": {
+                "name": document["platform"]["name"]
+            },
+            "organisation": {
+                "name": document["organisation"]["name"]
+            },
+            "project": {
+                "id": document["project"]["project_id"]
+            }
+        }
+        with cls.repository_lock:
+            github = cls(project_information)
+            github.create_file(document)
+
     def write_yaml_file_to_local_repo(self, document: str, file_mode: str):
         """
         Write yaml file to the local git repository
@@ -0,0 +1,471 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from flask import current_app
+
+from server.constants import JOB_WORKERS, JOB_SHUTDOWN_TIMEOUT
+
+
+class JobServiceError(Exception):
+    """
+    Custom Exception to notify callers an error occurred when handling jobs.
+    Job handlers raise it with a result to store it with the failed job
+    """
+    def __init__(self, message, result=None):
+        super().__init__(message)
+        self.result = result
+        if current_app:
+            current_app.logger.error(message)
+
+
+class JobQueue:
+    """
+    Durable queue of jobs stored in a local SQLite database, so jobs
+    accepted before a restart are still run after it
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._create_table()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=30,
+                isolation_level=None
+            )
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _create_table(self):
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, "
+            "kind TEXT NOT NULL, "
+            "payload TEXT NOT NULL, "
+            "status TEXT NOT NULL, "
+            "result TEXT, "
+            "error TEXT, "
+            "owner TEXT, "
+            "created_at REAL NOT NULL, "
+            "started_at REAL, "
+            "finished_at REAL)"
+        )
+        self._connection().execute(
+            "CREATE INDEX IF NOT EXISTS jobs_status_created_at "
+            "ON jobs (status, created_at)"
+        )
+
+    def put(self, kind: str, payload: dict) -> dict:
+        """
+        Add a new pending job to the queue
+
+        Keyword arguments:
+        kind -- The kind of the job, selecting the handler running it
+        payload -- The JSON serializable data passed to the handler
+
+        Returns:
+        job -- Dictionary with the queued job
+        """
+        job_id = uuid.uuid4().hex
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), self.PENDING, time.time())
+            )
+        return self.get(job_id)
+
+    def claim(self, owner: str) -> dict:
+        """
+        Mark the oldest pending job as running
+
+        Keyword arguments:
+        owner -- Identifier of the process claiming the job
+
+        Returns:
+        job -- Dictionary with the claimed job, or None if no job
+               is pending
+        """
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT id FROM jobs WHERE status = ? "
+                "ORDER BY created_at, rowid LIMIT 1",
+                (self.PENDING,)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = ?, owner = ?, started_at = ? "
+                "WHERE id = ?",
+                (self.RUNNING, owner, time.time(), row["id"])
+            )
+        return self.get(row["id"])
+
+    def finish(self, job_id: str, result=None, error: str = None):
+        """
+        Mark a running job as succeeded, or as failed if an error
+        is given
+
+        Keyword arguments:
+        job_id -- The id of the job
+        result -- The JSON serializable result of the job
+        error -- The reason the job failed
+        """
+        status = self.FAILED if error is not None else self.SUCCEEDED
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, "
+                "finished_at = ? WHERE id = ?",
+                (status, json.dumps(result), error, time.time(), job_id)
+            )
+
+    def requeue_abandoned(self, is_owner_alive) -> int:
+        """
+        Mark the running jobs of processes that stopped as pending again
+
+        Keyword arguments:
+        is_owner_alive -- Callable checking if the owner of a job
+                          is still running
+
+        Returns:
+        int -- The number of requeued jobs
+        """
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT id, owner FROM jobs WHERE status = ?",
+                (self.RUNNING,)
+            ).fetchall()
+            abandoned_ids = [
+                (row["id"],) for row in rows
+                if not is_owner_alive(row["owner"])
+            ]
+            connection.executemany(
+                "UPDATE jobs SET status = ?, owner = NULL, started_at = NULL "
+                "WHERE id = ?",
+                [(self.PENDING, job_id) for (job_id,) in abandoned_ids]
+            )
+        return len(abandoned_ids)
+
+    def count_pending(self) -> int:
+        """
+        Count the jobs waiting to be run
+
+        Returns:
+        int -- The number of pending jobs
+        """
+        row = self._connection().execute(
+            "SELECT COUNT(*) AS pending FROM jobs WHERE status = ?",
+            (self.PENDING,)
+        ).fetchone()
+        return row["pending"]
+
+    def get(self, job_id: str) -> dict:
+        """
+        Get a job of the queue
+
+        Keyword arguments:
+        job_id -- The id of the job
+
+        Returns:
+        job -- Dictionary with the job, or None if it doesn't exist
+        """
+        row = self._connection().execute(
+            "SELECT * FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+
+class JobService:
+    """
+    In-process worker pool running the jobs of a JobQueue with the
+    handler registered for their kind
+    """
+    def __init__(self, workers: int = JOB_WORKERS,
+                 shutdown_timeout: float = JOB_SHUTDOWN_TIMEOUT):
+        self.workers = workers
+        self.shutdown_timeout = shutdown_timeout
+        self.handlers = {}
+
+        self.app = None
+        self.queue = None
+        self._threads = []
+        self._lock = threading.Lock()
+        self._has_jobs = threading.Condition(self._lock)
+        self._is_stopping = False
+        self._drain_deadline = None
+
+    @property
+    def owner(self) -> str:
+        # Computed on use, as the app may be forked after the
+        # service is created
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def init_app(self, app):
+        """
+        Bind the service to an app, resuming the jobs left pending
+        by a previous run
+
+        Keyword arguments:
+        app -- The Flask app the jobs are run with
+        """
+        if self.app is not None:
+            return
+        self.app = app
+        queue_path = app.config["JOB_QUEUE_PATH"]
+        # Don't create the queue until the first job is submitted
+        if os.path.exists(queue_path):
+            queue = self.get_queue()
+            queue.requeue_abandoned(self.is_owner_alive)
+            if queue.count_pending():
+                self.start()
+        # Drain the jobs from the hook run before the interpreter waits
+        # for its threads, as concurrent.futures shuts down its
+        # executors, e.g. those of the page lanes, once that's done
+        # and an atexit handler could no longer write the pages
+        threading._register_atexit(self.shutdown)
+
+    def get_queue(self) -> JobQueue:
+        """
+        Get the queue of the service, creating it on first use
+
+        Returns:
+        queue -- The JobQueue of the service
+        """
+        with self._lock:
+            if self.queue is None:
+                self.queue = JobQueue(self.app.config["JOB_QUEUE_PATH"])
+            return self.queue
+
+    def register_handler(self, kind: str, handler):
+        """
+        Register the callable running the jobs of a kind
+
+        Keyword arguments:
+        kind -- The kind of the jobs
+        handler -- Callable receiving the job payload and returning
+                   a JSON serializable result
+        """
+        self.handlers[kind] = handler
+
+    def submit(self, kind: str, payload: dict) -> dict:
+        """
+        Queue a new job and wake up a worker to run it
+
+        Keyword arguments:
+        kind -- The kind of the job
+        payload -- The JSON serializable data passed to the handler
+
+        Raises:
+        JobServiceError -- Exception raised when handling jobs
+
+        Returns:
+        job -- Dictionary with the queued job
+        """
+        if kind not in self.handlers:
+            raise JobServiceError(f"Unknown job kind: {kind}")
+        if self._is_stopping:
+            raise JobServiceError("Job service is shutting down")
+        job = self.get_queue().put(kind, payload)
+        self.start()
+        with self._has_jobs:
+            self._has_jobs.notify()
+        return job
+
+    def get_job(self, job_id: str) -> dict:
+        """
+        Get the status, timings and result of a job
+
+        Keyword arguments:
+        job_id -- The id of the job
+
+        Returns:
+        job -- Dictionary with the job, or None if it doesn't exist
+        """
+        if self.queue is None and not os.path.exists(
+           self.app.config["JOB_QUEUE_PATH"]):
+            return None
+        return self.get_queue().get(job_id)
+
+    def start(self):
+        """
+        Start the worker threads unless they are already running
+        """
+        with self._lock:
+            if self._threads:
+                return
+            for worker_number in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"job-worker-{worker_number}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        queue = self.get_queue()
+        while True:
+            if self.is_drain_over():
+                # Leave the jobs pending, to be run on the next start
+                return
+            job = queue.claim(self.owner)
+            if job is None:
+                with self._has_jobs:
+                    if self._is_stopping:
+                        self._has_jobs.notify_all()
+                        return
+                    # Other processes may queue jobs too, so poll
+                    # for them while no job is submitted here
+                    self._has_jobs.wait(timeout=1)
+                continue
+            self.run_job(job)
+
+    def run_job(self, job: dict):
+        """
+        Run a claimed job with the handler of its kind and store
+        its outcome
+
+        Keyword arguments:
+        job -- The claimed job
+        """
+        with self.app.app_context():
+            try:
+                result = self.handlers[job["kind"]](job["payload"])
+            except JobServiceError as e:
+                self.get_queue().finish(
+                    job["id"], result=e.result, error=str(e)
+                )
+            except Exception as e:
+                if self.is_drain_over():
+                    # The interpreter shuts down the executors the
+                    # handlers write pages with once the jobs were
+                    # drained. The job is left running, so the next
+                    # start requeues it
+                    current_app.logger.warning(
+                        f"Job {job['id']} interrupted by shutdown: {str(e)}"
+                    )
+                    return
+                current_app.logger.error(
+                    f"Error running job {job['id']}: {str(e)}"
+                )
+                self.get_queue().finish(job["id"], error=str(e))
+            else:
+                self.get_queue().finish(job["id"], result=result)
+
+    def is_drain_over(self) -> bool:
+        """
+        Check if the service stopped waiting for its workers to drain
+        the pending jobs
+
+        Returns:
+        bool -- Boolean indicating if the shutdown timeout elapsed
+        """
+        return self._is_stopping and time.time() >= self._drain_deadline
+
+    def shutdown(self):
+        """
+        Stop accepting jobs and wait for the workers to drain the
+        pending ones, up to shutdown_timeout seconds. The workers
+        don't claim jobs afterwards, so the jobs still pending are
+        run on the next start
+        """
+        with self._has_jobs:
+            if self._is_stopping:
+                return
+            self._drain_deadline = time.time() + self.shutdown_timeout
+            self._is_stopping = True
+            self._has_jobs.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=max(0, self._drain_deadline - time.time()))
+
+    def is_owner_alive(self, owner: str) -> bool:
+        """
+        Check if the process owning a running job is still running
+
+        Keyword arguments:
+        owner -- The owner of the job, as "hostname:pid"
+
+        Returns:
+        bool -- Boolean indicating if the owner may still be running.
+                Owners on other hosts are assumed to be running
+        """
+        hostname, _, pid = owner.rpartition(":")
+        if hostname != socket.gethostname():
+            return True
+        if int(pid) == os.getpid():
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    @staticmethod
+    def describe_job(job: dict) -> dict:
+        """
+        Describe a job for API responses
+
+        Keyword arguments:
+        job -- The job
+
+        Returns:
+        job_description -- Dictionary with the job status, timings
+                           and outcome
+        """
+        started_at = job["started_at"]
+        finished_at = job["finished_at"]
+        job_description = {
+            "id": job["id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "result": job["result"],
+            "error": job["error"],
+            "createdAt": job["created_at"],
+            "startedAt": started_at,
+            "finishedAt": finished_at,
+            "queuedSeconds": (
+                (started_at or time.time()) - job["created_at"]
+            ),
+            "runSeconds": (
+                (finished_at or time.time()) - started_at
+                if started_at is not None else None
+            )
+        }
+        return job_description
+
+
+job_service = JobService()
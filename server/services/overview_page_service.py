@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 from server.services.wiki_service import (
     WikiService
 )
@@ -5,18 +6,35 @@ from server.services.templates import (
     OverviewPage
 )
 from server.services.wiki_page_service import WikiPageService
-from flask import current_app
-import wikitextparser as wtp
+from server.services.page_codec import OVERVIEW_PAGE_CODEC
+from server.services.page_template import OVERVIEW_PAGE_TEMPLATE
+from server.services.page_write_coalescer import get_page_write_coalescer
+from server.services.wiki_unit_of_work import WikiUnitOfWork
 from server.models.serializers.organisation import OrganisationListSchema
 from server.models.serializers.platform import PlatformListSchema
 
 
 class OverviewPageService(WikiPageService):
+    page_codec = OVERVIEW_PAGE_CODEC
+
     def __init__(self):
         self.activities_list_section = (
             OverviewPage.ACTIVITIES_LIST_SECTION_TITLE.value
         )
 
+    def get_page_title(self, document_data: dict) -> str:
+        """
+        Get the title of the overview page
+
+        Keyword arguments:
+        document_data -- All required data for a project using
+                         Organised Editing Guidelines
+
+        Returns:
+        str -- The title of the overview page
+        """
+        return OverviewPage.PATH.value
+
     def filter_page_data(self, document_data: dict) -> dict:
         """
         Filter required data for the overview page from
@@ -78,17 +96,7 @@ class OverviewPageService(WikiPageService):
                                   parsed to wikitext for the overview
                                   page sections
         """
-        new_row = self.generate_activities_list_table_row(
-            overview_page_data
-        )
-        activities_list_section = (
-            OverviewPage.ACTIVITIES_LIST_SECTION_TITLE.value
-        )
-
-        overview_page_sections = {
-            activities_list_section: new_row
-        }
-        return overview_page_sections
+        return OVERVIEW_PAGE_CODEC.encode(overview_page_data)
 
     def generate_activities_list_table_row(self,
                                            overview_page_data: dict) -> str:
@@ -101,97 +109,22 @@ class OverviewPageService(WikiPageService):
         Returns:
         new_row -- String in wikitext format for a new table row
         """
-        wiki_obj = WikiService()
-
-        organisation_name = overview_page_data["organisation"]["name"]
-        organisation_page_path = (
-            f"{OverviewPage.PATH.value}/"
-            f"{organisation_name}"
-        )
-
-        organisation_link = wiki_obj.hyperlink_wiki_page(
-            organisation_page_path,
-            organisation_name
-        )
-
-        platform_link = wiki_obj.hyperlink_external_link(
-            overview_page_data["platform"]["name"],
-            overview_page_data["platform"]["url"]
-        )
+        return OVERVIEW_PAGE_CODEC.table_field.encode_row(overview_page_data)
 
-        new_row = (
-            f"\n| {organisation_link}\n| {platform_link}\n|-"
-        )
-        return new_row
-
-    def create_page(self, document_data: dict) -> None:
+    def generate_page_text(self, document_data: dict, page: dict) -> str:
         """
-        Creates a wiki page
+        Generate the text of the overview page with a new row for
+        the document
 
         Keyword arguments:
         document_data -- All required data for a project using
                          Organised Editing Guidelines
-        """
-        wiki_obj = WikiService()
-        token = wiki_obj.get_token()
-        wiki_obj.check_token(token)
+        page -- The current overview page
 
-        overview_page_sections = self.document_to_page_sections(
-            document_data
-        )
-        activities_list_section = (
-            OverviewPage.ACTIVITIES_LIST_SECTION_TITLE.value
-        )
-        page_title = OverviewPage.PATH.value
-
-        if wiki_obj.is_existing_page(page_title):
-            page_text = wiki_obj.get_page_text(page_title)
-            updated_page_text = wiki_obj.generate_page_text_from_dict(
-                page_text,
-                "",
-                overview_page_sections,
-                activities_list_section
-            )
-            wiki_obj.edit_page(token, page_title, updated_page_text)
-        else:
-            page_text = (
-                f"=={activities_list_section}==\n"
-                f"{OverviewPage.ACTIVITIES_LIST_TABLE.value}"
-            )
-            updated_page_text = wiki_obj.generate_page_text_from_dict(
-                page_text,
-                "",
-                overview_page_sections,
-                activities_list_section
-            )
-
-            wiki_obj.create_page(
-                token, page_title, updated_page_text
-            )
-
-    def is_table_fields_updated(self, update_fields: dict):
-        table_fields = {
-            "platform": ["name", "url"],
-            "organisation": ["name", "url"]
-        }
-        for table_field in table_fields.keys():
-            if (table_field in update_fields.keys() and
-                any((True for table_column in table_fields[table_field] 
-                         if table_column in list(update_fields[table_field].keys())))):
-               return True
-        return False
-
-    def edit_page(self, document_data: dict, update_fields: dict, old_data: dict):
-        """
-        Edits a wiki page
-
-        Keyword arguments:
-        document_data -- All required data for a project using
-                         Organised Editing Guidelines
+        Returns:
+        updated_page_text -- The updated text of the overview page
         """
         wiki_obj = WikiService()
-        token = wiki_obj.get_token()
-        wiki_obj.check_token(token)
 
         overview_page_sections = self.document_to_page_sections(
             document_data
@@ -199,103 +132,65 @@ class OverviewPageService(WikiPageService):
         activities_list_section = (
             OverviewPage.ACTIVITIES_LIST_SECTION_TITLE.value
         )
-        page_title = OverviewPage.PATH.value
 
-        overview_page_sections = (
-            self.generate_page_sections_dict(document_data)
-        )
-        page_text = wiki_obj.get_page_text(page_title)
-        
-        if self.is_table_fields_updated(update_fields):
-            organisation_name = old_data["organisation"]["name"].strip()
-            organisation_page_path = (
-                f"{OverviewPage.PATH.value}/"
-                f"{organisation_name}"
-            )
-            organisation_name = wiki_obj.hyperlink_wiki_page(
-                organisation_page_path,
-                organisation_name
-            )
-            updated_text = wiki_obj.generate_page_text_from_dict(
-                page_text,
-                "",
-                overview_page_sections,
-                self.activities_list_section,
-                is_edit=True,
-                edit_row_column_data=organisation_name
-            )
+        if page["exists"]:
+            page_text = page["text"]
         else:
-            updated_text = wiki_obj.generate_page_text_from_dict(
-                page_text,
-                "",
-                overview_page_sections,
-                self.activities_list_section
-            )
-        edited_page = wiki_obj.edit_page(
-            token,
-            page_title,
-            updated_text
+            page_text = OVERVIEW_PAGE_TEMPLATE.text
+        updated_page_text = wiki_obj.generate_page_text_from_dict(
+            page_text,
+            "",
+            overview_page_sections,
+            activities_list_section
         )
+        return updated_page_text
 
-
-    def parse_page_to_serializer(self, page_dictionary: dict):
-        """
+    def write_page(self, page_title: str,
+                   unit_of_work: WikiUnitOfWork) -> Future:
         """
-        wiki_obj = WikiService()
-        token = wiki_obj.get_token()
-        wiki_obj.check_token(token)
-
-        overview_page_text = page_dictionary[self.activities_list_section]
-        overview_page_table = wtp.parse(overview_page_text).get_tables()[0]
-        overview_page_data = overview_page_table.data(span=False)
+        Queue the write back of the changes staged for the overview
+        page. The page is shared by all documents, so the changes are
+        applied again to the current page and published with the
+        changes of other API calls in one coalesced edit
 
-        page_dictionary["organisation"] = []
-        page_dictionary["platform"] = []
-
-        for table_row_number, table_row_data in enumerate(overview_page_data[1:], start=1):
-            organisation_column = 0
-            platform_column = 1
-
-            hyperlinked_organisation_url = overview_page_table.cells(
-                row=table_row_number,
-                column=organisation_column
-            ).value
+        Keyword arguments:
+        page_title -- The title of the overview page
+        unit_of_work -- The WikiUnitOfWork holding the changes
 
-            hyperlinked_platform_url = overview_page_table.cells(
-                row=table_row_number,
-                column=platform_column
-            ).value.strip()
+        Returns:
+        future -- Future resolved with the MediaWiki API response of
+                  the coalesced edit
+        """
+        coalescer = get_page_write_coalescer(page_title)
+        return coalescer.submit(unit_of_work.get_change(page_title))
 
-            organisation_name = (
-                hyperlinked_organisation_url.replace("[", "").replace("]", "")
-                                            .replace("\n", "").split(" | ")[1]
-            )
+    def parse_page_to_serializer(self, page_document: dict) -> dict:
+        """
+        Validate the document data read from the overview page
 
-            page_dictionary["organisation"].append(
-                {
-                    "name": organisation_name
-                }
-            )
+        Keyword arguments:
+        page_document -- The document data decoded from the page
 
-            platform_url, platform_name = (
-                hyperlinked_platform_url.replace("[", "").replace("]", "").replace("\n", "").split(" ", 1)
-            )
-            page_dictionary["platform"].append(
-                {
-                    "name": platform_name,
-                    "url": platform_url
-                }
-            )
-        del page_dictionary[self.activities_list_section]
+        Returns:
+        page_dictionary -- The lists of organisations and platforms
+                           of the page activities
+        """
+        activity_rows = page_document["activities"]
+        page_dictionary = {
+            "organisation": [
+                activity_row["organisation"] for activity_row in activity_rows
+            ],
+            "platform": [
+                activity_row["platform"] for activity_row in activity_rows
+            ]
+        }
 
         # validates platform and organisation
         organisation_list_schema = OrganisationListSchema(partial=True)
-        organisation = (
-            organisation_list_schema.load({"organisation":page_dictionary["organisation"]})
+        organisation_list_schema.load(
+            {"organisation": page_dictionary["organisation"]}
         )
 
         platform_list_schema = PlatformListSchema()
-        platform = (
-            platform_list_schema.load({"platform": page_dictionary["platform"]})
-        )
-        return page_dictionary
\ No newline at end of file
+        platform_list_schema.load({"platform": page_dictionary["platform"]})
+        return page_dictionary
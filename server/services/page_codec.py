@@ -0,0 +1,886 @@
+import bisect
+import re
+from collections import namedtuple
+from datetime import datetime
+
+from server.services.page_template import (
+    ORGANISATION_PAGE_TEMPLATE,
+    OVERVIEW_PAGE_TEMPLATE,
+    PROJECT_PAGE_TEMPLATE,
+    PageTemplate
+)
+from server.services.section_index import SectionIndex
+from server.services.table_index import (
+    TableIndex,
+    get_row_cells,
+    get_table_span,
+    iter_table_row_texts
+)
+from server.services.templates import (
+    OrgActivityPage,
+    OverviewPage,
+    ProjectPage
+)
+
+
+WIKI_LINK_PATTERN = r"\[\[([^\[\]|\n]+)(?:\|([^\[\]\n]*))?\]\]"
+EXTERNAL_LINK_PATTERN = r"\[([^\s\[\]]+)(?:[ \t]+([^\[\]\n]*))?\]"
+WIKI_LINK_REGEX = re.compile(WIKI_LINK_PATTERN)
+EXTERNAL_LINK_REGEX = re.compile(EXTERNAL_LINK_PATTERN)
+START_DATE_REGEX = re.compile(r"\d{2}\s\w+\s\d{4}")
+
+DOCUMENT_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+PAGE_DATE_FORMAT = "%d %B %Y"
+HASHTAG = "#"
+ESCAPED_HASHTAG = "<nowiki>#</nowiki>"
+
+
+class PageCodecError(Exception):
+    """
+    Custom Exception to notify callers that a page doesn't hold
+    the document data the page codec expects
+    """
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+
+class WikiLink(namedtuple("WikiLink", ["page", "text"])):
+    """
+    A link to a wiki page, "[[page | text]]" in wikitext
+    """
+    __slots__ = ()
+
+    @property
+    def string(self) -> str:
+        return f"[[{self.page} | {self.text}]]"
+
+    @classmethod
+    def parse(cls, text: str) -> "WikiLink":
+        """
+        Read a link to a wiki page
+
+        Keyword arguments:
+        text -- The wikitext of the link
+
+        Raises:
+        PageCodecError -- Exception raised if the text isn't a link
+                          to a wiki page
+
+        Returns:
+        wiki_link -- The WikiLink, with no text if the link has none
+        """
+        match = WIKI_LINK_REGEX.fullmatch(text.strip())
+        if match is None:
+            raise PageCodecError(f"'{text}' is not a link to a wiki page")
+        return cls.from_groups(*match.groups())
+
+    @classmethod
+    def from_groups(cls, page: str, text: str) -> "WikiLink":
+        """
+        Get the link matched by the groups of WIKI_LINK_PATTERN
+
+        Keyword arguments:
+        page -- The page group
+        text -- The text group, None if the link has no text
+
+        Returns:
+        wiki_link -- The WikiLink
+        """
+        return cls(page.strip(), text.strip() if text is not None else None)
+
+
+class ExternalLink(namedtuple("ExternalLink", ["url", "text"])):
+    """
+    A link to an external page, "[url text]" in wikitext
+    """
+    __slots__ = ()
+
+    @property
+    def string(self) -> str:
+        return f"[{self.url} {self.text}]"
+
+    @classmethod
+    def parse(cls, text: str) -> "ExternalLink":
+        """
+        Read a link to an external page
+
+        Keyword arguments:
+        text -- The wikitext of the link
+
+        Raises:
+        PageCodecError -- Exception raised if the text isn't a link
+                          to an external page
+
+        Returns:
+        external_link -- The ExternalLink, with no text if the link
+                         has none
+        """
+        match = EXTERNAL_LINK_REGEX.fullmatch(text.strip())
+        if match is None:
+            raise PageCodecError(
+                f"'{text}' is not a link to an external page"
+            )
+        return cls.from_groups(*match.groups())
+
+    @classmethod
+    def from_groups(cls, url: str, text: str) -> "ExternalLink":
+        """
+        Get the link matched by the groups of EXTERNAL_LINK_PATTERN
+
+        Keyword arguments:
+        url -- The url group
+        text -- The text group, None if the link has no text
+
+        Returns:
+        external_link -- The ExternalLink
+        """
+        return cls(url, text.strip() if text is not None else None)
+
+
+def format_date_text(str_date: str) -> str:
+    """
+    Format a date of a document into the format "%dd month_name %YYYY"
+
+    Keyword arguments:
+    str_date -- The date being formatted
+
+    Returns:
+    text_date -- The date written in the wiki pages
+    """
+    return datetime.strptime(
+        str_date, DOCUMENT_DATE_FORMAT
+    ).strftime(PAGE_DATE_FORMAT)
+
+
+def parse_date_text(text_date: str) -> str:
+    """
+    Read a date written by format_date_text back into the date
+    format of the documents
+
+    Keyword arguments:
+    text_date -- The text holding the date
+
+    Raises:
+    PageCodecError -- Exception raised if the text holds no date
+
+    Returns:
+    str_date -- The date in the date format of the documents
+    """
+    match = START_DATE_REGEX.search(text_date)
+    if match is None:
+        raise PageCodecError(f"'{text_date}' holds no date")
+    return datetime.strptime(
+        match.group(), PAGE_DATE_FORMAT
+    ).strftime(DOCUMENT_DATE_FORMAT)
+
+
+def format_start_date(str_date: str) -> str:
+    """
+    Format the start date of a project for the Timeframe section
+
+    Keyword arguments:
+    str_date -- The date the project was created
+
+    Returns:
+    start_date_text -- The start date item of the Timeframe section
+    """
+    return f"* '''Start Date:''' {format_date_text(str_date)}"
+
+
+def escape_hashtags(text: str) -> str:
+    """
+    Escape the hashtags of a changeset comment, so the wiki doesn't
+    read them as numbered list items
+
+    Keyword arguments:
+    text -- The changeset comment
+
+    Returns:
+    escaped_text -- The changeset comment with escaped hashtags
+    """
+    return text.replace(HASHTAG, ESCAPED_HASHTAG)
+
+
+def unescape_hashtags(text: str) -> str:
+    """
+    Read a changeset comment escaped by escape_hashtags
+
+    Keyword arguments:
+    text -- The escaped changeset comment
+
+    Returns:
+    text -- The changeset comment
+    """
+    return text.replace(ESCAPED_HASHTAG, HASHTAG)
+
+
+def get_value(document: dict, path: tuple):
+    """
+    Get a value of a document
+
+    Keyword arguments:
+    document -- The document data
+    path -- The keys of the value in the nested dictionaries
+            of the document
+
+    Returns:
+    value -- The value of the document
+    """
+    value = document
+    for key in path:
+        value = value[key]
+    return value
+
+
+def get_document_paths(document: dict, path: tuple = ()):
+    """
+    Get the paths of the values of a document, lists being values
+
+    Keyword arguments:
+    document -- The document data
+    path -- The path of the document in its parent document
+
+    Returns:
+    paths -- Generator yielding the path of each value
+    """
+    for key, value in document.items():
+        if isinstance(value, dict):
+            yield from get_document_paths(value, path + (key,))
+        else:
+            yield path + (key,)
+
+
+def merge_document(document: dict, update_fields: dict) -> dict:
+    """
+    Get a copy of a document with some of its fields updated
+
+    Keyword arguments:
+    document -- The document data
+    update_fields -- The updated fields, nested as in the document
+
+    Returns:
+    updated_document -- The document with the updated fields
+    """
+    updated_document = dict(document)
+    for key, value in update_fields.items():
+        if isinstance(value, dict) and isinstance(document.get(key), dict):
+            updated_document[key] = merge_document(document[key], value)
+        else:
+            updated_document[key] = value
+    return updated_document
+
+
+def set_value(document: dict, path: tuple, value):
+    """
+    Set a value of a document, adding the nested dictionaries
+    missing on its path
+
+    Keyword arguments:
+    document -- The document data
+    path -- The keys of the value in the nested dictionaries
+            of the document
+    value -- The value being set
+    """
+    for key in path[:-1]:
+        document = document.setdefault(key, {})
+    document[path[-1]] = value
+
+
+class TextField:
+    """
+    A value of the document written as text, in a section or in a
+    table cell
+    """
+    # Regular expression of the field in a table cell, as written by
+    # encode, whose groups are read by decode_groups
+    cell_pattern = r"([^\r\n|\[\]{}]*?)"
+
+    def __init__(self, path: tuple, encode_value=str, decode_value=str):
+        self.path = path
+        self.encode_value = encode_value
+        self.decode_value = decode_value
+
+    def encode(self, document: dict) -> str:
+        return self.encode_value(get_value(document, self.path))
+
+    def decode(self, text: str, document: dict):
+        set_value(document, self.path, self.decode_value(text))
+
+    def decode_groups(self, groups: tuple, document: dict):
+        set_value(document, self.path, self.decode_value(groups[0]))
+
+    def get_paths(self) -> tuple:
+        """
+        Get the paths of the document values written by the field
+
+        Returns:
+        paths -- Tuple with the path of each value
+        """
+        return (self.path,)
+
+    def encode_section(self, document: dict) -> str:
+        """
+        Write the field as the text of a section
+
+        Keyword arguments:
+        document -- The document data
+
+        Returns:
+        section_text -- The wikitext of the section
+        """
+        return f"\n{self.encode(document)}\n"
+
+    def decode_section(self, section_text: str, document: dict):
+        """
+        Read the field from the text of a section into a document
+
+        Keyword arguments:
+        section_text -- The wikitext of the section
+        document -- The document data being read
+        """
+        self.decode(section_text.strip("\n"), document)
+
+
+class WikiLinkField(TextField):
+    """
+    A value of the document written as a link to the wiki page
+    with the value as title, after a page prefix
+    """
+    cell_pattern = WIKI_LINK_PATTERN
+
+    def __init__(self, path: tuple, page_prefix: str = ""):
+        super().__init__(path)
+        self.page_prefix = page_prefix
+
+    def encode(self, document: dict) -> str:
+        text = get_value(document, self.path)
+        return WikiLink(f"{self.page_prefix}{text}", text).string
+
+    def decode(self, text: str, document: dict):
+        self.decode_link(WikiLink.parse(text), document)
+
+    def decode_groups(self, groups: tuple, document: dict):
+        # Called for every table row, so no WikiLink is built
+        page, text = groups
+        value = text.strip() if text is not None else None
+        if not value:
+            value = page.strip()[len(self.page_prefix):]
+        set_value(document, self.path, value)
+
+    def decode_link(self, wiki_link: WikiLink, document: dict):
+        value = wiki_link.text
+        if not value:
+            value = wiki_link.page[len(self.page_prefix):]
+        set_value(document, self.path, value)
+
+
+class ExternalLinkField(TextField):
+    """
+    Two values of the document written as a link to an external
+    page, the url and the text of the link
+    """
+    cell_pattern = EXTERNAL_LINK_PATTERN
+
+    def __init__(self, url_path: tuple, text_path: tuple):
+        super().__init__(url_path)
+        self.text_path = text_path
+
+    def encode(self, document: dict) -> str:
+        return ExternalLink(
+            get_value(document, self.path),
+            get_value(document, self.text_path)
+        ).string
+
+    def decode(self, text: str, document: dict):
+        self.decode_link(ExternalLink.parse(text), document)
+
+    def decode_groups(self, groups: tuple, document: dict):
+        url, text = groups
+        set_value(document, self.path, url)
+        set_value(
+            document,
+            self.text_path,
+            text.strip() if text is not None else None
+        )
+
+    def decode_link(self, external_link: ExternalLink, document: dict):
+        set_value(document, self.path, external_link.url)
+        set_value(document, self.text_path, external_link.text)
+
+    def get_paths(self) -> tuple:
+        return (self.path, self.text_path)
+
+
+class TableField:
+    """
+    A list of the document written as the rows of a table, one
+    field per column
+    """
+    def __init__(self, columns: list, rows_path: tuple,
+                 is_document_row: bool = False):
+        """
+        Keyword arguments:
+        columns -- The field of each column, with paths relative to
+                   a row
+        rows_path -- The path where the rows read from the table are
+                     set in the document
+        is_document_row -- Whether the document itself is written as
+                           the only row of the table, instead of the
+                           list at rows_path
+        """
+        self.columns = columns
+        self.rows_path = rows_path
+        self.is_document_row = is_document_row
+
+        # The rows written by encode_row are read with one regular
+        # expression, other rows are split into cells
+        self.row_regex = re.compile("".join(
+            rf"\n\|[ \t]*{column.cell_pattern}[ \t]*"
+            for column in columns
+        ) + "\n")
+        self.column_groups = []
+        group_start = 0
+        for column in columns:
+            group_end = group_start + re.compile(column.cell_pattern).groups
+            self.column_groups.append((column, group_start, group_end))
+            group_start = group_end
+
+    def encode_row(self, row: dict) -> str:
+        """
+        Write a row of the table
+
+        Keyword arguments:
+        row -- The data of the row
+
+        Returns:
+        row_text -- The wikitext of the row
+        """
+        return "".join(
+            f"\n| {column.encode(row)}" for column in self.columns
+        ) + "\n|-"
+
+    def encode_key(self, row: dict) -> str:
+        """
+        Write the first cell of a row, which identifies the row
+        in the table
+
+        Keyword arguments:
+        row -- The data of the row
+
+        Returns:
+        key -- The wikitext of the first cell
+        """
+        return self.columns[0].encode(row)
+
+    def encode_section(self, document: dict) -> str:
+        if self.is_document_row:
+            return self.encode_row(document)
+        return "".join(
+            self.encode_row(row) for row in get_value(document, self.rows_path)
+        )
+
+    def decode_row(self, row_text: str) -> dict:
+        """
+        Read a row of the table
+
+        Keyword arguments:
+        row_text -- The wikitext of the row
+
+        Returns:
+        row -- The data of the row, or None if the row has no cells
+        """
+        row = {}
+        match = self.row_regex.fullmatch(row_text)
+        if match is not None:
+            groups = match.groups()
+            for column, group_start, group_end in self.column_groups:
+                column.decode_groups(groups[group_start:group_end], row)
+            return row
+
+        cells = get_row_cells(row_text)
+        if not cells:
+            return None
+        for column, cell in zip(self.columns, cells):
+            column.decode(cell, row)
+        return row
+
+    def decode_section(self, section_text: str, document: dict):
+        rows = []
+        for row_text in iter_table_row_texts(section_text):
+            row = self.decode_row(row_text)
+            if row is not None:
+                rows.append(row)
+        set_value(document, self.rows_path, rows)
+
+    def get_paths(self) -> tuple:
+        if self.is_document_row:
+            return tuple(
+                path for column in self.columns for path in column.get_paths()
+            )
+        return (self.rows_path,)
+
+    def update_table(self, table: str, document_key: dict,
+                     update_fields: dict) -> str:
+        """
+        Write the updated fields of a document into a table. The row
+        of the document is replaced when the document is written as a
+        row, otherwise all rows are written again from the updated list
+
+        Keyword arguments:
+        table -- The wikitext of the table
+        document_key -- The fields identifying the row of the
+                        document, e.g. the organisation name
+        update_fields -- The updated fields of the document
+
+        Raises:
+        PageCodecError -- Exception raised if the table has no row
+                          for the document
+
+        Returns:
+        updated_table -- The wikitext of the updated table
+        """
+        table_index = TableIndex(table)
+        if not self.is_document_row:
+            return (
+                table_index.header +
+                self.encode_section(update_fields) +
+                table_index.footer
+            )
+
+        # Rows edited by hand are matched by the value of their key
+        key = self.encode_key(document_key)
+        for row_key in table_index.keys():
+            row = self.decode_row(table_index.get_row(row_key))
+            if row is not None and self.encode_key(row) == key:
+                updated_row = merge_document(row, update_fields)
+                table_index.replace_row(row_key, self.encode_row(updated_row))
+                return table_index.string
+        raise PageCodecError(f"The table has no row {key}")
+
+
+# A field of a page spec, with the titles of its section and of
+# the parent section, None for the fields of first level sections
+class CompiledField(namedtuple(
+        "CompiledField", ["parent_title", "title", "field"])):
+    __slots__ = ()
+
+    @property
+    def section_path(self) -> str:
+        if self.parent_title is None:
+            return self.title
+        return f"{self.parent_title}/{self.title}"
+
+
+class PageCodec:
+    """
+    The spec of a page type, the fields of the document written in
+    each section of the page, compiled against the page template
+    into an encoder and a decoder of the page
+    """
+    def __init__(self, page_template: PageTemplate, spec: dict):
+        """
+        Keyword arguments:
+        page_template -- The compiled template of the page
+        spec -- Dictionary of the fields written in each section,
+                with a dictionary of fields by child section for the
+                sections with child sections
+        """
+        self.page_template = page_template
+        self.fields = []
+        self.table_field = None
+        self.table_section_title = None
+        # Map of the path of each document value to the fields
+        # writing it
+        self.dependency_map = {}
+
+        for title, section_spec in spec.items():
+            if isinstance(section_spec, dict):
+                for child_title, field in section_spec.items():
+                    self.compile_field(title, child_title, field)
+            else:
+                self.compile_field(None, title, section_spec)
+
+    def compile_field(self, parent_title: str, title: str, field):
+        """
+        Check the section of a field exists in the page template and
+        add the field to the codec
+
+        Keyword arguments:
+        parent_title -- The title of the parent section, or None
+        title -- The title of the section
+        field -- The field written in the section
+
+        Raises:
+        PageCodecError -- Exception raised if the page template has no
+                          such section, or no table for a TableField
+        """
+        section = self.get_section(
+            self.page_template.section_index, parent_title, title
+        )
+        if section is None:
+            raise PageCodecError(
+                f"The page template has no section {title}"
+            )
+        if isinstance(field, TableField):
+            if (self.table_field is not None or
+                    self.page_template.get_table_anchor(section) is None):
+                raise PageCodecError(
+                    f"The section {title} must hold the only table "
+                    f"of the page"
+                )
+            self.table_field = field
+            self.table_section_title = title
+        compiled_field = CompiledField(parent_title, title, field)
+        self.fields.append(compiled_field)
+        for path in field.get_paths():
+            self.dependency_map.setdefault(path, []).append(compiled_field)
+
+    def get_section(self, section_index: SectionIndex, parent_title: str,
+                    title: str):
+        """
+        Get the section of a field
+
+        Keyword arguments:
+        section_index -- The SectionIndex of the page
+        parent_title -- The title of the parent section, or None
+        title -- The title of the section
+
+        Returns:
+        section -- The IndexedSection, or None if the page has
+                   no such section
+        """
+        if parent_title is None:
+            return section_index.get_section(title)
+        parent_section = section_index.get_section(parent_title)
+        if parent_section is None:
+            return None
+        section = section_index.get_section(title, parent_section.start)
+        if section is None or section.start >= parent_section.end:
+            return None
+        return section
+
+    def encode(self, document: dict) -> dict:
+        """
+        Write a document into the wikitext of each section of the page
+
+        Keyword arguments:
+        document -- The document data
+
+        Returns:
+        page_sections -- Dictionary with the wikitext of each section,
+                         as read by generate_page_text_from_dict
+        """
+        page_sections = {}
+        for parent_title, title, field in self.fields:
+            section_text = field.encode_section(document)
+            if parent_title is None:
+                page_sections[title] = section_text
+            else:
+                page_sections.setdefault(parent_title, {})[title] = (
+                    section_text
+                )
+        return page_sections
+
+    def decode(self, text: str) -> dict:
+        """
+        Read the document written in the text of a page
+
+        Keyword arguments:
+        text -- The text of the page
+
+        Raises:
+        PageCodecError -- Exception raised if the page misses a section
+                          or a section doesn't hold its field
+
+        Returns:
+        document -- The document data written in the page
+        """
+        section_index = SectionIndex(text)
+        document = {}
+        for parent_title, title, field in self.fields:
+            section = self.get_section(section_index, parent_title, title)
+            if section is None:
+                raise PageCodecError(f"The page has no section {title}")
+            field.decode_section(section.contents, document)
+        return document
+
+    def get_updated_fields(self, update_fields: dict) -> list:
+        """
+        Get the fields of the page writing updated document values
+
+        Keyword arguments:
+        update_fields -- The updated fields of the document, nested
+                         as in the document
+
+        Returns:
+        updated_fields -- List with the CompiledField of each field
+                          writing an updated value, in page spec order
+        """
+        updated_fields = set()
+        for path in get_document_paths(update_fields):
+            updated_fields.update(self.dependency_map.get(path, ()))
+        return [
+            compiled_field for compiled_field in self.fields
+            if compiled_field in updated_fields
+        ]
+
+    def update(self, text: str, document_key: dict,
+               update_fields: dict) -> str:
+        """
+        Write the updated fields of a document into the text of a
+        page. Only the sections of the fields writing updated values
+        are written again, the rest of the page is kept as it is
+
+        Keyword arguments:
+        text -- The text of the page
+        document_key -- The fields identifying the row of the document
+                        in the table of the page
+        update_fields -- The updated fields of the document, nested
+                         as in the document
+
+        Raises:
+        PageCodecError -- Exception raised if the page misses a section
+                          or a section doesn't hold its field
+
+        Returns:
+        updated_text -- The updated text of the page
+        """
+        section_index = SectionIndex(text)
+        section_starts = [
+            section.start for section in section_index.sections
+        ]
+
+        text_edits = []
+        for parent_title, title, field in self.get_updated_fields(
+                update_fields):
+            section = self.get_section(section_index, parent_title, title)
+            if section is None:
+                raise PageCodecError(f"The page has no section {title}")
+            # The text of the section ends where the next section,
+            # child sections included, starts
+            next_section_number = bisect.bisect_right(
+                section_starts, section.start
+            )
+            section_text_end = (
+                section_starts[next_section_number]
+                if next_section_number < len(section_starts) else len(text)
+            )
+
+            if isinstance(field, TableField):
+                table_span = get_table_span(
+                    text, section.title_end, section_text_end
+                )
+                if table_span is None:
+                    raise PageCodecError(f"The section {title} has no table")
+                table_start, table_end = table_span
+                text_edits.append((
+                    table_start,
+                    table_end,
+                    field.update_table(
+                        text[table_start:table_end],
+                        document_key,
+                        update_fields
+                    )
+                ))
+            else:
+                page_document = {}
+                field.decode_section(
+                    text[section.title_end:section_text_end], page_document
+                )
+                text_edits.append((
+                    section.title_end,
+                    section_text_end,
+                    field.encode_section(
+                        merge_document(page_document, update_fields)
+                    )
+                ))
+
+        # Sections are replaced from the end of the page, so the
+        # positions of the sections before them don't change
+        for start, end, section_text in sorted(text_edits, reverse=True):
+            text = text[:start] + section_text + text[end:]
+        return text
+
+
+OVERVIEW_PAGE_CODEC = PageCodec(OVERVIEW_PAGE_TEMPLATE, {
+    OverviewPage.ACTIVITIES_LIST_SECTION_TITLE.value: TableField(
+        [
+            WikiLinkField(
+                ("organisation", "name"),
+                page_prefix=f"{OverviewPage.PATH.value}/"
+            ),
+            ExternalLinkField(("platform", "url"), ("platform", "name"))
+        ],
+        rows_path=("activities",),
+        is_document_row=True
+    )
+})
+
+ORGANISATION_PAGE_CODEC = PageCodec(ORGANISATION_PAGE_TEMPLATE, {
+    OrgActivityPage.ORGANISATION_SECTION.value: {
+        OrgActivityPage.ORGANISATION_LINK_SECTION.value: ExternalLinkField(
+            ("organisation", "url"), ("organisation", "name")
+        ),
+        OrgActivityPage.ORGANISATION_DESCRIPTION_SECTION.value: TextField(
+            ("organisation", "description")
+        )
+    },
+    OrgActivityPage.PLATFORM_SECTION.value: {
+        OrgActivityPage.PLATFORM_LINK_SECTION.value: ExternalLinkField(
+            ("platform", "url"), ("platform", "name")
+        )
+    },
+    OrgActivityPage.PROJECT_SECTION.value: {
+        OrgActivityPage.PROJECT_LIST_SECTION.value: TableField(
+            [
+                WikiLinkField(("project", "name")),
+                ExternalLinkField(("platform", "url"), ("platform", "name")),
+                TextField(("project", "author")),
+                TextField(("project", "status"))
+            ],
+            rows_path=("projects",),
+            is_document_row=True
+        )
+    }
+})
+
+PROJECT_PAGE_CODEC = PageCodec(PROJECT_PAGE_TEMPLATE, {
+    ProjectPage.SHORT_DESCRIPTION_SECTION.value: TextField(
+        ("project", "shortDescription")
+    ),
+    ProjectPage.TIMEFRAME_SECTION.value: TextField(
+        ("project", "created"),
+        encode_value=format_start_date,
+        decode_value=parse_date_text
+    ),
+    ProjectPage.URL_SECTION.value: TextField(("project", "url")),
+    ProjectPage.EXTERNAL_SOURCES_SECTION.value: {
+        ProjectPage.INSTRUCTIONS_SECTION.value: TextField(
+            ("project", "externalSource", "instructions")
+        ),
+        ProjectPage.PER_TASK_INSTRUCTIONS_SECTION.value: TextField(
+            ("project", "externalSource", "perTaskInstructions")
+        ),
+        ProjectPage.IMAGERY_SECTION.value: TextField(
+            ("project", "externalSource", "imagery")
+        ),
+        ProjectPage.LICENSE_SECTION.value: TextField(
+            ("project", "externalSource", "license")
+        )
+    },
+    ProjectPage.HASHTAG_SECTION.value: TextField(
+        ("project", "changesetComment"),
+        encode_value=escape_hashtags,
+        decode_value=unescape_hashtags
+    ),
+    ProjectPage.TEAM_AND_USER_SECTION.value: {
+        ProjectPage.USERS_LIST_SECTION.value: TableField(
+            [
+                TextField(("userId",), decode_value=int),
+                TextField(("userName",))
+            ],
+            rows_path=("project", "users")
+        )
+    }
+})
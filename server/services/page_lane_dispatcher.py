@@ -0,0 +1,181 @@
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from flask import current_app, has_app_context
+
+from server.constants import WIKI_PAGE_WRITE_WORKERS
+
+
+class PageLane:
+    """
+    Serial lane running the wiki operations of the pages hashed onto
+    it one at a time, in the order they were submitted
+    """
+    def __init__(self, number: int):
+        self.number = number
+        self.executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"page-lane-{number}"
+        )
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = None
+
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        """
+        Queue an operation on the lane
+
+        Keyword arguments:
+        func -- The operation
+        args -- The positional arguments of the operation
+        kwargs -- The keyword arguments of the operation
+
+        Returns:
+        future -- Future resolved with the result of the operation
+        """
+        app = current_app._get_current_object() if has_app_context() else None
+        submitted_at = time.monotonic()
+
+        def run():
+            started_at = time.monotonic()
+            is_failed = True
+            try:
+                with app.app_context() if app is not None else nullcontext():
+                    result = func(*args, **kwargs)
+                is_failed = False
+                return result
+            finally:
+                self.record(
+                    started_at - submitted_at,
+                    time.monotonic() - submitted_at,
+                    is_failed
+                )
+
+        with self._lock:
+            self.submitted += 1
+        return self.executor.submit(run)
+
+    def record(self, wait: float, latency: float, is_failed: bool):
+        """
+        Record a finished operation
+
+        Keyword arguments:
+        wait -- Seconds the operation waited in the queue of the lane
+        latency -- Seconds from its submission to its end
+        is_failed -- Boolean indicating if the operation raised
+        """
+        with self._lock:
+            self.completed += 1
+            if is_failed:
+                self.failed += 1
+            self.total_wait += wait
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self.last_latency = latency
+
+    def get_stats(self) -> dict:
+        """
+        Get the usage statistics of the lane
+
+        Returns:
+        stats -- Dictionary with the lane usage statistics
+        """
+        with self._lock:
+            stats = {
+                "lane": self.number,
+                "depth": self.submitted - self.completed,
+                "completed": self.completed,
+                "failed": self.failed,
+                "mean_wait": (
+                    self.total_wait / self.completed
+                    if self.completed else None
+                ),
+                "mean_latency": (
+                    self.total_latency / self.completed
+                    if self.completed else None
+                ),
+                "max_latency": self.max_latency,
+                "last_latency": self.last_latency
+            }
+        return stats
+
+
+class PageLaneDispatcher:
+    """
+    Dispatches wiki operations onto a fixed set of serial lanes by
+    their target page title. Operations on the same page run in order
+    and never race each other, while pages hashed onto different
+    lanes, e.g. the pages of different organisations, are written
+    in parallel
+    """
+    def __init__(self, lanes: int = WIKI_PAGE_WRITE_WORKERS):
+        self.lanes = [PageLane(number) for number in range(lanes)]
+
+    @staticmethod
+    def normalize_title(page_title: str) -> str:
+        """
+        Normalize a page title the way MediaWiki does, so the titles
+        of the same page are dispatched onto the same lane
+
+        Keyword arguments:
+        page_title -- The title of the page
+
+        Returns:
+        page_title -- The title with spaces in place of underscores
+                      and its first letter in upper case
+        """
+        page_title = page_title.replace("_", " ").strip()
+        return page_title[:1].upper() + page_title[1:]
+
+    def get_lane(self, page_title: str) -> PageLane:
+        """
+        Get the lane of a page, hashing its title with CRC-32
+
+        Keyword arguments:
+        page_title -- The title of the page
+
+        Returns:
+        lane -- The PageLane of the page
+        """
+        title_hash = zlib.crc32(
+            self.normalize_title(page_title).encode("utf-8")
+        )
+        return self.lanes[title_hash % len(self.lanes)]
+
+    def submit(self, page_title: str, func, *args, **kwargs) -> Future:
+        """
+        Queue an operation on the lane of its target page
+
+        Keyword arguments:
+        page_title -- The title of the page the operation writes
+        func -- The operation
+        args -- The positional arguments of the operation
+        kwargs -- The keyword arguments of the operation
+
+        Returns:
+        future -- Future resolved with the result of the operation
+        """
+        return self.get_lane(page_title).submit(func, *args, **kwargs)
+
+    def get_stats(self) -> list:
+        """
+        Get the usage statistics of the lanes
+
+        Returns:
+        stats -- List with the usage statistics of each lane
+        """
+        return [lane.get_stats() for lane in self.lanes]
+
+
+# Shared by all requests and jobs, bounding the number of pages
+# written at once
+page_lane_dispatcher = PageLaneDispatcher()
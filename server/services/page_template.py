@@ -0,0 +1,126 @@
+from collections import namedtuple
+
+from server.services.section_index import IndexedSection, SectionIndex
+from server.services.table_index import get_header_end, get_table_span
+from server.services.templates import (
+    OrgActivityPage,
+    OverviewPage,
+    ProjectPage
+)
+
+
+# Position of a table in the text of a page: where it starts, where
+# its header ends and new rows are added, and where it ends
+TableAnchor = namedtuple("TableAnchor", ["start", "header_end", "end"])
+
+
+class PageTemplate:
+    """
+    The text of a wiki page compiled into the position of its
+    sections and of the table of each section. Pages are rendered
+    from it by copying the text between those positions and filling
+    in the data of each section, without scanning the text again
+    """
+    def __init__(self, text: str):
+        self.text = text
+        self.section_index = SectionIndex(text)
+        self.sections = self.section_index.sections
+        self._table_anchors = {}
+
+    def compile_tables(self):
+        """
+        Locate the table of every section up front, so the template
+        is only read once compiled
+        """
+        for section in self.sections:
+            self.get_table_anchor(section)
+
+    def get_section(self, section_title: str,
+                    start: int = 0) -> IndexedSection:
+        """
+        Get the first section of the template with a title
+
+        Keyword arguments:
+        section_title -- The title of the section
+        start -- The position of the text where the search starts
+
+        Returns:
+        section -- The section with the title, or None if the template
+                   has no such section
+        """
+        return self.section_index.get_section(section_title, start)
+
+    def get_table_anchor(self, section: IndexedSection) -> TableAnchor:
+        """
+        Get the position of the first table of a section
+
+        Keyword arguments:
+        section -- The section in which the table is searched
+
+        Returns:
+        table_anchor -- The TableAnchor of the table, or None if the
+                        section has no table
+        """
+        if section.start not in self._table_anchors:
+            table_span = get_table_span(
+                self.text, section.title_end, section.end
+            )
+            table_anchor = None
+            if table_span is not None:
+                table_start, table_end = table_span
+                table_anchor = TableAnchor(
+                    table_start,
+                    table_start + get_header_end(
+                        self.text[table_start:table_end]
+                    ),
+                    table_end
+                )
+            self._table_anchors[section.start] = table_anchor
+        return self._table_anchors[section.start]
+
+
+_compiled_page_templates = {}
+
+
+def compile_page_template(text: str) -> PageTemplate:
+    """
+    Compile a constant page template once, so every page rendered
+    from it reuses the compiled template
+
+    Keyword arguments:
+    text -- The text of the page template
+
+    Returns:
+    page_template -- The compiled PageTemplate
+    """
+    page_template = PageTemplate(text)
+    page_template.compile_tables()
+    _compiled_page_templates[text] = page_template
+    return page_template
+
+
+def get_page_template(text: str) -> PageTemplate:
+    """
+    Get the compiled template of a page text, compiling it when it
+    isn't one of the constant page templates
+
+    Keyword arguments:
+    text -- The text of a page or page template
+
+    Returns:
+    page_template -- The PageTemplate of the text
+    """
+    page_template = _compiled_page_templates.get(text)
+    if page_template is None:
+        page_template = PageTemplate(text)
+    return page_template
+
+
+OVERVIEW_PAGE_TEMPLATE = compile_page_template(
+    f"=={OverviewPage.ACTIVITIES_LIST_SECTION_TITLE.value}==\n"
+    f"{OverviewPage.ACTIVITIES_LIST_TABLE.value}"
+)
+ORGANISATION_PAGE_TEMPLATE = compile_page_template(
+    OrgActivityPage.PAGE_TEMPLATE.value
+)
+PROJECT_PAGE_TEMPLATE = compile_page_template(ProjectPage.PAGE_TEMPLATE.value)
@@ -0,0 +1,236 @@
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+from flask import current_app, has_app_context
+
+from server.constants import (
+    WIKI_COALESCE_WINDOW,
+    WIKI_COALESCE_MAX_CHANGES,
+    WIKI_EDIT_CONFLICT_RETRIES
+)
+from server.services.page_lane_dispatcher import page_lane_dispatcher
+from server.services.wiki_service import (
+    WikiEditConflictError,
+    WikiService
+)
+
+
+class PageWriteCoalescer:
+    """
+    Collects the changes submitted for a wiki page while an edit of
+    the page is being published and publishes them as a single edit,
+    applied to one fetched copy of the page. A change submitted while
+    no edit is being published is published at once
+    """
+    def __init__(self, page_title: str,
+                 window: float = WIKI_COALESCE_WINDOW,
+                 max_changes: int = WIKI_COALESCE_MAX_CHANGES,
+                 max_conflict_retries: int = WIKI_EDIT_CONFLICT_RETRIES):
+        self.page_title = page_title
+        self.window = window
+        self.max_changes = max_changes
+        self.max_conflict_retries = max_conflict_retries
+
+        self.pending_changes = []
+        self.batches = 0
+        self.changes = 0
+        self.largest_batch = 0
+
+        self._publishing_batches = 0
+        self._lock = threading.Lock()
+        self._is_batch_ready = threading.Condition(self._lock)
+
+    def submit(self, change) -> Future:
+        """
+        Add a change to the next edit of the page
+
+        Keyword arguments:
+        change -- Callable receiving the page, as returned by
+                  WikiService.get_pages, and returning its new text
+
+        Returns:
+        future -- Future resolved with the MediaWiki API response of
+                  the edit once the batch with the change is published
+        """
+        future = Future()
+        app = current_app._get_current_object() if has_app_context() else None
+        with self._lock:
+            self.pending_changes.append((change, future))
+            if len(self.pending_changes) == 1:
+                threading.Thread(
+                    target=self._publish_after_window,
+                    args=(app,),
+                    name=f"page-write-coalescer:{self.page_title}",
+                    daemon=True
+                ).start()
+            elif len(self.pending_changes) >= self.max_changes:
+                self._is_batch_ready.notify()
+        return future
+
+    def _publish_after_window(self, app):
+        with self._lock:
+            # Changes submitted while another batch is being published
+            # are collected until it's done, up to window seconds
+            deadline = time.monotonic() + self.window
+            while (self._publishing_batches and
+                   len(self.pending_changes) < self.max_changes):
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                self._is_batch_ready.wait(timeout=timeout)
+            batch = self.pending_changes
+            self.pending_changes = []
+            self._publishing_batches += 1
+
+        def publish_batch():
+            try:
+                with app.app_context() if app is not None else nullcontext():
+                    self.publish(batch)
+            finally:
+                with self._lock:
+                    self._publishing_batches -= 1
+                    self._is_batch_ready.notify_all()
+        # Batches are published on the lane of the page, one at a time
+        # and in order with the other writes of the page
+        page_lane_dispatcher.submit(self.page_title, publish_batch)
+
+    def publish(self, batch: list):
+        """
+        Apply a batch of changes to the current page and save the
+        result as one edit. A change failing to apply fails only its
+        own future. When the page is edited by someone else in the
+        meantime, the page is read again and the changes are applied
+        to the new revision, up to max_conflict_retries times
+
+        Keyword arguments:
+        batch -- List of (change, future) tuples
+        """
+        for attempt in range(self.max_conflict_retries + 1):
+            try:
+                wiki_obj = WikiService()
+                token = wiki_obj.get_token()
+                page = wiki_obj.get_pages([self.page_title])[self.page_title]
+            except Exception as e:
+                for change, future in batch:
+                    future.set_exception(e)
+                return
+
+            page_text, batch = self.apply_changes(page, batch)
+            if not batch:
+                return
+
+            try:
+                if page["exists"]:
+                    data = wiki_obj.edit_page_sections(
+                        token, self.page_title, page["text"], page_text,
+                        base_revid=page["revid"],
+                        base_timestamp=page["timestamp"]
+                    )
+                else:
+                    data = wiki_obj.create_page(
+                        token, self.page_title, page_text
+                    )
+            except WikiEditConflictError as e:
+                if attempt < self.max_conflict_retries:
+                    continue
+                for change, future in batch:
+                    future.set_exception(e)
+                return
+            except Exception as e:
+                for change, future in batch:
+                    future.set_exception(e)
+                return
+
+            with self._lock:
+                self.batches += 1
+                self.changes += len(batch)
+                self.largest_batch = max(self.largest_batch, len(batch))
+            for change, future in batch:
+                future.set_result(data)
+            return
+
+    def apply_changes(self, page: dict, batch: list) -> tuple:
+        """
+        Apply a batch of changes one after another to a page. A change
+        failing to apply fails its own future and is left out
+
+        Keyword arguments:
+        page -- The page, as returned by WikiService.get_pages
+        batch -- List of (change, future) tuples
+
+        Returns:
+        applied_changes -- Tuple with the text of the page with the
+                           changes applied and the list of the
+                           (change, future) tuples applied
+        """
+        page_text = page["text"]
+        applied_batch = []
+        for change, future in batch:
+            current_page = {
+                **page,
+                "exists": page["exists"] or page_text is not None,
+                "text": page_text
+            }
+            try:
+                page_text = change(current_page)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                applied_batch.append((change, future))
+        return page_text, applied_batch
+
+    def get_stats(self) -> dict:
+        """
+        Get the usage statistics of the coalescer
+
+        Returns:
+        stats -- Dictionary with the coalescer usage statistics
+        """
+        with self._lock:
+            stats = {
+                "window": self.window,
+                "max_changes": self.max_changes,
+                "pending": len(self.pending_changes),
+                "publishing": self._publishing_batches,
+                "batches": self.batches,
+                "changes": self.changes,
+                "largest_batch": self.largest_batch
+            }
+        return stats
+
+
+_coalescers = {}
+_coalescers_lock = threading.Lock()
+
+
+def get_page_write_coalescer(page_title: str) -> PageWriteCoalescer:
+    """
+    Get the coalescer of a page, creating it on first use
+
+    Keyword arguments:
+    page_title -- The title of the page
+
+    Returns:
+    coalescer -- The PageWriteCoalescer of the page
+    """
+    with _coalescers_lock:
+        if page_title not in _coalescers:
+            _coalescers[page_title] = PageWriteCoalescer(page_title)
+        return _coalescers[page_title]
+
+
+def get_page_write_coalescers_stats() -> dict:
+    """
+    Get the usage statistics of all coalescers
+
+    Returns:
+    stats -- Dictionary mapping each page title to the usage
+             statistics of its coalescer
+    """
+    with _coalescers_lock:
+        coalescers = dict(_coalescers)
+    return {
+        page_title: coalescer.get_stats()
+        for page_title, coalescer in coalescers.items()
+    }
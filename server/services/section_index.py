@@ -0,0 +1,102 @@
+import re
+
+
+class IndexedSection:
+    """
+    A section of a wiki page located by a SectionIndex
+    """
+    def __init__(self, text: str, title: str, level: int,
+                 start: int, title_end: int, end: int):
+        self.text = text
+        self.title = title
+        self.level = level
+        self.start = start
+        self.title_end = title_end
+        self.end = end
+
+    @property
+    def span(self) -> tuple:
+        """
+        The starting and ending position of the section in the text
+        """
+        return self.start, self.end
+
+    @property
+    def title_span(self) -> tuple:
+        """
+        The starting and ending position of the section's title,
+        including its section markers
+        """
+        return self.start, self.title_end
+
+    @property
+    def string(self) -> str:
+        """
+        The text of the section, including its title and child sections
+        """
+        return self.text[self.start:self.end]
+
+    @property
+    def contents(self) -> str:
+        """
+        The text of the section after its title
+        """
+        return self.text[self.title_end:self.end]
+
+    def __repr__(self):
+        return f"IndexedSection({self.title!r}, level={self.level})"
+
+
+class SectionIndex:
+    """
+    Index of the sections of a wiki page, built by scanning the
+    text once. Sections are located the way wikitextparser does:
+    a section starts at its title and ends before the next title
+    of the same or a higher level
+    """
+    SECTION_TITLE_REGEX = re.compile(
+        r"^(={1,6})([^\n]+?)\1[ \t]*$", re.MULTILINE
+    )
+
+    def __init__(self, text: str):
+        self.text = text
+        self.sections = []
+        self.sections_by_title = {}
+
+        open_sections = []
+        for match in self.SECTION_TITLE_REGEX.finditer(text):
+            level = len(match.group(1))
+            while open_sections and open_sections[-1].level >= level:
+                open_sections.pop().end = match.start()
+            section = IndexedSection(
+                text,
+                match.group(2),
+                level,
+                match.start(),
+                match.end(1) + len(match.group(2)) + level,
+                len(text)
+            )
+            open_sections.append(section)
+            self.sections.append(section)
+            # Titles may repeat, e.g. "Link"
+            self.sections_by_title.setdefault(section.title, []).append(
+                section
+            )
+
+    def get_section(self, section_title: str,
+                    start: int = 0) -> IndexedSection:
+        """
+        Get the first section of the text with a title
+
+        Keyword arguments:
+        section_title -- The title of the section
+        start -- The position of the text where the search starts
+
+        Returns:
+        section -- The section with the title, or None if the text
+                   has no such section
+        """
+        for section in self.sections_by_title.get(section_title, []):
+            if section.start >= start:
+                return section
+        return None
@@ -0,0 +1,402 @@
+import bisect
+import re
+
+
+ROW_SEPARATOR_REGEX = re.compile(r"^\|-.*$", re.MULTILINE)
+TABLE_END_REGEX = re.compile(r"^\|\}", re.MULTILINE)
+CELL_MARKUP_REGEX = re.compile(r"\[\[|\]\]|\{\{|\}\}|\|\||!!|\|")
+TABLE_MARKER_REGEX = re.compile(r"^[ \t:]*(\{\||\|\})", re.MULTILINE)
+
+
+def get_table_span(text: str, start: int = 0, end: int = None) -> tuple:
+    """
+    Get the position of the first table of a text, nested tables
+    included
+
+    Keyword arguments:
+    text -- The wikitext in which the table is searched
+    start -- The position where the search starts
+    end -- The position where the search ends, the end of the text
+           by default
+
+    Returns:
+    span -- Tuple with the starting and ending position of the
+            table, or None if the text has no table
+    """
+    depth = 0
+    table_start = None
+    end = len(text) if end is None else end
+    for match in TABLE_MARKER_REGEX.finditer(text, start, end):
+        if match.group(1) == "{|":
+            if depth == 0:
+                table_start = match.start(1)
+            depth += 1
+        elif depth > 0:
+            depth -= 1
+            if depth == 0:
+                return table_start, match.end(1)
+    if table_start is not None:
+        return table_start, end
+    return None
+
+
+def get_header_end(table: str) -> int:
+    """
+    Get the position right after the header of a table, where its
+    first row starts. Only the lines of the header are scanned, so
+    the cost doesn't depend on the number of rows
+
+    Keyword arguments:
+    table -- The wikitext of the table
+
+    Returns:
+    header_end -- The position of the end of the row separator
+                  closing the header
+    """
+    header_end = table.find("\n")
+    if header_end == -1:
+        return len(table)
+    has_header_cells = False
+    line_start = header_end + 1
+    while line_start < len(table):
+        line_end = table.find("\n", line_start)
+        if line_end == -1:
+            line_end = len(table)
+        line = table[line_start:line_end].lstrip()
+        if line.startswith("|-"):
+            header_end = line_end
+            if has_header_cells:
+                return header_end
+        elif line.startswith("!"):
+            has_header_cells = True
+        elif line.startswith("|}"):
+            return line_start - 1 if has_header_cells else header_end
+        elif line.startswith("|") and not line.startswith("|+"):
+            # The table has no header, rows start after the first
+            # row separator
+            return header_end
+        line_start = line_end + 1
+    return header_end
+
+
+def split_cell_markup(text: str, separator: str) -> list:
+    """
+    Split wikitext on a separator, ignoring separators inside links
+    and templates, e.g. the "|" of "[[page | text]]"
+
+    Keyword arguments:
+    text -- The wikitext being split
+    separator -- The separator, "|" or "||"
+
+    Returns:
+    parts -- List with the parts of the text
+    """
+    if separator not in text or ("[[" not in text and "{{" not in text):
+        return text.split(separator)
+    parts = []
+    depth = 0
+    part_start = 0
+    for match in CELL_MARKUP_REGEX.finditer(text):
+        token = match.group()
+        if token in ("[[", "{{"):
+            depth += 1
+        elif token in ("]]", "}}"):
+            depth = max(depth - 1, 0)
+        elif depth == 0 and token == separator:
+            parts.append(text[part_start:match.start()])
+            part_start = match.end()
+    parts.append(text[part_start:])
+    return parts
+
+
+def get_row_cells(row: str) -> list:
+    """
+    Get the values of the cells of a table row
+
+    Keyword arguments:
+    row -- The wikitext of the row, e.g. "\\n| a\\n| b\\n|-"
+
+    Returns:
+    cells -- List with the stripped value of each cell
+    """
+    cells = []
+    for line in row.split("\n"):
+        if not line or line[0] not in "|!" or line[:2] in ("|-", "|}", "|+"):
+            continue
+        cell_markup = line[1:]
+        if "|" not in cell_markup and (
+                line[0] == "|" or "!!" not in cell_markup):
+            # A single cell without attributes
+            cells.append(cell_markup.strip())
+            continue
+        cell_separator = "||" if line[0] == "|" else "!!"
+        for cell in split_cell_markup(cell_markup, cell_separator):
+            # Remove the attributes of the cell, e.g. 'style="" | value'
+            value = split_cell_markup(cell, "|")[-1]
+            cells.append(value.strip())
+    return cells
+
+
+def iter_table_row_texts(text: str):
+    """
+    Read the wikitext of the rows of the first table of a wikitext
+    in one pass, skipping the header of the table
+
+    Keyword arguments:
+    text -- The wikitext holding the table
+
+    Returns:
+    rows -- Generator yielding the wikitext of each row without its
+            row separator, e.g. "\\n| a\\n| b\\n". The text after
+            the last row separator is yielded last
+    """
+    table_span = get_table_span(text)
+    if table_span is None:
+        return
+    table = text[table_span[0]:table_span[1]]
+
+    row_start = get_header_end(table)
+    for separator in ROW_SEPARATOR_REGEX.finditer(table, row_start):
+        yield table[row_start:separator.start()]
+        row_start = separator.end()
+    # The last row may not be closed by a row separator
+    yield table[row_start:]
+
+
+def iter_table_rows(text: str):
+    """
+    Read the rows of the first table of a wikitext in one pass,
+    skipping the header of the table
+
+    Keyword arguments:
+    text -- The wikitext holding the table
+
+    Returns:
+    rows -- Generator yielding the list of cell values of each row,
+            as returned by get_row_cells
+    """
+    for row in iter_table_row_texts(text):
+        cells = get_row_cells(row)
+        if cells:
+            yield cells
+
+
+class TableIndex:
+    """
+    Index of the rows of a wiki table keyed by the value of one of
+    its columns, e.g. the organisation link of the activities list.
+
+    The table is split once into its header, its rows and its end.
+    A row is the text of its cells followed by the row separator
+    closing it, the format of the rows written by the page services:
+    "\\n| [[Project | Project]]\\n| Active\\n|-". Rows are looked up,
+    replaced and deleted in constant time, inserted without updating
+    the index of the other rows, and the table is written back by
+    joining its parts, without parsing it again.
+    """
+    def __init__(self, table: str, key_column: int = 0):
+        self.key_column = key_column
+
+        header_end = get_header_end(table)
+        table_end = TABLE_END_REGEX.search(table, header_end)
+        rows_end = table_end.start() - 1 if table_end else len(table)
+        row_starts = [header_end] + [
+            match.end()
+            for match in ROW_SEPARATOR_REGEX.finditer(
+                table, header_end + 1, rows_end
+            )
+        ]
+
+        self.header = table[:row_starts[0]]
+        # Rows are numbered by id in the order they were added, ids
+        # never change, and _order lists the ids in the order of the
+        # table, so inserting a row doesn't renumber the others
+        self._rows = [
+            table[row_start:row_end]
+            for row_start, row_end in zip(row_starts, row_starts[1:])
+        ]
+        last_row = table[row_starts[-1]:rows_end]
+        if get_row_cells(last_row):
+            # Close the last row, so rows can be added after it
+            self._rows.append(f"{last_row}\n|-")
+            self.footer = table[rows_end:]
+        else:
+            self.footer = table[row_starts[-1]:]
+        self._keys = [self.get_row_key(row) for row in self._rows]
+        self._order = list(range(len(self._rows)))
+        self._sort_keys = [(key or "").casefold() for key in self._keys]
+        self._row_ids = {}
+        for row_id, key in enumerate(self._keys):
+            self._row_ids.setdefault(key, []).append(row_id)
+
+    def get_row_key(self, row: str) -> str:
+        """
+        Get the key of a row, the value of its key column
+
+        Keyword arguments:
+        row -- The wikitext of the row
+
+        Returns:
+        key -- The value of the key column, or None if the row
+               has no such column
+        """
+        cells = get_row_cells(row)
+        if len(cells) <= self.key_column:
+            return None
+        return cells[self.key_column]
+
+    def add_row_id(self, key: str, row_id: int):
+        """
+        Add a row to the index, after the rows with the same key
+        placed before it in the table
+
+        Keyword arguments:
+        key -- The value of the key column of the row
+        row_id -- The id of the row
+        """
+        row_ids = self._row_ids.setdefault(key, [])
+        if row_ids:
+            # Rows sharing a key are rare, their positions are only
+            # looked up to keep them in the order of the table
+            positions = [self._order.index(other) for other in row_ids]
+            row_ids.insert(
+                bisect.bisect(positions, self._order.index(row_id)), row_id
+            )
+        else:
+            row_ids.append(row_id)
+
+    def pop_row_id(self, key: str) -> int:
+        """
+        Remove the first row with a key from the index
+
+        Keyword arguments:
+        key -- The value of the key column of the row
+
+        Returns:
+        row_id -- The id of the row, or None if no row has the key
+        """
+        row_ids = self._row_ids.get(key)
+        if not row_ids:
+            return None
+        row_id = row_ids.pop(0)
+        if not row_ids:
+            del self._row_ids[key]
+        return row_id
+
+    def __len__(self) -> int:
+        return sum(1 for row in self._rows if row is not None)
+
+    def __contains__(self, key: str) -> bool:
+        return key.strip() in self._row_ids
+
+    def keys(self) -> list:
+        """
+        Get the keys of the rows, in the order of the table
+
+        Returns:
+        keys -- List with the key of each row
+        """
+        return [
+            self._keys[row_id] for row_id in self._order
+            if self._rows[row_id] is not None
+        ]
+
+    def get_row(self, key: str) -> str:
+        """
+        Get the first row with a key
+
+        Keyword arguments:
+        key -- The value of the key column of the row
+
+        Returns:
+        row -- The wikitext of the row, or None if no row has the key
+        """
+        row_ids = self._row_ids.get(key.strip())
+        if not row_ids:
+            return None
+        return self._rows[row_ids[0]]
+
+    def replace_row(self, key: str, new_row: str) -> bool:
+        """
+        Replace the first row with a key
+
+        Keyword arguments:
+        key -- The value of the key column of the row being replaced
+        new_row -- The wikitext of the new row
+
+        Returns:
+        bool -- Boolean indicating if a row with the key was replaced
+        """
+        row_id = self.pop_row_id(key.strip())
+        if row_id is None:
+            return False
+        new_key = self.get_row_key(new_row)
+        self._rows[row_id] = new_row
+        if new_key != self._keys[row_id]:
+            self._keys[row_id] = new_key
+            self._sort_keys[self._order.index(row_id)] = (
+                (new_key or "").casefold()
+            )
+        self.add_row_id(new_key, row_id)
+        return True
+
+    def delete_row(self, key: str) -> bool:
+        """
+        Delete the first row with a key
+
+        Keyword arguments:
+        key -- The value of the key column of the row being deleted
+
+        Returns:
+        bool -- Boolean indicating if a row with the key was deleted
+        """
+        row_id = self.pop_row_id(key.strip())
+        if row_id is None:
+            return False
+        self._rows[row_id] = None
+        return True
+
+    def insert_row(self, new_row: str, row_number: int = 0):
+        """
+        Insert a row into the table. The new row gets the next id, so
+        the index is updated in place instead of being rebuilt
+
+        Keyword arguments:
+        new_row -- The wikitext of the new row
+        row_number -- The position of the row, the first row after
+                      the header by default
+        """
+        new_key = self.get_row_key(new_row)
+        row_id = len(self._rows)
+        self._rows.append(new_row)
+        self._keys.append(new_key)
+        self._order.insert(row_number, row_id)
+        self._sort_keys.insert(row_number, (new_key or "").casefold())
+        self.add_row_id(new_key, row_id)
+
+    def insert_row_sorted(self, new_row: str):
+        """
+        Insert a row before the first row with a greater key, so a
+        table sorted by its key column stays sorted
+
+        Keyword arguments:
+        new_row -- The wikitext of the new row
+        """
+        new_key = (self.get_row_key(new_row) or "").casefold()
+        self.insert_row(
+            new_row, bisect.bisect_right(self._sort_keys, new_key)
+        )
+
+    @property
+    def string(self) -> str:
+        """
+        The wikitext of the table
+        """
+        rows = "".join(
+            self._rows[row_id] for row_id in self._order
+            if self._rows[row_id] is not None
+        )
+        return f"{self.header}{rows}{self.footer}"
+
+    def __str__(self) -> str:
+        return self.string
@@ -0,0 +1,411 @@
+import json
+from flask import current_app
+from server.constants import WIKI_BULK_BATCH_SIZE
+from server.services.overview_page_service import OverviewPageService
+from server.services.organisation_page_service import (
+    OrganisationPageService
+)
+from server.services.project_page_service import ProjectPageService
+from server.services.job_service import JobServiceError
+from server.services.wiki_service import WikiService
+from server.services.wiki_unit_of_work import WikiUnitOfWork
+
+
+class WikiDocumentService:
+    PAGE_WRITE_SUCCESS = "ok"
+
+    def get_page_services(self) -> dict:
+        """
+        Get the page services writing the wiki pages of a document
+
+        Returns:
+        page_services -- Dictionary mapping each page name to the
+                         service writing it
+        """
+        page_services = {
+            "overview": OverviewPageService(),
+            "organisation": OrganisationPageService(),
+            "project": ProjectPageService()
+        }
+        return page_services
+
+    def validate_document(self, document_data: dict):
+        """
+        Validate a document by checking the titles of its wiki pages
+        and rendering them as new pages, without reading or writing
+        the wiki
+
+        Keyword arguments:
+        document_data -- All required data for a project using
+                         Organised Editing Guidelines
+
+        Raises:
+        Exception -- Exception raised when the document is invalid
+        """
+        for page_service in self.get_page_services().values():
+            page_title = page_service.get_page_title(document_data)
+            WikiService.validate_page_title(page_title)
+            new_page = {"title": page_title, "exists": False, "text": None}
+            page_service.generate_page_text(document_data, new_page)
+
+    def write_back_pages(self, page_writers: dict,
+                         unit_of_work: WikiUnitOfWork) -> dict:
+        """
+        Write back the staged pages of a unit of work, each one on the
+        lane of its page, so different pages are written concurrently.
+        The pages are independent, so a failure writing one of them
+        doesn't stop the others from being written
+
+        Keyword arguments:
+        page_writers -- Dictionary mapping the title of each staged
+                        page to the service writing it
+        unit_of_work -- The WikiUnitOfWork holding the staged pages
+
+        Returns:
+        page_results -- Dictionary mapping each page title to "ok" or
+                        to the reason writing the page failed
+        """
+        page_writes = {
+            page_title: page_service.write_page(page_title, unit_of_work)
+            for page_title, page_service in page_writers.items()
+        }
+
+        page_results = {}
+        for page_title, page_write in page_writes.items():
+            try:
+                page_write.result()
+                page_results[page_title] = self.PAGE_WRITE_SUCCESS
+            except Exception as e:
+                current_app.logger.debug(
+                    f"Error writing page {page_title}: {str(e)}"
+                )
+                page_results[page_title] = f"failed: {str(e)}"
+        return page_results
+
+    def get_page_titles(self, page_services: dict,
+                        document_data: dict) -> list:
+        """
+        Get the titles of the pages of a document, leaving out the
+        pages whose title can't be read from the document
+
+        Keyword arguments:
+        page_services -- Dictionary mapping each page name to the
+                         service writing it
+        document_data -- All required data for a project using
+                         Organised Editing Guidelines
+
+        Returns:
+        page_titles -- List with the title of each page
+        """
+        page_titles = []
+        for page_service in page_services.values():
+            try:
+                page_titles.append(page_service.get_page_title(document_data))
+            except (KeyError, TypeError):
+                # Invalid documents fail when their pages are rendered
+                continue
+        return page_titles
+
+    def create_documents(self, documents: list) -> list:
+        """
+        Write all wiki pages of many documents. The pages are read
+        ahead in one batch and the documents are rendered against that
+        snapshot, grouped by page: the rows of all documents of an
+        organisation are staged on its page, and the rows of all
+        organisations on the overview page. Each page is then written
+        back once, the project pages concurrently
+
+        Keyword arguments:
+        documents -- List of documents, each with all required data
+                     for a project using Organised Editing Guidelines
+
+        Returns:
+        document_results -- List with the page results of each
+                            document, mapping each page name to "ok"
+                            or to the reason writing the page failed
+        """
+        page_services = self.get_page_services()
+        unit_of_work = WikiUnitOfWork()
+        unit_of_work.read_ahead([
+            page_title
+            for document_data in documents
+            for page_title in self.get_page_titles(
+                page_services, document_data
+            )
+        ])
+
+        document_titles = []
+        document_results = []
+        page_writers = {}
+        for document_data in documents:
+            page_titles = {}
+            page_results = {}
+            for page_name, page_service in page_services.items():
+                try:
+                    page_titles[page_name] = page_service.stage_page(
+                        document_data, unit_of_work
+                    )
+                    page_writers[page_titles[page_name]] = page_service
+                except Exception as e:
+                    current_app.logger.debug(
+                        f"Error rendering {page_name} page: {str(e)}"
+                    )
+                    page_results[page_name] = f"failed: {str(e)}"
+            document_titles.append(page_titles)
+            document_results.append(page_results)
+
+        title_results = self.write_back_pages(page_writers, unit_of_work)
+        for page_titles, page_results in zip(
+                document_titles, document_results):
+            for page_name, page_title in page_titles.items():
+                page_results[page_name] = title_results[page_title]
+        return [
+            {
+                page_name: page_results[page_name]
+                for page_name in page_services
+            }
+            for page_results in document_results
+        ]
+
+    def create_document(self, document_data: dict) -> dict:
+        """
+        Write all wiki pages of a document. The pages are read ahead in
+        one batch, rendered against that snapshot and written back
+        concurrently, so the number of wiki requests doesn't depend on
+        the page services
+
+        Keyword arguments:
+        document_data -- All required data for a project using
+                         Organised Editing Guidelines
+
+        Returns:
+        page_results -- Dictionary mapping each page name to "ok" or
+                        to the reason writing the page failed
+        """
+        return self.create_documents([document_data])[0]
+
+    def create_documents_batch(self, batch: list):
+        """
+        Write all wiki pages of a batch of documents read from NDJSON
+        lines
+
+        Keyword arguments:
+        batch -- List of (line_number, document_data) tuples
+
+        Returns:
+        document_results -- Generator yielding the result of each
+                            document. When the batch fails as a whole,
+                            e.g. reading its pages ahead or fetching
+                            the edit token fails, every document of the
+                            batch is reported as failed
+        """
+        try:
+            document_results = self.create_documents([
+                document_data for line_number, document_data in batch
+            ])
+        except Exception as e:
+            current_app.logger.debug(f"Failed to write batch: {str(e)}")
+            for line_number, document_data in batch:
+                yield {
+                    "line": line_number,
+                    "organisation": document_data["organisation"]["name"],
+                    "project": document_data["project"]["name"],
+                    "result": f"failed: {str(e)}"
+                }
+            return
+        for (line_number, document_data), page_results in zip(
+                batch, document_results):
+            yield {
+                "line": line_number,
+                "organisation": document_data["organisation"]["name"],
+                "project": document_data["project"]["name"],
+                "result": (
+                    self.PAGE_WRITE_SUCCESS
+                    if self.is_successful(page_results) else "failed"
+                ),
+                "pages": page_results
+            }
+
+    def create_documents_stream(self, lines,
+                                batch_size: int = WIKI_BULK_BATCH_SIZE):
+        """
+        Write all wiki pages of the documents of a NDJSON stream. The
+        lines are read incrementally and written in batches of
+        documents, so each organisation page and the overview page are
+        edited once per batch with the rows of all its documents
+
+        Keyword arguments:
+        lines -- Iterable of NDJSON lines, one document per line
+        batch_size -- The number of documents of each batch
+
+        Returns:
+        document_results -- Generator yielding the result of each
+                            document as soon as its batch is written.
+                            The results of invalid lines are yielded
+                            right away, so results carry the number of
+                            their line
+        """
+        batch = []
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                document_data = json.loads(line)
+                # Reject invalid documents before writing any page
+                self.validate_document(document_data)
+            except Exception as e:
+                current_app.logger.debug(
+                    f"Invalid document on line {line_number}: {str(e)}"
+                )
+                yield {"line": line_number, "result": f"failed: {str(e)}"}
+                continue
+
+            batch.append((line_number, document_data))
+            if len(batch) >= batch_size:
+                yield from self.create_documents_batch(batch)
+                batch = []
+        if batch:
+            yield from self.create_documents_batch(batch)
+
+    def get_document_key(self, organisation_name: str,
+                         project_name: str) -> dict:
+        """
+        Get the fields identifying a document in its wiki pages
+
+        Keyword arguments:
+        organisation_name -- The name of the organisation
+        project_name -- The name of the project
+
+        Returns:
+        document_key -- Document with the organisation and project
+                        names, read with spaces in place of underscores
+                        as MediaWiki reads page titles
+        """
+        return {
+            "organisation": {"name": organisation_name.replace("_", " ")},
+            "project": {"name": project_name.replace("_", " ")}
+        }
+
+    def update_document(self, organisation_name: str, project_name: str,
+                        update_fields: dict) -> dict:
+        """
+        Write the updated fields of a document into the sections of
+        its wiki pages displaying them. Only those pages are fetched
+        and edited
+
+        Keyword arguments:
+        organisation_name -- The name of the organisation, before
+                             the update
+        project_name -- The name of the project, before the update
+        update_fields -- The updated fields of the document, as loaded
+                         by a partial DocumentSchema
+
+        Returns:
+        page_results -- Dictionary mapping the name of each page
+                        displaying updated fields to its title, the
+                        path of its updated sections and "ok" or the
+                        reason editing the page failed
+        """
+        document_key = self.get_document_key(organisation_name, project_name)
+
+        page_services = {
+            page_name: page_service
+            for page_name, page_service in self.get_page_services().items()
+            if page_service.get_updated_sections(update_fields)
+        }
+        if not page_services:
+            return {}
+
+        unit_of_work = WikiUnitOfWork()
+        unit_of_work.read_ahead([
+            page_service.get_page_title(document_key)
+            for page_service in page_services.values()
+        ])
+
+        page_titles = {}
+        page_results = {}
+        for page_name, page_service in page_services.items():
+            page_results[page_name] = {
+                "title": page_service.get_page_title(document_key)
+            }
+            try:
+                page_results[page_name]["sections"] = (
+                    page_service.stage_page_update(
+                        document_key, update_fields, unit_of_work
+                    )
+                )
+                page_titles[page_name] = page_results[page_name]["title"]
+            except Exception as e:
+                current_app.logger.debug(
+                    f"Error rendering {page_name} page: {str(e)}"
+                )
+                page_results[page_name].update({
+                    "sections": page_service.get_updated_sections(
+                        update_fields
+                    ),
+                    "result": f"failed: {str(e)}"
+                })
+
+        title_results = self.write_back_pages(
+            {
+                page_title: page_services[page_name]
+                for page_name, page_title in page_titles.items()
+            },
+            unit_of_work
+        )
+        for page_name, page_title in page_titles.items():
+            page_results[page_name]["result"] = title_results[page_title]
+        return page_results
+
+    def is_update_successful(self, page_results: dict) -> bool:
+        """
+        Check if all wiki pages of an updated document were edited
+
+        Keyword arguments:
+        page_results -- The results returned by update_document
+
+        Returns:
+        bool -- Boolean indicating if all pages were edited
+        """
+        return all(
+            page_result["result"] == self.PAGE_WRITE_SUCCESS
+            for page_result in page_results.values()
+        )
+
+    def is_successful(self, page_results: dict) -> bool:
+        """
+        Check if all wiki pages of a document were written
+
+        Keyword arguments:
+        page_results -- The results returned by create_document
+
+        Returns:
+        bool -- Boolean indicating if all pages were written
+        """
+        return all(
+            page_result == self.PAGE_WRITE_SUCCESS
+            for page_result in page_results.values()
+        )
+
+    def create_document_job(self, document_data: dict) -> dict:
+        """
+        Write all wiki pages of a document from a job
+
+        Keyword arguments:
+        document_data -- All required data for a project using
+                         Organised Editing Guidelines
+
+        Raises:
+        JobServiceError -- Exception raised when a page wasn't written,
+                           carrying the results of all pages
+
+        Returns:
+        page_results -- Dictionary mapping each page name to "ok"
+        """
+        page_results = self.create_document(document_data)
+        if not self.is_successful(page_results):
+            raise JobServiceError(
+                "Failed to write the wiki pages of the document",
+                result=page_results
+            )
+        return page_results
@@ -1,15 +1,18 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
 from server.models.serializers.document import (
     DocumentSchema
 )
-from server.services.wiki_service import (
-    WikiService
-)
-import re
-from flask import current_app
+from server.services.wiki_service import WikiServiceError
+from server.services.page_lane_dispatcher import page_lane_dispatcher
+from server.services.section_index import SectionIndex
+from server.services.wiki_unit_of_work import WikiUnitOfWork
 
 
 class WikiPageService(ABC):
+    # The PageCodec encoding and decoding the sections of the page
+    page_codec = None
+
     def document_to_page_sections(self, document_data: dict) -> dict:
         """
         Generate dict containing the document content
@@ -43,50 +46,172 @@ class WikiPageService(ABC):
         )
         return page_sections_data
 
-    def wikitext_to_dict(self, page_title):
-        wiki_obj = WikiService()
-        token = wiki_obj.get_token()
-        wiki_obj.check_token(token)
+    def stage_page(self, document_data: dict,
+                   unit_of_work: WikiUnitOfWork) -> str:
+        """
+        Render the page of a document against the snapshot of a unit
+        of work and stage it to be written back
+
+        Keyword arguments:
+        document_data -- All required data for a project using
+                         Organised Editing Guidelines
+        unit_of_work -- The WikiUnitOfWork of the API call
+
+        Returns:
+        page_title -- The title of the staged page
+        """
+        page_title = self.get_page_title(document_data)
+        unit_of_work.stage(
+            page_title,
+            lambda page: self.generate_page_text(document_data, page)
+        )
+        return page_title
+
+    def write_page(self, page_title: str,
+                   unit_of_work: WikiUnitOfWork) -> Future:
+        """
+        Queue the write back of the changes staged for a page on the
+        lane of the page, so writes of the same page run in order
+
+        Keyword arguments:
+        page_title -- The title of the page
+        unit_of_work -- The WikiUnitOfWork holding the changes
+
+        Returns:
+        future -- Future resolved with the MediaWiki API response of
+                  the edit
+        """
+        return page_lane_dispatcher.submit(
+            page_title, unit_of_work.write_back, page_title
+        )
+
+    def get_updated_sections(self, update_fields: dict) -> list:
+        """
+        Get the sections of the page displaying the updated fields of
+        a document, read from the dependency map of the page codec
+
+        Keyword arguments:
+        update_fields -- The updated fields of the document
+
+        Returns:
+        updated_sections -- List with the path of each section, e.g.
+                            "Projects/Project list"
+        """
+        return [
+            compiled_field.section_path for compiled_field in
+            self.page_codec.get_updated_fields(update_fields)
+        ]
+
+    def generate_updated_page_text(self, page: dict, document_key: dict,
+                                   update_fields: dict) -> str:
+        """
+        Generate the text of a page with the sections displaying the
+        updated fields of a document written again
+
+        Keyword arguments:
+        page -- The current page
+        document_key -- The organisation and project names identifying
+                        the document before the update
+        update_fields -- The updated fields of the document
+
+        Raises:
+        WikiServiceError -- Exception raised if the page doesn't exist
+
+        Returns:
+        updated_text -- The updated text of the page
+        """
+        if not page["exists"]:
+            raise WikiServiceError(f"The page {page['title']} doesn't exist")
+        return self.page_codec.update(
+            page["text"], document_key, update_fields
+        )
+
+    def stage_page_update(self, document_key: dict, update_fields: dict,
+                          unit_of_work: WikiUnitOfWork) -> list:
+        """
+        Render the sections of a page displaying the updated fields of
+        a document against the snapshot of a unit of work and stage
+        them to be written back. Nothing is staged when the page
+        displays none of them
+
+        Keyword arguments:
+        document_key -- The organisation and project names identifying
+                        the document before the update
+        update_fields -- The updated fields of the document
+        unit_of_work -- The WikiUnitOfWork of the API call
+
+        Returns:
+        updated_sections -- List with the path of each updated section
+        """
+        updated_sections = self.get_updated_sections(update_fields)
+        if updated_sections:
+            unit_of_work.stage(
+                self.get_page_title(document_key),
+                lambda page: self.generate_updated_page_text(
+                    page, document_key, update_fields
+                )
+            )
+        return updated_sections
+
+    @staticmethod
+    def sections_to_dict(text: str) -> dict:
+        """
+        Map the title of each second level section of a wiki page to
+        its text or, when it has child sections, to a dictionary
+        mapping the title of each child section to its text. The
+        section titles are read in a single pass over the text
 
-        text = wiki_obj.get_page_text(page_title)
-        sections = wiki_obj.get_sections(text)
+        Keyword arguments:
+        text -- The text of the page
+
+        Returns:
+        dictionary -- Dictionary with the text of the page sections
+        """
+        sections = SectionIndex(text).sections
 
         dictionary = {}
-        for section in sections:
-            # fazer função com esse if
-            if section.title is not None: #and section.title != self.page_initial_section.replace("=", ""):
-                parent_section_level = 2
-                section_title_string = (
-                    re.search(
-                        f"(=){{{parent_section_level}}}({section.title})(=){{{parent_section_level}}}\n",
-                        section.string
-                    )
+        for section_number, section in enumerate(sections):
+            # Only second level sections whose title ends its line
+            # are read
+            title_line_end = text[section.title_end:section.title_end + 1]
+            if section.level != 2 or title_line_end != "\n":
+                continue
+
+            children_dict = {}
+            child_number = section_number + 1
+            while (child_number < len(sections) and
+                   sections[child_number].start < section.end):
+                child_section = sections[child_number]
+                # Section markers beyond the third level are kept
+                # in the text
+                children_dict[child_section.title] = (
+                    "=" * max(child_section.level - 3, 0) +
+                    child_section.contents
+                )
+                child_number += 1
+
+            if children_dict:
+                dictionary[section.title] = children_dict
+            else:
+                dictionary[section.title] = (
+                    text[section.title_end + 1:section.end]
                 )
-                if section_title_string is not None:
-                    start_index, end_index = section_title_string.span()
-                    removed_section_parent = section.string[end_index:len(section.string)]
-                    children_sections = wiki_obj.get_sections(removed_section_parent)
-                    children_dict = {}
-                    
-                    for child_section in children_sections:
-                        if child_section.title is not None:
-                            child_section_title_string = (
-                                re.search(
-                                    f"(=){{{parent_section_level + 1}}}({child_section.title})(=){{{parent_section_level + 1}}}",
-                                    child_section.string
-                                )
-                            )
-                            child_end_index = child_section_title_string.span()[-1]
-                            
-                            teste = child_section.string[child_end_index:len(child_section.string)]
-
-                            children_dict[child_section.title] = teste                               
-                            dictionary[section.title] = children_dict
-
-                    if not children_dict:
-                        dictionary[section.title] = removed_section_parent
         return dictionary
 
+    @abstractmethod
+    def get_page_title(self, document_data: dict) -> str:
+        """
+        Get the title of the page written for a document
+
+        Keyword arguments:
+        document_data -- All required data for a project using
+                         Organised Editing Guidelines
+
+        Returns:
+        str -- The title of the page
+        """
+        ...
+
     @abstractmethod
     def get_page_fields(self) -> list:
         """
@@ -130,12 +255,30 @@ class WikiPageService(ABC):
         ...
 
     @abstractmethod
-    def create_page(self, document_data: dict) -> None:
+    def parse_page_to_serializer(self, page_document: dict) -> dict:
+        """
+        Validate the document data decoded from a page
+
+        Keyword arguments:
+        page_document -- The document data decoded by the page codec
+
+        Returns:
+        dict -- The validated document data of the page
+        """
+        ...
+
+    @abstractmethod
+    def generate_page_text(self, document_data: dict, page: dict) -> str:
         """
-        Creates a wiki page
+        Generate the text of the page for a document
 
         Keyword arguments:
         document_data -- All required data for a project using
                          Organised Editing Guidelines
+        page -- The current page, as returned by
+                WikiUnitOfWork.get_page
+
+        Returns:
+        str -- The text of the page
         """
         ...
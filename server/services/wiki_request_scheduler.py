@@ -0,0 +1,294 @@
+import random
+import threading
+import time
+import requests
+
+from server.constants import (
+    WIKI_MAXLAG,
+    WIKI_MAX_RETRIES,
+    WIKI_EDIT_CONCURRENCY_MAX,
+    WIKI_EDIT_LATENCY_TARGET
+)
+
+
+class WikiRequestScheduler:
+    """
+    Schedules the requests sent to the MediaWiki API. Every request
+    carries maxlag, requests are retried when the server asks clients
+    to back off, and the number of concurrent edits is adjusted with
+    additive increase and multiplicative decrease (AIMD) from the
+    observed edit latency and errors.
+
+    Edits are only retried when MediaWiki rejected them before saving
+    anything, i.e. on HTTP 429 or a back-off error code. A dropped
+    connection, a timeout or a gateway error may hide a saved edit, so
+    the edit isn't sent again.
+    """
+    BACKOFF_ERROR_CODES = ("maxlag", "ratelimited", "readonly")
+    BACKOFF_STATUS_CODES = (429, 502, 503, 504)
+    EDIT_BACKOFF_STATUS_CODES = (429,)
+    BASE_RETRY_DELAY = 1
+    MAX_RETRY_DELAY = 60
+
+    def __init__(self, maxlag: int = WIKI_MAXLAG,
+                 max_retries: int = WIKI_MAX_RETRIES,
+                 max_edit_concurrency: int = WIKI_EDIT_CONCURRENCY_MAX,
+                 edit_latency_target: float = WIKI_EDIT_LATENCY_TARGET):
+        self.maxlag = maxlag
+        self.max_retries = max_retries
+        self.max_edit_concurrency = max_edit_concurrency
+        self.edit_latency_target = edit_latency_target
+
+        self.edit_concurrency_limit = max(1.0, max_edit_concurrency / 2)
+        self.edits_in_flight = 0
+        self.edits_queued = 0
+        self.edits_sent = 0
+        # Edits numbered below it were in flight at the last decrease
+        self.recovery_edit_number = 0
+        self.paused_until = 0.0
+
+        self.requests = 0
+        self.retries = 0
+        self.backoffs = 0
+        self.concurrency_decreases = 0
+
+        self._lock = threading.Lock()
+        self._edit_slot_released = threading.Condition(self._lock)
+
+    def get_params(self) -> dict:
+        """
+        Parameters sent with every request
+
+        Returns:
+        params -- The scheduling parameters for API requests
+        """
+        if self.maxlag is None:
+            return {}
+        return {"maxlag": self.maxlag}
+
+    def send(self, send_request, is_edit: bool = False) -> dict:
+        """
+        Send a request, waiting for the server back-off to expire and,
+        for edits, for a free edit slot. The request is retried when
+        the server asks clients to back off, or when a read fails to
+        connect
+
+        Keyword arguments:
+        send_request -- Callable sending the request and returning the
+                        requests.Response
+        is_edit -- Boolean indicating if the request is an edit
+
+        Raises:
+        requests.RequestException -- Exception raised when the request
+                                     still fails after all retries, or
+                                     when an edit fails without a
+                                     MediaWiki API response
+
+        Returns:
+        data -- Dictionary with the MediaWiki API response
+        """
+        for attempt in range(self.max_retries + 1):
+            self.wait_for_backoff()
+            if is_edit:
+                edit_number = self.acquire_edit_slot()
+            start = time.monotonic()
+            response = None
+            data = None
+            try:
+                response = send_request()
+                if response.status_code not in self.BACKOFF_STATUS_CODES:
+                    response.raise_for_status()
+                    data = response.json()
+            except (requests.ConnectionError, requests.Timeout):
+                # The edit may have been saved before the connection
+                # dropped, so only reads are sent again
+                if is_edit or attempt == self.max_retries:
+                    raise
+            finally:
+                if is_edit:
+                    self.release_edit_slot()
+            latency = time.monotonic() - start
+
+            retry_delay = self.get_retry_delay(
+                response.status_code if response is not None else None,
+                response.headers if response is not None else {},
+                data,
+                attempt,
+                is_edit
+            )
+            with self._lock:
+                self.requests += 1
+                if is_edit:
+                    self.adjust_edit_concurrency(
+                        latency,
+                        is_throttled=(
+                            retry_delay is not None or data is None
+                        ),
+                        edit_number=edit_number
+                    )
+            if retry_delay is None:
+                if data is None:
+                    response.raise_for_status()
+                return data
+            if attempt == self.max_retries:
+                break
+            self.pause(retry_delay)
+            with self._lock:
+                self.retries += 1
+        if data is not None:
+            return data
+        response.raise_for_status()
+
+    def get_retry_delay(self, status_code: int, headers: dict,
+                        data: dict, attempt: int,
+                        is_edit: bool = False) -> float:
+        """
+        Get how long to wait before retrying a request
+
+        Keyword arguments:
+        status_code -- The HTTP status of the response, or None if the
+                       request failed to connect
+        headers -- The HTTP headers of the response
+        data -- The decoded MediaWiki API response, if any
+        attempt -- The number of the attempt, starting at 0
+        is_edit -- Boolean indicating if the request is an edit, only
+                   retried when it surely wasn't saved
+
+        Returns:
+        delay -- Seconds to wait before retrying, or None if the
+                 request doesn't need to be retried
+        """
+        backoff_status_codes = (
+            self.EDIT_BACKOFF_STATUS_CODES if is_edit
+            else self.BACKOFF_STATUS_CODES
+        )
+        is_backoff = (
+            (status_code is None and not is_edit) or
+            status_code in backoff_status_codes or
+            (data is not None and
+             data.get("error", {}).get("code") in self.BACKOFF_ERROR_CODES)
+        )
+        if not is_backoff:
+            return None
+
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return min(float(retry_after), self.MAX_RETRY_DELAY)
+        # Exponential backoff with jitter, so waiting clients don't
+        # retry all at once
+        delay = self.BASE_RETRY_DELAY * 2 ** attempt
+        return min(delay + random.uniform(0, delay), self.MAX_RETRY_DELAY)
+
+    def pause(self, delay: float):
+        """
+        Hold back every request until a delay expires
+
+        Keyword arguments:
+        delay -- Seconds to hold the requests back
+        """
+        with self._lock:
+            self.backoffs += 1
+            self.paused_until = max(
+                self.paused_until, time.monotonic() + delay
+            )
+
+    def get_backoff_remaining(self) -> float:
+        """
+        Get how long the server still asks clients to back off
+
+        Returns:
+        remaining -- Seconds left before requests may be sent
+        """
+        with self._lock:
+            return max(0.0, self.paused_until - time.monotonic())
+
+    def wait_for_backoff(self):
+        """
+        Block while the server asked clients to back off
+        """
+        remaining = self.get_backoff_remaining()
+        while remaining > 0:
+            time.sleep(remaining)
+            remaining = self.get_backoff_remaining()
+
+    def acquire_edit_slot(self) -> int:
+        """
+        Block until the number of edits in flight is under the
+        concurrency limit
+
+        Returns:
+        edit_number -- The sequence number of the edit
+        """
+        with self._edit_slot_released:
+            self.edits_queued += 1
+            while self.edits_in_flight >= int(self.edit_concurrency_limit):
+                self._edit_slot_released.wait()
+            self.edits_queued -= 1
+            self.edits_in_flight += 1
+            edit_number = self.edits_sent
+            self.edits_sent += 1
+        return edit_number
+
+    def release_edit_slot(self):
+        """
+        Release the edit slot of a finished edit
+        """
+        with self._edit_slot_released:
+            self.edits_in_flight -= 1
+            self._edit_slot_released.notify_all()
+
+    def adjust_edit_concurrency(self, latency: float, is_throttled: bool,
+                                edit_number: int):
+        """
+        Increase the edit concurrency limit by one edit per window
+        of edits while edits are fast, and halve it when the server
+        throttles us or edits get slow. The limit is halved once per
+        window: edits already in flight when it was halved ran at the
+        old limit, so their congestion signals are ignored. Must be
+        called with the lock held
+
+        Keyword arguments:
+        latency -- Seconds the edit took
+        is_throttled -- Boolean indicating if the server asked clients
+                        to back off
+        edit_number -- The sequence number of the edit, as returned by
+                       acquire_edit_slot
+        """
+        if is_throttled or latency > self.edit_latency_target:
+            if edit_number < self.recovery_edit_number:
+                return
+            self.edit_concurrency_limit = max(
+                1.0, self.edit_concurrency_limit / 2
+            )
+            self.recovery_edit_number = self.edits_sent
+            self.concurrency_decreases += 1
+        else:
+            self.edit_concurrency_limit = min(
+                float(self.max_edit_concurrency),
+                self.edit_concurrency_limit + 1 / self.edit_concurrency_limit
+            )
+        self._edit_slot_released.notify_all()
+
+    def get_stats(self) -> dict:
+        """
+        Get the usage statistics of the scheduler
+
+        Returns:
+        stats -- Dictionary with the scheduler usage statistics
+        """
+        with self._lock:
+            stats = {
+                "maxlag": self.maxlag,
+                "edit_concurrency_limit": int(self.edit_concurrency_limit),
+                "max_edit_concurrency": self.max_edit_concurrency,
+                "edits_in_flight": self.edits_in_flight,
+                "queue_depth": self.edits_queued,
+                "backoff_remaining": max(
+                    0.0, self.paused_until - time.monotonic()
+                ),
+                "requests": self.requests,
+                "retries": self.retries,
+                "backoffs": self.backoffs,
+                "concurrency_decreases": self.concurrency_decreases
+            }
+        return stats
@@ -1,14 +1,30 @@
-import requests
+import hashlib
 import re
-from flask import current_app
+import requests
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from flask import current_app, g, has_app_context
 import wikitextparser as wtp
-from datetime import datetime
 
 from server.constants import (
     WIKI_API_ENDPOINT,
     BOT_NAME,
-    BOT_PASSWORD
+    BOT_PASSWORD,
+    WIKI_SESSION_POOL_SIZE,
+    WIKI_TOKEN_TTL,
+    WIKI_PAGE_CACHE_BYTES,
+    WIKI_PAGE_CACHE_TTL
 )
+from server.services.page_codec import (
+    ExternalLink,
+    WikiLink,
+    format_date_text
+)
+from server.services.page_template import PageTemplate, get_page_template
+from server.services.section_index import IndexedSection
+from server.services.table_index import TableIndex
+from server.services.wiki_request_scheduler import WikiRequestScheduler
 import time
 
 
@@ -22,56 +38,938 @@ class WikiServiceError(Exception):
             current_app.logger.error(message)
 
 
-class WikiService:
+class WikiEditConflictError(WikiServiceError):
+    """
+    Custom Exception to notify callers an edit was rejected because the
+    page was changed, or created, after it was read
+    """
+
+    def __init__(self, message):
+        if current_app:
+            current_app.logger.info(message)
+
+
+class CsrfTokenCache:
+    """
+    Cache of the csrf token of the pooled MediaWiki session
+    """
+
+    def __init__(self, ttl: int = WIKI_TOKEN_TTL):
+        self.ttl = ttl
+        self.token = None
+        self.expires_at = 0
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> str:
+        """
+        Get the cached csrf token
+
+        Returns:
+        token -- The cached token or None if it is missing or expired
+        """
+        with self._lock:
+            if self.token is not None and time.monotonic() < self.expires_at:
+                self.hits += 1
+                return self.token
+            self.misses += 1
+            return None
+
+    def set(self, token: str, is_refresh: bool = False):
+        """
+        Cache a csrf token
+
+        Keyword arguments:
+        token -- The csrf token
+        is_refresh -- Boolean indicating if the token replaces one
+                      rejected by MediaWiki
+        """
+        with self._lock:
+            self.token = token
+            self.expires_at = time.monotonic() + self.ttl
+            if is_refresh:
+                self.refreshes += 1
+
+    def clear(self):
+        """
+        Drop the cached csrf token
+        """
+        with self._lock:
+            self.token = None
+
+    def get_stats(self) -> dict:
+        """
+        Get the usage statistics of the cache
+
+        Returns:
+        stats -- Dictionary with the cache usage statistics
+        """
+        with self._lock:
+            stats = {
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes
+            }
+        return stats
+
+
+class PageTextCache:
+    """
+    LRU cache of page texts bounded by a byte budget. Each entry keeps
+    the revision id of the cached text, so it can be revalidated with a
+    cheap lastrevid check once it is older than the TTL
+    """
+
+    def __init__(self, max_bytes: int = WIKI_PAGE_CACHE_BYTES,
+                 ttl: float = WIKI_PAGE_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, page_title: str) -> tuple:
+        """
+        Get a cached page
+
+        Keyword arguments:
+        page_title -- The title of the page
+
+        Returns:
+        tuple -- The cached page, or None if it isn't cached, and a
+                 boolean indicating if it was cached less than
+                 ttl seconds ago
+        """
+        with self._lock:
+            entry = self._entries.get(page_title)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(page_title)
+            page, cached_at, _ = entry
+            is_fresh = time.monotonic() - cached_at < self.ttl
+            if is_fresh:
+                self.hits += 1
+            return dict(page), is_fresh
+
+    def lookup(self, page_titles: list) -> tuple:
+        """
+        Split pages into fresh cached pages, stale cached pages that
+        must be revalidated and pages that aren't cached
+
+        Keyword arguments:
+        page_titles -- The titles of the pages
+
+        Returns:
+        tuple -- Dictionary of fresh pages, dictionary of stale pages
+                 and list of titles that aren't cached
+        """
+        fresh_pages = {}
+        stale_pages = {}
+        missing_titles = []
+        for page_title in dict.fromkeys(page_titles):
+            cached_page, is_fresh = self.get(page_title)
+            if cached_page is None:
+                missing_titles.append(page_title)
+            elif is_fresh:
+                fresh_pages[page_title] = cached_page
+            else:
+                stale_pages[page_title] = cached_page
+        return fresh_pages, stale_pages, missing_titles
+
+    def revalidate_pages(self, stale_pages: dict,
+                         pages_info: dict) -> tuple:
+        """
+        Revalidate stale cached pages against their latest revision
+
+        Keyword arguments:
+        stale_pages -- Dictionary of stale cached pages
+        pages_info -- Dictionary with the metadata of the stale pages
+
+        Returns:
+        tuple -- Dictionary of the pages that are still up to date
+                 and list of titles that must be fetched again
+        """
+        valid_pages = {}
+        outdated_titles = []
+        for page_title, cached_page in stale_pages.items():
+            page_info = pages_info[page_title]
+            if (page_info["exists"] and
+               page_info["revid"] == cached_page["revid"]):
+                self.revalidate(page_title)
+                valid_pages[page_title] = cached_page
+            else:
+                outdated_titles.append(page_title)
+        return valid_pages, outdated_titles
+
+    def store_pages(self, pages: dict):
+        """
+        Cache fetched pages, dropping the pages that don't exist
+
+        Keyword arguments:
+        pages -- Dictionary of fetched pages
+        """
+        for page_title, page in pages.items():
+            if page["exists"]:
+                self.put(page)
+            else:
+                self.discard(page_title)
+
+    def revalidate(self, page_title: str):
+        """
+        Mark a cached page as fresh after checking that its revision
+        is still the latest one
+
+        Keyword arguments:
+        page_title -- The title of the page
+        """
+        with self._lock:
+            entry = self._entries.get(page_title)
+            if entry is not None:
+                page, _, page_size = entry
+                self._entries[page_title] = (
+                    page, time.monotonic(), page_size
+                )
+                self.revalidations += 1
+
+    def put(self, page: dict):
+        """
+        Cache a page, evicting the least recently used pages while
+        the cache exceeds its byte budget
+
+        Keyword arguments:
+        page -- Dictionary with the text and revision of the page
+        """
+        page_size = len(page["text"].encode("utf-8"))
+        with self._lock:
+            self._remove(page["title"])
+            if page_size > self.max_bytes:
+                return
+            self._entries[page["title"]] = (
+                dict(page), time.monotonic(), page_size
+            )
+            self.size += page_size
+            while self.size > self.max_bytes:
+                evicted_title = next(iter(self._entries))
+                self._remove(evicted_title)
+                self.evictions += 1
+
+    def discard(self, page_title: str):
+        """
+        Remove a page from the cache
+
+        Keyword arguments:
+        page_title -- The title of the page
+        """
+        with self._lock:
+            self._remove(page_title)
+
+    def _remove(self, page_title: str):
+        entry = self._entries.pop(page_title, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+    def get_stats(self) -> dict:
+        """
+        Get the usage statistics of the cache
+
+        Returns:
+        stats -- Dictionary with the cache usage statistics
+        """
+        with self._lock:
+            stats = {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "revalidations": self.revalidations,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+        return stats
+
+
+class NoopEditFilter:
+    """
+    Detects edits that wouldn't change the text of a page, by
+    comparing the hash of the current and new texts normalised the
+    way MediaWiki normalises saved texts, so they can be skipped
+    """
+
     def __init__(self):
-        self.endpoint = WIKI_API_ENDPOINT
-        self.session = requests.Session()
-        self.login()
+        self._lock = threading.Lock()
 
-    def get_page_text(self, page_title: str) -> str:
+        self.checks = 0
+        self.skipped_edits = 0
+        self.skipped_bytes = 0
+
+    @staticmethod
+    def get_text_hash(text: str) -> str:
         """
-        Get the page content of a page parsed as Wikitext
+        Get the hash of a page text, ignoring the differences
+        MediaWiki drops when saving it: the line endings and the
+        whitespace at the end of the text
+
+        Keyword arguments:
+        text -- The page text
+
+        Returns:
+        text_hash -- The hex digest of the normalised text
+        """
+        normalised_text = text.replace("\r\n", "\n").rstrip()
+        return hashlib.sha1(normalised_text.encode("utf-8")).hexdigest()
+
+    def is_noop_edit(self, page_text: str, updated_text: str) -> bool:
+        """
+        Check if saving a new text wouldn't change a page, counting
+        the edits skipped
+
+        Keyword arguments:
+        page_text -- The current text of the page
+        updated_text -- The new text of the page
+
+        Returns:
+        bool -- Boolean indicating if the edit can be skipped
+        """
+        is_noop = (
+            page_text is not None and
+            self.get_text_hash(page_text) == self.get_text_hash(updated_text)
+        )
+        with self._lock:
+            self.checks += 1
+            if is_noop:
+                self.skipped_edits += 1
+                self.skipped_bytes += len(updated_text.encode("utf-8"))
+        return is_noop
+
+    @staticmethod
+    def get_noop_edit_response(page_title: str) -> dict:
+        """
+        Get the response MediaWiki sends for an edit that doesn't
+        change the page
 
         Keyword arguments:
         page_title -- The title of the page
 
         Returns:
-        text -- The text of the page
+        data -- Dictionary with the edit result
         """
-        params = {
-            "action": "parse",
-            "page": page_title,
-            "prop": "wikitext",
+        return {
+            "edit": {
+                "result": "Success",
+                "title": page_title,
+                "nochange": ""
+            }
+        }
+
+    def get_stats(self) -> dict:
+        """
+        Get the usage statistics of the filter
+
+        Returns:
+        stats -- Dictionary with the filter usage statistics
+        """
+        with self._lock:
+            stats = {
+                "checks": self.checks,
+                "skipped_edits": self.skipped_edits,
+                "skipped_bytes": self.skipped_bytes
+            }
+        return stats
+
+
+class WikiSessionPool:
+    """
+    Process-wide pool of MediaWiki API sessions. All sessions share a
+    single cookie jar, so the bot logs in once per worker and every
+    WikiService reuses that authentication.
+    """
+    NOT_LOGGED_IN_ERROR_CODES = ("assertuserfailed", "notloggedin")
+
+    def __init__(self, endpoint: str = WIKI_API_ENDPOINT,
+                 bot_name: str = BOT_NAME,
+                 bot_password: str = BOT_PASSWORD,
+                 size: int = WIKI_SESSION_POOL_SIZE):
+        self.endpoint = endpoint
+        self.bot_name = bot_name
+        self.bot_password = bot_password
+        self.size = size
+        self.cookies = requests.cookies.RequestsCookieJar()
+        self.is_logged_in = False
+        self.login_generation = 0
+        self.token_cache = CsrfTokenCache()
+        self.page_cache = PageTextCache()
+        self.scheduler = WikiRequestScheduler()
+        self.noop_edit_filter = NoopEditFilter()
+
+        self._idle_sessions = []
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._login_lock = threading.Lock()
+
+        self.sessions_created = 0
+        self.checkouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.logins = 0
+        self.reauthentications = 0
+
+    @contextmanager
+    def session(self):
+        """
+        Check out a session from the pool, blocking while all
+        sessions are in use
+        """
+        self._slots.acquire()
+        with self._lock:
+            if self._idle_sessions:
+                session = self._idle_sessions.pop()
+            else:
+                session = requests.Session()
+                session.cookies = self.cookies
+                self.sessions_created += 1
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self.in_use -= 1
+                self._idle_sessions.append(session)
+            self._slots.release()
+
+    def assert_params(self) -> dict:
+        """
+        Parameters asking MediaWiki to reject requests sent by a
+        logged out session
+
+        Returns:
+        params -- The assertion parameters for API requests
+        """
+        if self.bot_name:
+            return {"assert": "user"}
+        return {}
+
+    def generate_login_token(self) -> str:
+        """
+        Generate Login Token for MediaWiki API
+
+        Returns:
+        token -- Login Token for MediaWiki API
+        """
+        params_token = {
+            "action": "query",
             "format": "json",
+            "meta": "tokens",
+            "type": "login"
+        }
+        with self.session() as session:
+            r = session.get(url=self.endpoint, params=params_token)
+        data = r.json()
+        login_token = data['query']['tokens']['logintoken']
+        return login_token
+
+    def login(self):
+        """
+        Login into MediaWiki API
+
+        Raises:
+        WikiServiceError -- Exception raised when handling wiki
+        """
+        with self._login_lock:
+            self._login()
+
+    def _login(self):
+        login_token = self.generate_login_token()
+        params_login = {
+            'action': "login",
+            'lgname': self.bot_name,
+            'format': "json"
         }
-        r = self.session.get(url=self.endpoint, params=params)
+        with self.session() as session:
+            r = session.post(
+                url=self.endpoint,
+                params=params_login,
+                data={
+                    'lgpassword': self.bot_password,
+                    'lgtoken': login_token
+                }
+            )
+        r.raise_for_status()
         data = r.json()
-        text = data["parse"]["wikitext"]["*"]
-        return text
+        if data.get("login", {}).get("result") != "Success":
+            raise WikiServiceError("Failed to login into MediaWiki API")
+        with self._lock:
+            self.is_logged_in = True
+            self.login_generation += 1
+            self.logins += 1
+        # csrf tokens are bound to the session that requested them
+        self.token_cache.clear()
+
+    def ensure_logged_in(self):
+        """
+        Login into MediaWiki API unless the pool is already logged in
+        """
+        if self.is_logged_in:
+            return
+        with self._login_lock:
+            if not self.is_logged_in:
+                self._login()
+
+    def reauthenticate(self, login_generation: int):
+        """
+        Login again after MediaWiki reported the session as logged out
+
+        Keyword arguments:
+        login_generation -- The login generation the failed request
+                            was sent with. Nothing is done if another
+                            thread already logged in again since
+        """
+        with self._lock:
+            if login_generation != self.login_generation:
+                return
+            self.is_logged_in = False
+            self.reauthentications += 1
+        self.ensure_logged_in()
+
+    def is_not_logged_in_error(self, data: dict) -> bool:
+        """
+        Check if a MediaWiki API response reports a logged out session
+
+        Keyword arguments:
+        data -- The MediaWiki API response
+
+        Returns:
+        bool -- Boolean indicating if the session is logged out
+        """
+        return (
+            "error" in data and
+            data["error"].get("code") in self.NOT_LOGGED_IN_ERROR_CODES
+        )
 
-    def is_existing_page(self, page_title: str) -> str:
+    def get_stats(self) -> dict:
+        """
+        Get the usage statistics of the pool
+
+        Returns:
+        stats -- Dictionary with the pool usage statistics
+        """
+        with self._lock:
+            stats = {
+                "size": self.size,
+                "sessions_created": self.sessions_created,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "checkouts": self.checkouts,
+                "logins": self.logins,
+                "reauthentications": self.reauthentications
+            }
+        return stats
+
+
+session_pool = WikiSessionPool()
+
+
+class WikiService:
+    MAX_TITLES_PER_QUERY = 50
+    # Characters MediaWiki never allows in page titles; "|" would also
+    # split the title inside the titles parameter of a query
+    ILLEGAL_TITLE_REGEX = re.compile(r"[#<>\[\]|{}]")
+    PAGE_CONTENT_QUERY_PARAMS = {
+        "prop": "revisions|info",
+        "rvprop": "ids|timestamp|content",
+        "rvslots": "main"
+    }
+
+    def __init__(self, pool: WikiSessionPool = None):
+        self.pool = pool if pool is not None else session_pool
+        self.endpoint = self.pool.endpoint
+
+    def request(self, method: str, params: dict, data: dict = None) -> dict:
+        """
+        Send a request to the MediaWiki API with a pooled session,
+        logging in again once if MediaWiki reports the session as
+        logged out
+
+        Keyword arguments:
+        method -- The HTTP method of the request
+        params -- The query string parameters of the request
+        data -- The form data of the request
+
+        Returns:
+        data -- Dictionary with the MediaWiki API response
+        """
+        self.pool.ensure_logged_in()
+        for attempt in range(2):
+            login_generation = self.pool.login_generation
+            request_params = {
+                **params,
+                **self.pool.assert_params(),
+                **self.pool.scheduler.get_params()
+            }
+
+            def send_request():
+                with self.pool.session() as session:
+                    return session.request(
+                        method,
+                        url=self.endpoint,
+                        params=request_params,
+                        data=data
+                    )
+            response_data = self.pool.scheduler.send(
+                send_request,
+                is_edit=params.get("action") == "edit"
+            )
+            if (attempt == 0 and
+               self.pool.is_not_logged_in_error(response_data)):
+                self.pool.reauthenticate(login_generation)
+                continue
+            return response_data
+
+    def get_page_text(self, page_title: str) -> str:
         """
         Get the page content of a page parsed as Wikitext
 
         Keyword arguments:
         page_title -- The title of the page
 
+        Raises:
+        WikiServiceError -- Exception raised when handling wiki
+
         Returns:
         text -- The text of the page
         """
-        params = {
-            "action": "parse",
-            "page": page_title,
-            "prop": "wikitext",
+        page = self.get_pages([page_title])[page_title]
+        if not page["exists"]:
+            raise WikiServiceError("The page you specified doesn't exist")
+        return page["text"]
+
+    def get_pages(self, page_titles: list) -> dict:
+        """
+        Get the content, existence and revision of many pages.
+
+        Pages cached less than WIKI_PAGE_CACHE_TTL seconds ago are
+        served from the page cache. Older cached pages are revalidated
+        with a prop=info query and only downloaded again when their
+        revision changed
+
+        Keyword arguments:
+        page_titles -- The titles of the pages
+
+        Returns:
+        pages -- Dictionary mapping each requested title to a dict with
+                 the keys "title", "exists", "text", "revid",
+                 "timestamp", "touched" and "length"
+        """
+        page_cache = self.pool.page_cache
+        pages, stale_pages, missing_titles = page_cache.lookup(page_titles)
+
+        if stale_pages:
+            pages_info = self.get_pages_info(list(stale_pages.keys()))
+            valid_pages, outdated_titles = page_cache.revalidate_pages(
+                stale_pages, pages_info
+            )
+            pages.update(valid_pages)
+            missing_titles += outdated_titles
+
+        if missing_titles:
+            fetched_pages = self.query_pages(
+                missing_titles, self.PAGE_CONTENT_QUERY_PARAMS
+            )
+            for page in fetched_pages.values():
+                self.remember_page_info(page)
+            page_cache.store_pages(fetched_pages)
+            pages.update(fetched_pages)
+        return pages
+
+    def query_pages(self, page_titles: list, params: dict) -> dict:
+        """
+        Query many pages, requesting up to MAX_TITLES_PER_QUERY
+        pages per API call
+
+        Keyword arguments:
+        page_titles -- The titles of the pages
+        params -- The query parameters selecting what is returned
+                  for each page
+
+        Returns:
+        pages -- Dictionary mapping each requested title to the
+                 parsed page
+        """
+        page_titles = list(dict.fromkeys(page_titles))
+        pages = {}
+        for batch_start in range(0, len(page_titles),
+                                 self.MAX_TITLES_PER_QUERY):
+            batch = page_titles[
+                batch_start:batch_start + self.MAX_TITLES_PER_QUERY
+            ]
+            batch_params = self.build_query_params(batch, params)
+            data = self.request("GET", batch_params)
+            pages.update(self.parse_query_response(batch, data))
+        return pages
+
+    @staticmethod
+    def validate_page_title(page_title: str):
+        """
+        Check a page title can be requested from MediaWiki
+
+        Keyword arguments:
+        page_title -- The title of the page
+
+        Raises:
+        WikiServiceError -- Exception raised when the title is empty or
+                            has characters not allowed in page titles
+        """
+        if not page_title.strip():
+            raise WikiServiceError("Invalid page title: empty title")
+        illegal_character = WikiService.ILLEGAL_TITLE_REGEX.search(page_title)
+        if illegal_character is not None:
+            raise WikiServiceError(
+                f"Invalid page title {page_title}: illegal character "
+                f"{illegal_character.group()}"
+            )
+
+    @staticmethod
+    def build_query_params(page_titles: list, params: dict) -> dict:
+        """
+        Build the parameters of a query for many pages
+
+        Keyword arguments:
+        page_titles -- The titles of the pages
+        params -- The query parameters selecting what is returned
+                  for each page
+
+        Raises:
+        WikiServiceError -- Exception raised when a title is invalid
+
+        Returns:
+        query_params -- The parameters of the query
+        """
+        for page_title in page_titles:
+            WikiService.validate_page_title(page_title)
+        query_params = {
+            "action": "query",
+            "titles": "|".join(page_titles),
             "format": "json",
+            "formatversion": "2",
+            **params
         }
-        r = self.session.get(url=self.endpoint, params=params)
-        data = r.json()
-        if ("error" in list(data.keys()) and
-           data["error"]["code"] == "missingtitle"):
-            return False
-        else:
-            return True
+        return query_params
+
+    @staticmethod
+    def parse_query_response(page_titles: list, data: dict) -> dict:
+        """
+        Parse the pages of a query response, keyed by the titles they
+        were requested with
+
+        Keyword arguments:
+        page_titles -- The titles of the requested pages
+        data -- The MediaWiki API response of the query
+
+        Returns:
+        pages -- Dictionary mapping each requested title to the
+                 parsed page
+        """
+        # MediaWiki answers with normalized titles, e.g. with
+        # underscores replaced by spaces
+        requested_titles = {}
+        for page_title in page_titles:
+            requested_titles.setdefault(page_title, []).append(page_title)
+        for normalized in data["query"].get("normalized", []):
+            requested_titles.setdefault(normalized["to"], []).append(
+                normalized["from"]
+            )
+
+        pages = {}
+        for page_data in data["query"]["pages"]:
+            page = WikiService.parse_query_page(page_data)
+            for page_title in requested_titles.get(page_data["title"], []):
+                pages[page_title] = {**page, "title": page_title}
+        return pages
+
+    @staticmethod
+    def parse_query_page(page_data: dict) -> dict:
+        """
+        Parse a page returned by a query with prop=revisions|info
+
+        Keyword arguments:
+        page_data -- The page data returned by the MediaWiki API
+
+        Raises:
+        WikiServiceError -- Exception raised when MediaWiki reports the
+                            title as invalid
+
+        Returns:
+        page -- Dictionary with the content, existence and revision
+                of the page
+        """
+        if page_data.get("invalid", False):
+            raise WikiServiceError(
+                f"Invalid page title {page_data['title']}: "
+                f"{page_data.get('invalidreason', 'invalid title')}"
+            )
+        is_existing = not page_data.get("missing", False)
+        revisions = page_data.get("revisions", [])
+        revision = revisions[0] if revisions else {}
+        page = {
+            "title": page_data["title"],
+            "exists": is_existing,
+            "text": (
+                revision["slots"]["main"].get("content")
+                if revision else None
+            ),
+            "revid": page_data.get("lastrevid", revision.get("revid")),
+            "timestamp": revision.get("timestamp"),
+            "touched": page_data.get("touched"),
+            "length": page_data.get("length")
+        }
+        return page
+
+    def is_existing_page(self, page_title: str) -> bool:
+        """
+        Check if a page exists
+
+        Keyword arguments:
+        page_title -- The title of the page
+
+        Returns:
+        bool -- Boolean indicating if the page exists
+        """
+        return self.get_page_info(page_title)["exists"]
+
+    def get_page_info(self, page_title: str) -> dict:
+        """
+        Get the metadata of a page without fetching its content
+
+        Keyword arguments:
+        page_title -- The title of the page
+
+        Returns:
+        page_info -- Dictionary with the keys "title", "exists",
+                     "revid", "touched" and "length"
+        """
+        return self.get_pages_info([page_title])[page_title]
+
+    def get_pages_info(self, page_titles: list) -> dict:
+        """
+        Get the metadata of many pages without fetching their content.
+        The metadata is memoized for the length of the current request
+
+        Keyword arguments:
+        page_titles -- The titles of the pages
+
+        Returns:
+        pages_info -- Dictionary mapping each requested title to
+                      its metadata
+        """
+        page_info_memo = self.get_page_info_memo()
+        pages_info = {}
+        missing_titles = []
+        for page_title in page_titles:
+            if page_title in page_info_memo:
+                pages_info[page_title] = page_info_memo[page_title]
+            else:
+                missing_titles.append(page_title)
+
+        if missing_titles:
+            fetched_pages = self.query_pages(
+                missing_titles, {"prop": "info"}
+            )
+            for page in fetched_pages.values():
+                pages_info[page["title"]] = self.remember_page_info(page)
+        return pages_info
+
+    def get_page_info_memo(self) -> dict:
+        """
+        Get the page metadata memoized for the current request
+
+        Returns:
+        page_info_memo -- Dictionary mapping page titles to
+                          their metadata
+        """
+        if not has_app_context():
+            return {}
+        return g.setdefault("wiki_page_info", {})
+
+    def remember_page_info(self, page: dict) -> dict:
+        """
+        Memoize the metadata of a page for the current request
+
+        Keyword arguments:
+        page -- Dictionary with the page metadata
+
+        Returns:
+        page_info -- The memoized metadata of the page
+        """
+        page_info = {
+            "title": page["title"],
+            "exists": page["exists"],
+            "revid": page["revid"],
+            "touched": page["touched"],
+            "length": page["length"]
+        }
+        self.get_page_info_memo()[page["title"]] = page_info
+        return page_info
+
+    def forget_page(self, page_title: str):
+        """
+        Drop a page from the memoized metadata and the page cache, so
+        it is read again the next time it is needed
+
+        Keyword arguments:
+        page_title -- The title of the page
+        """
+        self.get_page_info_memo().pop(page_title, None)
+        self.pool.page_cache.discard(page_title)
+
+    def remember_edit(self, page_title: str, page_text: str, data: dict,
+                      base_revid: int = None):
+        """
+        Update the memoized metadata and the page cache from the
+        result of an edit, so a page we just wrote is never
+        downloaded again
+
+        Keyword arguments:
+        page_title -- The title of the edited page
+        page_text -- The text saved in the page
+        data -- The MediaWiki API response of the edit
+        base_revid -- The id of the revision page_text was built on.
+                      When MediaWiki applied the edit on top of another
+                      revision, it merged it with a concurrent edit and
+                      the saved text isn't page_text, so the page is
+                      dropped from the cache instead
+        """
+        edit = data.get("edit", {})
+        if edit.get("result") != "Success":
+            return
+        if "newrevid" not in edit:
+            # MediaWiki doesn't report the revision of a null edit
+            self.forget_page(page_title)
+            return
+        if base_revid is not None and edit.get("oldrevid") != base_revid:
+            self.forget_page(page_title)
+            return
+        page = {
+            "title": page_title,
+            "exists": True,
+            "text": str(page_text),
+            "revid": edit["newrevid"],
+            "timestamp": edit.get("newtimestamp"),
+            "touched": edit.get("newtimestamp"),
+            "length": len(str(page_text).encode("utf-8"))
+        }
+        self.remember_page_info(page)
+        self.pool.page_cache.put(page)
 
     def create_page(self, token: str, page_title: str, page_text: str) -> dict:
         """
@@ -97,22 +995,68 @@ class WikiService:
             "bot": "true",
             "format": "json"
         }
-        r = self.session.post(
-            url=self.endpoint,
-            params=params,
-            data={
-                "token": token,
-                "text": str(page_text)
-            }
-        )
-        data = r.json()
-        if ("error" in list(data.keys()) and
-           data["error"]["code"] == "articleexists"):
-            raise WikiServiceError("The page you specified already exist")
+        data = self.submit_edit(token, params, page_text)
+        # The page was created by someone else since it was read
+        self.check_edit_conflict(page_title, data)
+        if "error" in list(data.keys()):
+            raise WikiServiceError(
+                f"Failed to edit page: {data['error']['code']}"
+            )
         else:
+            self.remember_edit(page_title, page_text, data)
             return data
 
-    def edit_page(self, token: str, page_title: str, page_text: str) -> dict:
+    @staticmethod
+    def get_conflict_params(base_revid: int = None,
+                            base_timestamp: str = None,
+                            start_timestamp: str = None) -> dict:
+        """
+        Get the parameters making MediaWiki reject an edit with an
+        edit conflict when the page was changed after it was read
+
+        Keyword arguments:
+        base_revid -- The id of the revision the edit is based on
+        base_timestamp -- The timestamp of the revision the edit is
+                          based on
+        start_timestamp -- The time the page was read, so the edit
+                           fails if the page was deleted after it
+
+        Returns:
+        params -- The parameters of the edit
+        """
+        params = {}
+        if base_revid is not None:
+            params["baserevid"] = base_revid
+        if base_timestamp is not None:
+            params["basetimestamp"] = base_timestamp
+        if start_timestamp is not None:
+            params["starttimestamp"] = start_timestamp
+        return params
+
+    def check_edit_conflict(self, page_title: str, data: dict):
+        """
+        Check if MediaWiki rejected an edit because the page was changed
+        or created since it was read. The page is then dropped from the
+        page cache, so it is read again before the edit is retried
+
+        Keyword arguments:
+        page_title -- The title of the edited page
+        data -- The MediaWiki API response of the edit
+
+        Raises:
+        WikiEditConflictError -- Exception raised on an edit conflict
+        """
+        error_code = data.get("error", {}).get("code")
+        if error_code in ("editconflict", "articleexists"):
+            self.forget_page(page_title)
+            raise WikiEditConflictError(
+                f"Edit conflict on page {page_title}: {error_code}"
+            )
+
+    def edit_page(self, token: str, page_title: str, page_text: str,
+                  base_revid: int = None,
+                  base_timestamp: str = None,
+                  start_timestamp: str = None) -> dict:
         """
         Edit a existing wiki page
 
@@ -120,6 +1064,12 @@ class WikiService:
         token -- The MediaWiki API token
         page_title -- The title of the page being created
         page_text -- The text of the page being created
+        base_revid -- The id of the revision the edit is based on, to
+                      detect edit conflicts
+        base_timestamp -- The timestamp of the revision the edit is
+                          based on, to detect edit conflicts
+        start_timestamp -- The time the page was read, to detect the
+                           page being deleted in between
 
         Raises:
         WikiServiceError -- Exception raised when handling wiki
@@ -134,23 +1084,187 @@ class WikiService:
             "nocreate": "true",
             "contentmodel": "wikitext",
             "bot": "true",
-            "format": "json"
+            "format": "json",
+            **self.get_conflict_params(
+                base_revid, base_timestamp, start_timestamp
+            )
         }
-        r = self.session.post(
-            url=self.endpoint,
-            params=params,
-            data={
-                "token": token,
-                "text": str(page_text)
-            }
-        )
-        data = r.json()
+        data = self.submit_edit(token, params, page_text)
+        self.check_edit_conflict(page_title, data)
         if ("error" in list(data.keys()) and
            data["error"]["code"] == "missingtitle"):
             raise WikiServiceError("The page you specified doesn't exist")
+        elif "error" in list(data.keys()):
+            raise WikiServiceError(
+                f"Failed to edit page: {data['error']['code']}"
+            )
         else:
+            self.remember_edit(page_title, page_text, data, base_revid)
             return data
 
+    def edit_page_sections(self, token: str, page_title: str,
+                           page_text: str, updated_text: str,
+                           base_revid: int = None,
+                           base_timestamp: str = None,
+                           start_timestamp: str = None) -> dict:
+        """
+        Edit a existing wiki page, sending only the section that
+        changed when the section structure of the page is unchanged
+
+        Keyword arguments:
+        token -- The MediaWiki API token
+        page_title -- The title of the page being edited
+        page_text -- The current text of the page
+        updated_text -- The new text of the page
+        base_revid -- The id of the revision the edit is based on, to
+                      detect edit conflicts
+        base_timestamp -- The timestamp of the revision the edit is
+                          based on, to detect edit conflicts
+        start_timestamp -- The time the page was read, to detect the
+                           page being deleted in between
+
+        Raises:
+        WikiServiceError -- Exception raised when handling wiki
+
+        Returns:
+        data -- Dictionary with result of post request for editing
+                the page
+        """
+        if self.pool.noop_edit_filter.is_noop_edit(page_text, updated_text):
+            return self.pool.noop_edit_filter.get_noop_edit_response(
+                page_title
+            )
+
+        edited_section = self.get_edited_section(page_text, updated_text)
+        if edited_section is None:
+            return self.edit_page(
+                token, page_title, updated_text,
+                base_revid, base_timestamp, start_timestamp
+            )
+
+        params = {
+            "action": "edit",
+            "title": page_title,
+            "section": edited_section["number"],
+            "nocreate": "true",
+            "contentmodel": "wikitext",
+            "bot": "true",
+            "format": "json",
+            **self.get_conflict_params(
+                base_revid, base_timestamp, start_timestamp
+            )
+        }
+        data = self.submit_edit(token, params, edited_section["text"])
+        self.check_edit_conflict(page_title, data)
+        if ("error" in list(data.keys()) and
+           data["error"]["code"] == "missingtitle"):
+            raise WikiServiceError("The page you specified doesn't exist")
+        elif "error" in list(data.keys()):
+            raise WikiServiceError(
+                f"Failed to edit page: {data['error']['code']}"
+            )
+        elif base_revid is None:
+            # The section was applied to the latest revision, which
+            # page_text may not be
+            self.forget_page(page_title)
+            return data
+        else:
+            self.remember_edit(
+                page_title,
+                self.replace_section_text(page_text, edited_section),
+                data,
+                base_revid
+            )
+            return data
+
+    @staticmethod
+    def get_edited_section(page_text: str, updated_text: str) -> dict:
+        """
+        Find the smallest section containing all the differences
+        between two versions of a page. Sections are numbered as
+        MediaWiki numbers them, section 0 being the text before the
+        first heading
+
+        Keyword arguments:
+        page_text -- The current text of the page
+        updated_text -- The new text of the page
+
+        Returns:
+        edited_section -- Dictionary with the "number" of the section,
+                          its new "text" and the "span" it replaces in
+                          the current text, or None if the whole page
+                          must be sent
+        """
+        sections = wtp.parse(page_text).sections
+        updated_sections = wtp.parse(updated_text).sections
+        structure = [(section.level, section.title) for section in sections]
+        updated_structure = [
+            (section.level, section.title) for section in updated_sections
+        ]
+        if structure != updated_structure:
+            return None
+
+        def own_texts(text, sections):
+            # The text of each section without its subsections
+            starts = [section.span[0] for section in sections]
+            ends = starts[1:] + [len(text)]
+            return [text[start:end] for start, end in zip(starts, ends)]
+
+        changed_numbers = [
+            number
+            for number, (own_text, updated_own_text) in enumerate(zip(
+                own_texts(page_text, sections),
+                own_texts(updated_text, updated_sections)
+            ))
+            if own_text != updated_own_text
+        ]
+        if not changed_numbers:
+            return None
+
+        # Walk up from the first changed section to the first one
+        # whose subsections also contain the last changed section
+        for number in range(changed_numbers[0], 0, -1):
+            last_subsection = number
+            while (last_subsection + 1 < len(sections) and
+                   sections[last_subsection + 1].level >
+                   sections[number].level):
+                last_subsection += 1
+            if last_subsection >= changed_numbers[-1]:
+                return {
+                    "number": number,
+                    "text": updated_sections[number].string.rstrip(),
+                    "span": sections[number].span
+                }
+        if changed_numbers == [0]:
+            return {
+                "number": 0,
+                "text": updated_sections[0].string.rstrip(),
+                "span": sections[0].span
+            }
+        return None
+
+    @staticmethod
+    def replace_section_text(page_text: str, edited_section: dict) -> str:
+        """
+        Replace a section of a page the way MediaWiki does when a
+        section is edited
+
+        Keyword arguments:
+        page_text -- The current text of the page
+        edited_section -- The section, as returned by get_edited_section
+
+        Returns:
+        updated_text -- The text of the page after the edit
+        """
+        start, end = edited_section["span"]
+        text_after = page_text[end:]
+        updated_text = page_text[:start] + edited_section["text"]
+        if text_after:
+            # MediaWiki separates the section from the next one with a
+            # blank line, as editors strip trailing whitespace
+            updated_text += "\n\n" + text_after
+        return updated_text.rstrip()
+
     def check_token(self, token: str) -> dict:
         """
         Check if MediaWiki API Token is valid
@@ -166,65 +1280,77 @@ class WikiService:
                 the MediaWiki API Token
         """
         params = {"action": "checktoken", "type": "csrf", "format": "json"}
-        r = self.session.post(
-            url=self.endpoint, params=params, data={"token": token}
-        )
-        data = r.json()
+        data = self.request("POST", params, data={"token": token})
         if data["checktoken"]["result"] == "invalid":
             raise WikiServiceError("Invalid MediaWiki API Token")
         else:
             return data
 
-    def get_token(self) -> str:
+    def get_token(self, refresh: bool = False) -> str:
         """
-        Get MediaWiki API Token for an active Session
+        Get MediaWiki API Token for an active Session, reusing the
+        cached token of the pooled session when possible
+
+        Keyword arguments:
+        refresh -- Boolean indicating if the cached token must be
+                   replaced by a new one
 
         Returns:
         token -- MediaWiki API Token for an active Session
         """
+        token_cache = self.pool.token_cache
+        if not refresh:
+            token = token_cache.get()
+            if token is not None:
+                return token
+
         params = {"action": "query", "meta": "tokens", "format": "json"}
-        r = self.session.get(url=self.endpoint, params=params)
-        data = r.json()
+        data = self.request("GET", params)
         token = data["query"]["tokens"]["csrftoken"]
+        token_cache.set(token, is_refresh=refresh)
         return token
 
-    def generate_login_token(self) -> str:
+    def submit_edit(self, token: str, params: dict, page_text: str) -> dict:
         """
-        Generate Login Token for MediaWiki API
+        Submit an edit to the MediaWiki API, retrying it once with a
+        new token if MediaWiki rejects the given token
+
+        Keyword arguments:
+        token -- The MediaWiki API token
+        params -- The query string parameters of the edit
+        page_text -- The text of the page being edited
 
         Returns:
-        token -- Login Token for MediaWiki API
+        data -- Dictionary with result of post request for
+                editing the page
         """
-        params_token = {
-            "action": "query",
-            "format": "json",
-            "meta": "tokens",
-            "type": "login"
-        }
-        r = self.session.get(url=self.endpoint, params=params_token)
-        data = r.json()
-        login_token = data['query']['tokens']['logintoken']
-        return login_token
+        data = self.request(
+            "POST",
+            params,
+            data={
+                "token": token,
+                "text": str(page_text)
+            }
+        )
+        if ("error" in list(data.keys()) and
+           data["error"]["code"] == "badtoken"):
+            token = self.get_token(refresh=True)
+            data = self.request(
+                "POST",
+                params,
+                data={
+                    "token": token,
+                    "text": str(page_text)
+                }
+            )
+        return data
 
     def login(self):
         """
-        Login into MediaWiki API
+        Login into MediaWiki API, refreshing the authentication
+        shared by all pooled sessions
         """
-        login_token = self.generate_login_token()
-        params_login = {
-            'action': "login",
-            'lgname': BOT_NAME,
-            'format': "json"
-        }
-        r = self.session.post(
-            url=self.endpoint,
-            params=params_login,
-            data={
-                'lgpassword': BOT_PASSWORD,
-                'lgtoken': login_token
-            }
-        )
-        r.raise_for_status()
+        self.pool.login()
 
     def search_text_pages(self):#, text):
         start = time.time()
@@ -237,8 +1363,7 @@ class WikiService:
             "srprop": "sectiontitle",
             "format": "json",
         }
-        r = self.session.get(url=self.endpoint, params=params)
-        data = r.json()
+        data = self.request("GET", params)
         end = time.time()
         current_app.logger.debug(f"TIME: {end - start}")
         return data
@@ -259,199 +1384,96 @@ class WikiService:
         sections = wtp_text.sections
         return sections
     
-    def edit_table_row(self, table:wtp.Table, new_row: str,
-                       row_number: int) -> str:
-        """
-        """
-        row = table.cells(row=row_number)
-        update_row = re.findall(
-            r"\n\|( .+)",
-            new_row
-        )
-        for index, (col, new_col) in enumerate(zip(row, update_row)):
-            col.value = new_col
-        return table.string
-
-    def get_table_row_by_column_data(self, table, column_data):
-        table_data = table.data(span=False)
-        # ignore header
-        for row_number, row_data in enumerate(table_data[1:], start=1):
-            if column_data.strip() in row_data:
-                return row_number
-        return False
-
-
-
-    def format_date_text(self, str_date: str) -> str:
+    def edit_table_row(self, table_string: str, new_row: str,
+                       column_data: str) -> str:
         """
-        Format a date into the format "%dd month_name %YYYY"
+        Replace the row of a table identified by the data of its
+        first column
 
         Keyword arguments:
-        date -- Date being formatted
+        table_string -- The wikitext of the table
+        new_row -- The wikitext of the new row
+        column_data -- The data of the first column of the row
+                       being replaced
 
         Returns:
-        text_date -- Dictionary with result of post request for checking
-                the MediaWiki API Token
+        table_string -- The wikitext of the updated table
         """
-        parsed_date = datetime.strptime(
-            str_date,
-            "%Y-%m-%dT%H:%M:%S.%fZ"
-        )
-        date_month = parsed_date.strftime("%B")
-        date_day = parsed_date.strftime("%m")
-        date_year = parsed_date.strftime("%Y")
-
-        text_date = f"{date_day} {date_month} {date_year}"
-        return text_date
+        table_index = TableIndex(table_string)
+        if not table_index.replace_row(column_data, new_row):
+            # The row was removed from the page, add it again
+            table_index.insert_row(new_row)
+        return table_index.string
 
-    def get_section_index(self, text: str, section_title: str) -> int:
+    def format_date_text(self, str_date: str) -> str:
         """
-        Get the index of a section in a wiki page
+        Format a date into the format "%dd month_name %YYYY"
 
         Keyword arguments:
-        text -- The text of a wiki page
-        section_title -- the title of the section
-                         in which the index is searched
-
-        Raises:
-        WikiServiceError -- Exception raised when handling wiki
+        str_date -- Date being formatted
 
         Returns:
-        index -- The index of the section
+        text_date -- The formatted date
         """
-        sections = self.get_sections(text)
-        for index, section in enumerate(sections):
-            if (section.title is not None and
-               section.title == section_title):
-                return index
-        raise WikiServiceError("The section you specified doesn't exist")
+        return format_date_text(str_date)
 
-    def get_section_table(self, text: str, section_title: str) -> wtp.Table:
+    def add_table_row(self, page_text: str, new_row: str,
+                      page_template: PageTemplate,
+                      parent_section: IndexedSection,
+                      table_section_title: str,
+                      is_edit: bool = False,
+                      edit_row_column_data: str = "") -> str:
         """
-        Get the first table of a section in a wiki page
+        Add the text of a section up to the end of its table to a
+        page, with a new row added to the table or one of its rows
+        replaced
 
         Keyword arguments:
-        text -- The text of a wiki page
-        section_title -- the title of the section
-                         in which the index is searched
+        page_text -- The text of the page being generated
+        new_row -- The wikitext of the new row
+        page_template -- The compiled page the section belongs to
+        parent_section -- The section being added to the page
+        table_section_title -- The title of the section, the parent
+                               section or one of its child sections,
+                               holding the table
+        is_edit -- Boolean indicating if the row is replaced
+        edit_row_column_data -- The data of the first column of the
+                                row being replaced
 
         Raises:
         WikiServiceError -- Exception raised when handling wiki
 
         Returns:
-        index -- The index of the section
-        """
-        section = self.get_section_index(
-            text,
-            section_title
-        )
-        sections = self.get_sections(text)
-        table = (
-            sections[section]
-            .get_tables()[0]
-        )
-        return table
-
-    def get_new_row_index(self, table, row_number=0):
-        """
-        Returns the position of the string where the new
-        table row will be added
-        """
-        table_column_numbers = self.get_table_column_numbers(table, row_number)
-        last_column_name = self.get_table_last_column_data(
-            table,
-            table_column_numbers,
-            row_number
-        )
-
-        str_index_end_header = (
-            re.search(last_column_name, str(table)).span()[1]
-        )
-        header_delimiter = "|-\n"
-        str_index_new_row = str_index_end_header + len(header_delimiter)
-        return str_index_new_row
-
-    def get_table_last_column_data(self, table: wtp.Table,
-                                   table_column_numbers: int,
-                                   row_number: int = 0) -> str:
-        """
-        Returns data from the last column of a table row
-
-        Keyword arguments:
-        table -- The table which the data is
-                 being searched
-        table_column_numbers -- The number of columns of
-                                the table
-        row_number -- The row number of the table which
-                      the data is being searched
-
-        Returns:
-        table_last_column_data -- Data from the last column
-                                  of a table row
+        page_text -- The text of the page with the section added
         """
-        table_last_column_data = str(
-            table.cells(row=row_number, column=table_column_numbers)
+        table_section = page_template.get_section(
+            table_section_title, parent_section.start
         )
-        table_last_column_data = table_last_column_data.partition("|")[-1]
-        return table_last_column_data
-
-    def add_table_row(self, page_text: str, new_row: str,
-                      table_section_title: str,
-                      table_template: str,
-                      is_edit: bool = False,
-                      edit_row_column_data: str = "") -> str:
-        """
-        Add a row to table
-        """
-
-        page_text += f"{table_template}"
-        table = self.get_section_table(
-            page_text,
-            table_section_title
-        )
-
-        table_string = str(table)
-        str_index_new_row = self.get_new_row_index(table)
-
-
+        if table_section is None or table_section.start >= parent_section.end:
+            raise WikiServiceError("The section you specified doesn't exist")
+        table_anchor = page_template.get_table_anchor(table_section)
+        if table_anchor is None:
+            raise WikiServiceError("The section you specified has no table")
+
+        # The text of the section after the table isn't kept
+        template_text = page_template.text
         if is_edit:
-            row_number = self.get_table_row_by_column_data(table, edit_row_column_data)
-            updated_table =self.edit_table_row(table, new_row, row_number)
-        else:
-            updated_table = (
-                table_string[:str_index_new_row] +
-                new_row + table_string[str_index_new_row:]
+            updated_table = self.edit_table_row(
+                template_text[table_anchor.start:table_anchor.end],
+                new_row,
+                edit_row_column_data
             )
-
-        text_before_table_index = page_text.find(table_string)
-        wtp_page_text = wtp.parse(page_text)
-        wtp_page_text.string = (
-            page_text[0:text_before_table_index] + updated_table
+            return (
+                page_text +
+                template_text[parent_section.start:table_anchor.start] +
+                updated_table
+            )
+        return (
+            page_text +
+            template_text[parent_section.start:table_anchor.header_end] +
+            new_row +
+            template_text[table_anchor.header_end:table_anchor.end]
         )
-        return str(wtp_page_text)
-
-    def get_table_column_numbers(self, table: wtp.Table,
-                                 row_number: int = 0) -> int:
-        """
-        Returns the number of columns in a table
-
-        Keyword arguments:
-        table -- The table which the number of columns is
-                 being searched
-        row_number -- The row number of the table which
-                      the number of columns is being
-                      searched
-
-        Returns:
-        table_column_numbers -- The number of columns in the
-                                table
-        """
-        table_data = table.data(span=False)
-        table_row = table_data[row_number]
-
-        # because indexing starts at 0
-        table_column_numbers = len(table_row) - 1
-        return table_column_numbers
 
     def generate_page_text_from_dict(self, template_text: str,
                                      page_initial_section: str,
@@ -472,15 +1494,17 @@ class WikiService:
         table_column_numbers -- The number of columns in the
                                 table
         """
-        parsed_text = wtp.parse(template_text)
-        sections = self.get_sections(template_text)
+        # The page templates are compiled once, other pages are
+        # scanned once and every helper reads the position of the
+        # sections and tables from the compiled page
+        page_template = get_page_template(template_text)
         updated_text = f"{page_initial_section}\n"
 
-        for section in sections:
+        for section in page_template.sections:
             if self.is_section_being_updated(section, page_data):
                 # Get the starting and ending position of a section's title
                 start_index, end_index = self.get_section_title_str_index(
-                    section, template_text
+                    section
                 )
                 page_section_data = page_data[section.title]
 
@@ -514,8 +1538,9 @@ class WikiService:
                                 updated_text = self.add_table_row(
                                     updated_text,
                                     page_section_data[child_section],
+                                    page_template,
+                                    section,
                                     table_section,
-                                    section.string,
                                     True,
                                     edit_row_column_data
                                 )
@@ -523,8 +1548,9 @@ class WikiService:
                                 updated_text = self.add_table_row(
                                     updated_text,
                                     page_section_data[child_section],
-                                    table_section,
-                                    section.string
+                                    page_template,
+                                    section,
+                                    table_section
                                 )
                 else:
                     # Update page text
@@ -538,8 +1564,9 @@ class WikiService:
                             updated_text = self.add_table_row(
                                 updated_text,
                                 page_section_data,
+                                page_template,
+                                section,
                                 table_section,
-                                section.string,
                                 True,
                                 edit_row_column_data
                             )
@@ -547,12 +1574,13 @@ class WikiService:
                             updated_text = self.add_table_row(
                                 updated_text,
                                 page_section_data,
-                                table_section,
-                                section.string
+                                page_template,
+                                section,
+                                table_section
                             )
         return updated_text
 
-    def is_section_being_updated(self, section: wtp.Section,
+    def is_section_being_updated(self, section: IndexedSection,
                                  page_data: dict) -> bool:
         """
         Check if the section is being updated or if it is
@@ -586,31 +1614,23 @@ class WikiService:
         else:
             return False
 
-    def get_section_title_str_index(self, section: wtp.Section,
-                                    template_text: str) -> tuple:
+    def get_section_title_str_index(self, section: IndexedSection) -> tuple:
         """
         Get the starting and ending position of
         a section's title string
 
         Keyword arguments:
-        section --
-        template_text --
+        section -- The section, as located by a SectionIndex
 
         Returns:
-        start_end_index,end_index --
+        start_index, end_index -- The position of the section's title,
+                                  including its section markers
         """
-        section_title_string = (
-            re.search(
-                f"(=)*({section.title})(=)*",
-                template_text
-            )
-        )
-        start_index = section_title_string.span()[0]
-        end_index = section_title_string.span()[1]
+        start_index, end_index = section.title_span
         return start_index, end_index
 
     def add_child_section_markers(self,
-                                  parent_section: wtp.Section,
+                                  parent_section: IndexedSection,
                                   child_section: str) -> str:
         """
         Parse text from child section by adding section
@@ -634,7 +1654,7 @@ class WikiService:
         return child_section_title
 
     def fix_child_section_string_position(self, page_data: dict,
-                                          section: wtp.Section,
+                                          section: IndexedSection,
                                           child_section_index: int) -> int:
         """
         Updates the position of the string in which the child section is
@@ -673,8 +1693,7 @@ class WikiService:
         hyperlinked_text -- The text with a hyperlink to an
                             external page
         """
-        hyperlinked_text = f"[{link} {text}]"
-        return hyperlinked_text
+        return ExternalLink(link, text).string
 
     def hyperlink_wiki_page(self, wiki_page: str, text: str) -> str:
         """
@@ -689,5 +1708,4 @@ class WikiService:
         hyperlinked_page -- The text with a hyperlink to a
                             wiki page
         """
-        hyperlinked_page = f"[[{wiki_page} | {text}]]"
-        return hyperlinked_page
+        return WikiLink(wiki_page, text).string
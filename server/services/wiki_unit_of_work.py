@@ -0,0 +1,190 @@
+from datetime import datetime, timezone
+
+from server.constants import WIKI_EDIT_CONFLICT_RETRIES
+from server.services.wiki_service import (
+    WikiEditConflictError,
+    WikiService
+)
+
+
+class WikiUnitOfWork:
+    """
+    The wiki pages read and written by one API call.
+
+    The pages are read ahead in one batch, together with the edit
+    token. The page services stage their changes, rendered against
+    this snapshot, and the changed pages are written back at the end.
+    Each edit is based on the revision read ahead, so MediaWiki
+    rejects it with an edit conflict when the page was changed or
+    deleted in between instead of overwriting the other edit. The
+    page is then read again and its staged changes, e.g. a new table
+    row, are applied to the new revision before the edit is retried.
+    """
+    def __init__(self, wiki_obj: WikiService = None,
+                 max_conflict_retries: int = WIKI_EDIT_CONFLICT_RETRIES):
+        self.wiki_obj = wiki_obj if wiki_obj is not None else WikiService()
+        self.max_conflict_retries = max_conflict_retries
+        self.token = None
+        self.start_timestamp = None
+
+        self.pages = {}
+        self.changes = {}
+        self.staged_texts = {}
+
+    @staticmethod
+    def get_current_timestamp() -> str:
+        """
+        Get the current time in the timestamp format of the MediaWiki
+        API, e.g. "2020-05-21T10:00:00Z"
+
+        Returns:
+        timestamp -- The current UTC time
+        """
+        return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def read_ahead(self, page_titles: list):
+        """
+        Fetch the pages the API call will read or write, and the edit
+        token, before any of them is rendered
+
+        Keyword arguments:
+        page_titles -- The titles of the pages
+        """
+        if self.start_timestamp is None:
+            self.start_timestamp = self.get_current_timestamp()
+        missing_titles = [
+            page_title for page_title in dict.fromkeys(page_titles)
+            if page_title not in self.pages
+        ]
+        if missing_titles:
+            self.pages.update(self.wiki_obj.get_pages(missing_titles))
+        if self.token is None:
+            self.token = self.wiki_obj.get_token()
+
+    def get_page(self, page_title: str) -> dict:
+        """
+        Get a page from the snapshot, with the changes staged for it
+        applied. A page that wasn't read ahead is fetched on its own
+
+        Keyword arguments:
+        page_title -- The title of the page
+
+        Returns:
+        page -- Dictionary with the content, existence and revision
+                of the page, as returned by WikiService.get_pages
+        """
+        if page_title not in self.pages:
+            self.read_ahead([page_title])
+        page = self.pages[page_title]
+        if page_title in self.staged_texts:
+            return {
+                **page,
+                "exists": True,
+                "text": self.staged_texts[page_title]
+            }
+        return page
+
+    def stage(self, page_title: str, change) -> str:
+        """
+        Render a change against the snapshot of a page and keep it
+        until the page is written back. Changes staged for the same
+        page are applied one after another
+
+        Keyword arguments:
+        page_title -- The title of the page
+        change -- Callable receiving the page, as returned by
+                  get_page, and returning its new text
+
+        Returns:
+        updated_text -- The text of the page with the change applied
+        """
+        updated_text = change(self.get_page(page_title))
+        self.changes.setdefault(page_title, []).append(change)
+        self.staged_texts[page_title] = updated_text
+        return updated_text
+
+    def get_change(self, page_title: str):
+        """
+        Get the changes staged for a page as a single change, so they
+        can be applied again to a newer copy of the page
+
+        Keyword arguments:
+        page_title -- The title of the page
+
+        Returns:
+        change -- Callable receiving the page and returning its new
+                  text, as accepted by PageWriteCoalescer.submit
+        """
+        changes = self.changes[page_title]
+
+        def apply_changes(page: dict) -> str:
+            for change in changes:
+                page = {**page, "exists": True, "text": change(page)}
+            return page["text"]
+        return apply_changes
+
+    def rebase(self, page_title: str):
+        """
+        Read a page again after an edit conflict and apply the changes
+        staged for it to the new revision
+
+        Keyword arguments:
+        page_title -- The title of the page
+        """
+        page = self.wiki_obj.get_pages([page_title])[page_title]
+        self.pages[page_title] = page
+        self.staged_texts[page_title] = self.get_change(page_title)(page)
+
+    def write_staged_text(self, page_title: str) -> dict:
+        """
+        Write the staged text of a page, creating the page if it didn't
+        exist when it was read
+
+        Keyword arguments:
+        page_title -- The title of the page
+
+        Returns:
+        data -- Dictionary with the MediaWiki API response of the edit
+        """
+        page = self.pages[page_title]
+        updated_text = self.staged_texts[page_title]
+        if not page["exists"]:
+            return self.wiki_obj.create_page(
+                self.token, page_title, updated_text
+            )
+        return self.wiki_obj.edit_page_sections(
+            self.token,
+            page_title,
+            page["text"],
+            updated_text,
+            base_revid=page["revid"],
+            base_timestamp=page["timestamp"],
+            start_timestamp=self.start_timestamp
+        )
+
+    def write_back(self, page_title: str) -> dict:
+        """
+        Write the staged text of a page, rebasing the staged changes on
+        the latest revision of the page after each edit conflict, up to
+        max_conflict_retries times. Pages can be written back from
+        different threads once all changes are staged
+
+        Keyword arguments:
+        page_title -- The title of the page
+
+        Raises:
+        WikiEditConflictError -- Exception raised when the page is
+                                 still changed concurrently after the
+                                 last retry
+        WikiServiceError -- Exception raised when the edit fails
+
+        Returns:
+        data -- Dictionary with the MediaWiki API response of the edit
+        """
+        for attempt in range(self.max_conflict_retries + 1):
+            try:
+                return self.write_staged_text(page_title)
+            except WikiEditConflictError:
+                if attempt == self.max_conflict_retries:
+                    raise
+                self.rebase(page_title)
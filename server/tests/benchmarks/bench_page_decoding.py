@@ -0,0 +1,196 @@
+"""
+Benchmark of decoding many wiki pages into document data.
+
+Usage:
+    python -m server.tests.benchmarks.bench_page_decoding [--pages 100 1000]
+"""
+import argparse
+import re
+from datetime import datetime
+
+from server.services.page_codec import (
+    ORGANISATION_PAGE_CODEC,
+    PROJECT_PAGE_CODEC
+)
+from server.services.project_page_service import ProjectPageService
+from server.services.table_index import iter_table_rows
+from server.services.wiki_page_service import WikiPageService
+from server.tests.benchmarks.bench_page_rendering import measure
+from server.tests.benchmarks.sample_pages import (
+    generate_organisation_page_text,
+    get_document
+)
+
+
+def decode_organisation_page_by_hand(text: str) -> dict:
+    """
+    The previous way of reading an organisation page, reading the
+    sections into a dictionary and taking the links apart with
+    string replacements
+    """
+    sections = WikiPageService.sections_to_dict(text)
+    organisation_url, organisation_name = (
+        sections["Organisation"]["Link"].replace("[", "").replace("]", "")
+        .replace("\n", "").split(" ", 1)
+    )
+    platform_url, platform_name = (
+        sections["Platform"]["Link"].replace("[", "").replace("]", "")
+        .replace("\n", "").split(" ", 1)
+    )
+    projects = []
+    for row in iter_table_rows(sections["Projects"]["Project list"]):
+        projects.append({
+            "name": row[0].replace("[", "").replace("\n", "")
+                          .split(" | ")[0],
+            "author": row[2],
+            "status": row[3]
+        })
+    return {
+        "organisation": {
+            "name": organisation_name,
+            "url": organisation_url,
+            "description": (
+                sections["Organisation"]["Description"].replace("\n", "")
+            )
+        },
+        "platform": {"name": platform_name, "url": platform_url},
+        "projects": projects
+    }
+
+
+def decode_project_page_by_hand(text: str) -> dict:
+    """
+    The previous way of reading a project page, reading the sections
+    into a dictionary and cleaning each section text
+    """
+    sections = WikiPageService.sections_to_dict(text)
+    project_sections = sections["Project"]
+    external_sources = sections["External Sources"]
+    created_date = re.search(
+        r"\d{2}\s\w+\s\d{4}",
+        project_sections["Timeframe"].replace("\n", "")
+    )
+    return {"project": {
+        "shortDescription": (
+            project_sections["Short Description"].replace("\n", "")
+        ),
+        "created": datetime.strptime(
+            created_date.group(), "%d %B %Y"
+        ).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        "url": project_sections["Url"].replace("\n", ""),
+        "changesetComment": (
+            "#" + project_sections["Hashtag"].replace("\n", "")
+            .split("</nowiki>")[-1]
+        ),
+        "externalSource": {
+            "instructions": (
+                external_sources["Instructions"].replace("\n", "")
+            ),
+            "perTaskInstructions": (
+                external_sources["Per Task Instructions"].replace("\n", "")
+            ),
+            "imagery": external_sources["Imagery"].replace("\n", ""),
+            "license": external_sources["License"].replace("\n", "")
+        },
+        "users": [
+            {"userId": row[0], "userName": row[1]}
+            for row in iter_table_rows(
+                sections["Team and User"]["List of Users"]
+            )
+        ]
+    }}
+
+
+def generate_project_pages(pages: int) -> list:
+    """
+    Generate the text of many project pages
+
+    Keyword arguments:
+    pages -- The number of project pages
+
+    Returns:
+    page_texts -- The text of each project page
+    """
+    project_page = ProjectPageService()
+    return [
+        project_page.generate_page_text(get_document(number))
+        for number in range(pages)
+    ]
+
+
+def run(page_counts: list, rows: int, repeat: int):
+    organisation_page_text = generate_organisation_page_text(rows)
+    # Both ways must read the same projects
+    assert (
+        [
+            project_row["project"]["name"] for project_row in
+            ORGANISATION_PAGE_CODEC.decode(organisation_page_text)["projects"]
+        ] ==
+        [
+            project["name"] for project in
+            decode_organisation_page_by_hand(organisation_page_text)
+            ["projects"]
+        ]
+    )
+
+    print(
+        f"{'pages':>7}{'page type':>14}{'by hand':>15}{'PageCodec':>15}"
+        f"{'pages/s':>12}"
+    )
+    for page_count in page_counts:
+        organisation_pages = [organisation_page_text] * page_count
+        project_pages = generate_project_pages(page_count)
+        benchmarks = [
+            (
+                "organisation",
+                lambda: [
+                    decode_organisation_page_by_hand(text)
+                    for text in organisation_pages
+                ],
+                lambda: [
+                    ORGANISATION_PAGE_CODEC.decode(text)
+                    for text in organisation_pages
+                ]
+            ),
+            (
+                "project",
+                lambda: [
+                    decode_project_page_by_hand(text)
+                    for text in project_pages
+                ],
+                lambda: [
+                    PROJECT_PAGE_CODEC.decode(text) for text in project_pages
+                ]
+            )
+        ]
+        for page_type, decode_by_hand, decode_with_codec in benchmarks:
+            hand_seconds = measure(decode_by_hand, repeat)
+            codec_seconds = measure(decode_with_codec, repeat)
+            print(
+                f"{page_count:>7}{page_type:>14}"
+                f"{hand_seconds * 1000:>13.2f}ms"
+                f"{codec_seconds * 1000:>13.2f}ms"
+                f"{page_count / codec_seconds:>12.0f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--pages", type=int, nargs="+", default=[100, 1000],
+        help="Number of pages decoded of each page type"
+    )
+    parser.add_argument(
+        "--rows", type=int, default=20,
+        help="Number of projects in the organisation pages"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Number of runs of each measurement, the best one is kept"
+    )
+    args = parser.parse_args()
+    run(args.pages, args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
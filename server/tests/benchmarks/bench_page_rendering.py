@@ -0,0 +1,116 @@
+"""
+Benchmark of the rendering of large wiki pages.
+
+Usage:
+    python -m server.tests.benchmarks.bench_page_rendering [--rows 100 1000]
+"""
+import argparse
+import time
+
+import wikitextparser as wtp
+
+from server.services.organisation_page_service import OrganisationPageService
+from server.services.overview_page_service import OverviewPageService
+from server.services.section_index import SectionIndex
+from server.services.table_index import TableIndex
+from server.services.wiki_service import WikiService
+from server.tests.benchmarks.sample_pages import (
+    generate_organisation_page_text,
+    generate_overview_page_text,
+    get_document
+)
+
+
+def measure(function, repeat: int) -> float:
+    """
+    Get the best time of several runs of a function
+
+    Keyword arguments:
+    function -- Callable being measured
+    repeat -- The number of runs
+
+    Returns:
+    seconds -- The time of the fastest run
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(rows: list, repeat: int):
+    wiki_obj = WikiService()
+    overview_page = OverviewPageService()
+    organisation_page = OrganisationPageService()
+    document = get_document(len(rows) and max(rows) + 1)
+
+    print(
+        f"{'page':<14}{'rows':>7}{'KiB':>8}{'wtp sections':>15}"
+        f"{'SectionIndex':>15}{'TableIndex':>13}{'add row':>12}"
+        f"{'edit row':>12}"
+    )
+    for page_name, generate_text, page_service, initial_section, \
+            table_section in (
+                ("overview", generate_overview_page_text, overview_page,
+                 "", overview_page.activities_list_section),
+                ("organisation", generate_organisation_page_text,
+                 organisation_page, organisation_page.page_initial_section,
+                 organisation_page.projects_list_section)
+            ):
+        page_sections = page_service.document_to_page_sections(document)
+        for row_count in rows:
+            page_text = generate_text(row_count)
+            page = {"exists": True, "text": page_text}
+            table = page_text[page_text.index("{|"):]
+            last_row_key = TableIndex(table).keys()[-1]
+
+            wtp_seconds = measure(
+                lambda: wtp.parse(page_text).sections, repeat
+            )
+            section_index_seconds = measure(
+                lambda: SectionIndex(page_text), repeat
+            )
+            table_index_seconds = measure(lambda: TableIndex(table), repeat)
+            add_row_seconds = measure(
+                lambda: page_service.generate_page_text(document, page),
+                repeat
+            )
+            edit_row_seconds = measure(
+                lambda: wiki_obj.generate_page_text_from_dict(
+                    page_text,
+                    initial_section,
+                    page_sections,
+                    table_section,
+                    is_edit=True,
+                    edit_row_column_data=last_row_key
+                ),
+                repeat
+            )
+            print(
+                f"{page_name:<14}{row_count:>7}{len(page_text) / 1024:>8.0f}"
+                f"{wtp_seconds * 1000:>13.2f}ms"
+                f"{section_index_seconds * 1000:>13.2f}ms"
+                f"{table_index_seconds * 1000:>11.2f}ms"
+                f"{add_row_seconds * 1000:>10.2f}ms"
+                f"{edit_row_seconds * 1000:>10.2f}ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[100, 1000, 5000],
+        help="Number of table rows of the benchmarked pages"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Number of runs of each measurement, the best one is kept"
+    )
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
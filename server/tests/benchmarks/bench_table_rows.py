@@ -0,0 +1,95 @@
+"""
+Benchmark of reading the rows of large wiki tables.
+
+Usage:
+    python -m server.tests.benchmarks.bench_table_rows [--rows 100 5000]
+"""
+import argparse
+
+import wikitextparser as wtp
+
+from server.services.table_index import iter_table_rows
+from server.services.templates import ProjectPage
+from server.tests.benchmarks.bench_page_rendering import measure
+from server.tests.benchmarks.sample_pages import remove_table_end
+
+
+# Reading with wikitextparser is quadratic, larger tables take minutes
+MAX_WIKITEXTPARSER_ROWS = 100
+
+
+def read_rows_with_wikitextparser(text: str) -> list:
+    """
+    The previous way of reading a table, walking the table again
+    for every cell
+    """
+    table = wtp.parse(text).get_tables()[0]
+    table_data = table.data(span=False)
+    rows = []
+    for table_row_number, table_row_data in enumerate(table_data[1:], start=1):
+        rows.append([
+            table.cells(row=table_row_number, column=column).value.strip()
+            for column in range(len(table_row_data))
+        ])
+    return rows
+
+
+def generate_users_list_text(rows: int) -> str:
+    """
+    Generate the "List of Users" table of a project page
+
+    Keyword arguments:
+    rows -- The number of users
+
+    Returns:
+    table -- The wikitext of the table
+    """
+    template = ProjectPage.PAGE_TEMPLATE.value
+    table = template[template.index("{|"):]
+    return remove_table_end(table) + "".join(
+        f"\n| {user_id}\n| mapper {user_id}\n|-" for user_id in range(rows)
+    ) + "\n|}"
+
+
+def run(row_counts: list, repeat: int):
+    print(
+        f"{'users':>7}{'KiB':>8}{'wikitextparser':>17}"
+        f"{'iter_table_rows':>18}"
+    )
+    for row_count in row_counts:
+        text = generate_users_list_text(row_count)
+        wtp_timing = "skipped"
+        if row_count <= MAX_WIKITEXTPARSER_ROWS:
+            # Both ways must read the same rows
+            assert (
+                list(iter_table_rows(text)) ==
+                read_rows_with_wikitextparser(text)
+            )
+            wtp_seconds = measure(
+                lambda: read_rows_with_wikitextparser(text), repeat
+            )
+            wtp_timing = f"{wtp_seconds * 1000:.2f}ms"
+
+        rows_seconds = measure(lambda: list(iter_table_rows(text)), repeat)
+        print(
+            f"{row_count:>7}{len(text) / 1024:>8.0f}{wtp_timing:>17}"
+            f"{rows_seconds * 1000:>16.2f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[50, 100, 5000],
+        help="Number of rows of the benchmarked tables"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Number of runs of each measurement, the best one is kept"
+    )
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
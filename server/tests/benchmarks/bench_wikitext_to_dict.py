@@ -0,0 +1,129 @@
+"""
+Benchmark of reading wiki pages into dictionaries of sections.
+
+Usage:
+    python -m server.tests.benchmarks.bench_wikitext_to_dict \
+        [--sections 10 100]
+"""
+import argparse
+import re
+
+import wikitextparser as wtp
+
+from server.services.wiki_page_service import WikiPageService
+from server.tests.benchmarks.bench_page_rendering import measure
+from server.tests.benchmarks.sample_pages import (
+    generate_organisation_page_text
+)
+
+
+def sections_to_dict_with_wikitextparser(text: str) -> dict:
+    """
+    The previous implementation of WikiPageService.wikitext_to_dict,
+    parsing the page and each of its sections with wikitextparser
+    """
+    sections = wtp.parse(text).sections
+
+    dictionary = {}
+    for section in sections:
+        if section.title is not None:
+            parent_section_level = 2
+            section_title_string = (
+                re.search(
+                    f"(=){{{parent_section_level}}}({section.title})"
+                    f"(=){{{parent_section_level}}}\n",
+                    section.string
+                )
+            )
+            if section_title_string is not None:
+                start_index, end_index = section_title_string.span()
+                removed_section_parent = section.string[end_index:]
+                children_sections = wtp.parse(removed_section_parent).sections
+                children_dict = {}
+
+                for child_section in children_sections:
+                    if child_section.title is not None:
+                        child_section_title_string = (
+                            re.search(
+                                f"(=){{{parent_section_level + 1}}}"
+                                f"({child_section.title})"
+                                f"(=){{{parent_section_level + 1}}}",
+                                child_section.string
+                            )
+                        )
+                        child_end_index = child_section_title_string.span()[-1]
+                        children_dict[child_section.title] = (
+                            child_section.string[child_end_index:]
+                        )
+                        dictionary[section.title] = children_dict
+
+                if not children_dict:
+                    dictionary[section.title] = removed_section_parent
+    return dictionary
+
+
+def generate_sections_page_text(sections: int) -> str:
+    """
+    Generate the text of a page with many sections, each with
+    child sections
+
+    Keyword arguments:
+    sections -- The number of second level sections
+
+    Returns:
+    page_text -- The text of the page
+    """
+    return "=Activity=\n" + "".join(
+        f"==Section {number}==\n"
+        f"===Link===\n[https://example.org/{number} Link]\n"
+        f"===Description===\nDescription {number}\n"
+        f"====Notes====\nNotes {number}\n"
+        for number in range(sections)
+    )
+
+
+def run(section_counts: list, repeat: int):
+    print(
+        f"{'page':<24}{'KiB':>8}{'wikitextparser':>17}{'SectionIndex':>15}"
+    )
+    pages = [
+        (f"{count} sections", generate_sections_page_text(count))
+        for count in section_counts
+    ] + [
+        (f"{count} project rows", generate_organisation_page_text(count))
+        for count in section_counts
+    ]
+    for page_name, page_text in pages:
+        # Both implementations must read the same dictionary
+        assert (
+            WikiPageService.sections_to_dict(page_text) ==
+            sections_to_dict_with_wikitextparser(page_text)
+        )
+        wtp_seconds = measure(
+            lambda: sections_to_dict_with_wikitextparser(page_text), repeat
+        )
+        index_seconds = measure(
+            lambda: WikiPageService.sections_to_dict(page_text), repeat
+        )
+        print(
+            f"{page_name:<24}{len(page_text) / 1024:>8.0f}"
+            f"{wtp_seconds * 1000:>15.2f}ms{index_seconds * 1000:>13.2f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--sections", type=int, nargs="+", default=[10, 100, 1000],
+        help="Number of sections, and of project rows, of the pages"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Number of runs of each measurement, the best one is kept"
+    )
+    args = parser.parse_args()
+    run(args.sections, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
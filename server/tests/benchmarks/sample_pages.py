@@ -0,0 +1,111 @@
+import copy
+
+from server.services.overview_page_service import OverviewPageService
+from server.services.organisation_page_service import OrganisationPageService
+from server.services.templates import OrgActivityPage, OverviewPage
+
+
+SAMPLE_DOCUMENT = {
+    "project": {
+        "projectId": 1,
+        "status": "Active",
+        "name": "Project 1",
+        "shortDescription": "Map buildings",
+        "changesetComment": "#hotosm-project-1",
+        "author": "mapper",
+        "url": "https://tasks.hotosm.org/projects/1",
+        "created": "2020-05-21T10:11:12.000123Z",
+        "externalSource": {
+            "imagery": "Bing",
+            "license": "CC-BY",
+            "instructions": "Map all buildings",
+            "perTaskInstructions": "Map the buildings of the task"
+        },
+        "users": [{"userId": 1, "userName": "mapper"}]
+    },
+    "organisation": {
+        "name": "Organisation 1",
+        "description": "Humanitarian mapping",
+        "url": "https://example.org"
+    },
+    "platform": {
+        "name": "HOT Tasking Manager",
+        "url": "https://tasks.hotosm.org"
+    }
+}
+
+
+def get_document(number: int) -> dict:
+    """
+    Get a sample document with its own organisation and project
+    names
+
+    Keyword arguments:
+    number -- The number identifying the organisation and project
+
+    Returns:
+    document -- The sample document
+    """
+    document = copy.deepcopy(SAMPLE_DOCUMENT)
+    document["project"]["projectId"] = number
+    document["project"]["name"] = f"Project {number}"
+    document["organisation"]["name"] = f"Organisation {number}"
+    return document
+
+
+def remove_table_end(table: str) -> str:
+    """
+    Remove the end marker of a table, so rows can be appended to it
+
+    Keyword arguments:
+    table -- The wikitext of the table
+
+    Returns:
+    table -- The wikitext of the table without its end marker
+    """
+    return table.rstrip("\n")[:-len("\n|}")]
+
+
+def generate_overview_page_text(rows: int) -> str:
+    """
+    Generate the text of an overview page listing many organisations
+
+    Keyword arguments:
+    rows -- The number of organisations in the activities list
+
+    Returns:
+    page_text -- The text of the overview page
+    """
+    overview_page = OverviewPageService()
+    table_rows = "".join(
+        overview_page.generate_activities_list_table_row(get_document(number))
+        for number in range(rows)
+    )
+    return (
+        f"=={OverviewPage.ACTIVITIES_LIST_SECTION_TITLE.value}==\n"
+        f"{remove_table_end(OverviewPage.ACTIVITIES_LIST_TABLE.value)}"
+        f"{table_rows}\n|}}"
+    )
+
+
+def generate_organisation_page_text(rows: int) -> str:
+    """
+    Generate the text of an organisation page listing many projects
+
+    Keyword arguments:
+    rows -- The number of projects in the project list
+
+    Returns:
+    page_text -- The text of the organisation page
+    """
+    organisation_page = OrganisationPageService()
+    page_text = organisation_page.generate_page_text(
+        SAMPLE_DOCUMENT, {"exists": False, "text": None}
+    )
+    table_rows = "".join(
+        organisation_page.generate_page_sections_dict(get_document(number))
+        [OrgActivityPage.PROJECT_SECTION.value]
+        [OrgActivityPage.PROJECT_LIST_SECTION.value]
+        for number in range(2, rows + 1)
+    )
+    return remove_table_end(page_text) + table_rows + "\n|}"
@@ -0,0 +1,532 @@
+"""
+In-memory stand-in for the MediaWiki API subset used by WikiService.
+
+It can run in-process for tests and benchmarks:
+
+    fake_wiki = FakeWiki(latency=0.05).start()
+    pool = WikiSessionPool(endpoint=fake_wiki.url, bot_name="bot",
+                           bot_password="password")
+    ...
+    fake_wiki.stop()
+
+or on localhost, pointing the app to it through WIKI_API_ENDPOINT:
+
+    python -m server.tests.fake_wiki --port 8081 --latency 0.05
+"""
+import argparse
+import itertools
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+
+class FakeWiki:
+    """
+    Fake MediaWiki API storing pages and their revisions in memory.
+
+    Latency can be set for every call or per action, and errors can be
+    injected for the next calls of an action with inject_error and
+    inject_http_error, or for every edit of a page with protect_page.
+    """
+    HEADING_REGEX = re.compile(r"^(={1,6})(.+?)\1[ \t]*$", re.MULTILINE)
+
+    def __init__(self, bot_name: str = None, bot_password: str = None,
+                 latency: float = 0, action_latency: dict = None,
+                 lag: float = 0):
+        self.bot_name = bot_name
+        self.bot_password = bot_password
+        self.latency = latency
+        self.action_latency = action_latency or {}
+        self.lag = lag
+
+        self.pages = {}
+        self.calls = []
+        self.sessions = {}
+        self.injected_errors = defaultdict(deque)
+        self.protected_titles = set()
+        self._revision_ids = itertools.count(1)
+        self._last_timestamp = datetime.min.replace(tzinfo=timezone.utc)
+        self._lock = threading.Lock()
+        self._server = None
+
+        self.app = Flask(__name__)
+        self.app.add_url_rule(
+            "/api.php", "api", self.handle_request, methods=["GET", "POST"]
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api.php"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Serve the fake API from a background thread
+
+        Keyword arguments:
+        host -- The host the server listens on
+        port -- The port the server listens on, 0 picking a free one
+
+        Returns:
+        fake_wiki -- The started FakeWiki
+        """
+        self._server = make_server(host, port, self.app, threaded=True)
+        threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        ).start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving the fake API
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+    @staticmethod
+    def normalize_title(title: str) -> str:
+        title = title.replace("_", " ").strip()
+        return title[:1].upper() + title[1:]
+
+    def set_page(self, title: str, text: str) -> int:
+        """
+        Save a revision of a page directly, without an API call
+
+        Keyword arguments:
+        title -- The title of the page
+        text -- The text of the revision
+
+        Returns:
+        revid -- The id of the new revision
+        """
+        with self._lock:
+            return self._save_revision(self.normalize_title(title), text)
+
+    def get_page_text(self, title: str) -> str:
+        """
+        Get the text of the latest revision of a page
+
+        Keyword arguments:
+        title -- The title of the page
+
+        Returns:
+        text -- The page text, or None if the page doesn't exist
+        """
+        revisions = self.pages.get(self.normalize_title(title))
+        return revisions[-1]["text"] if revisions else None
+
+    def protect_page(self, title: str):
+        """
+        Reject every later edit of a page with a protectedpage error
+
+        Keyword arguments:
+        title -- The title of the page
+        """
+        with self._lock:
+            self.protected_titles.add(self.normalize_title(title))
+
+    def inject_error(self, action: str, code: str, count: int = 1,
+                     retry_after: int = None):
+        """
+        Answer the next calls of an action with a MediaWiki API error
+
+        Keyword arguments:
+        action -- The API action, e.g. "edit" or "query"
+        code -- The error code, e.g. "ratelimited"
+        count -- The number of calls answered with the error
+        retry_after -- Value of the Retry-After header, if any
+        """
+        for _ in range(count):
+            self.injected_errors[action].append((200, code, retry_after))
+
+    def inject_http_error(self, action: str, status: int, count: int = 1,
+                          retry_after: int = None):
+        """
+        Answer the next calls of an action with an HTTP error
+
+        Keyword arguments:
+        action -- The API action, e.g. "edit" or "query"
+        status -- The HTTP status, e.g. 503
+        count -- The number of calls answered with the error
+        retry_after -- Value of the Retry-After header, if any
+        """
+        for _ in range(count):
+            self.injected_errors[action].append((status, None, retry_after))
+
+    def count_calls(self, action: str = None) -> int:
+        """
+        Count the API calls received
+
+        Keyword arguments:
+        action -- Only count the calls of this action
+
+        Returns:
+        int -- The number of calls
+        """
+        return len([
+            call for call in self.calls
+            if action is None or call["action"] == action
+        ])
+
+    def handle_request(self):
+        params = {**request.args.to_dict(), **request.form.to_dict()}
+        action = params.get("action")
+        self.calls.append(params)
+        time.sleep(self.action_latency.get(action, self.latency))
+
+        if self.injected_errors[action]:
+            status, code, retry_after = self.injected_errors[action].popleft()
+            return self.error_response(code, status, retry_after)
+        if "maxlag" in params and self.lag > float(params["maxlag"]):
+            return self.error_response("maxlag", retry_after=1)
+
+        session_id = request.cookies.get("fakewiki_session")
+        if session_id not in self.sessions:
+            session_id = uuid.uuid4().hex
+            self.sessions[session_id] = {"user": None, "csrftoken": None}
+        session = self.sessions[session_id]
+
+        if (params.get("assert") == "user" and session["user"] is None and
+           action != "login"):
+            response = self.error_response("assertuserfailed")
+        else:
+            handler = getattr(self, f"action_{action}", None)
+            if handler is None:
+                response = self.error_response("badvalue")
+            else:
+                with self._lock:
+                    response = jsonify(handler(params, session))
+        response.set_cookie("fakewiki_session", session_id)
+        return response
+
+    def error_response(self, code: str, status: int = 200,
+                       retry_after: int = None):
+        if code is not None:
+            response = jsonify(error={"code": code, "info": code})
+        else:
+            response = jsonify({})
+        response.status_code = status
+        if retry_after is not None:
+            response.headers["Retry-After"] = str(retry_after)
+        return response
+
+    def action_query(self, params: dict, session: dict) -> dict:
+        if params.get("meta") == "tokens":
+            token_type = params.get("type", "csrf")
+            if token_type == "login":
+                session["logintoken"] = f"{uuid.uuid4().hex}+\\"
+                return {"query": {"tokens": {
+                    "logintoken": session["logintoken"]
+                }}}
+            if session["csrftoken"] is None:
+                session["csrftoken"] = (
+                    f"{uuid.uuid4().hex}+\\" if session["user"] else "+\\"
+                )
+            return {"query": {"tokens": {"csrftoken": session["csrftoken"]}}}
+        if params.get("list") == "search":
+            return self.query_search(params)
+        if "titles" in params:
+            return self.query_titles(params)
+        return {"error": {"code": "badvalue", "info": "badvalue"}}
+
+    def query_titles(self, params: dict) -> dict:
+        props = params.get("prop", "").split("|")
+        normalized = []
+        pages = []
+        for title in params["titles"].split("|"):
+            normalized_title = self.normalize_title(title)
+            if normalized_title != title:
+                normalized.append({"from": title, "to": normalized_title})
+            if len(normalized_title.encode("utf-8")) > 255:
+                pages.append({
+                    "title": title,
+                    "invalidreason": "The requested page title is too long",
+                    "invalid": True
+                })
+                continue
+            revisions = self.pages.get(normalized_title)
+            if not revisions:
+                pages.append({"title": normalized_title, "missing": True})
+                continue
+            revision = revisions[-1]
+            page = {"title": normalized_title}
+            if "info" in props:
+                page.update({
+                    "lastrevid": revision["revid"],
+                    "touched": revision["timestamp"],
+                    "length": len(revision["text"].encode("utf-8"))
+                })
+            if "revisions" in props:
+                page["revisions"] = [{
+                    "revid": revision["revid"],
+                    "timestamp": revision["timestamp"],
+                    "slots": {"main": {"content": revision["text"]}}
+                }]
+            pages.append(page)
+        query = {"pages": pages}
+        if normalized:
+            query["normalized"] = normalized
+        return {"query": query}
+
+    def query_search(self, params: dict) -> dict:
+        search_text = params["srsearch"].lower()
+        results = [
+            {"title": title, "sectiontitle": ""}
+            for title, revisions in self.pages.items()
+            if search_text in revisions[-1]["text"].lower()
+        ]
+        return {"query": {
+            "searchinfo": {"totalhits": len(results)},
+            "search": results
+        }}
+
+    def action_login(self, params: dict, session: dict) -> dict:
+        is_valid_token = params.get("lgtoken") == session.get("logintoken")
+        is_valid_password = (
+            self.bot_password is None or
+            (params.get("lgname") == self.bot_name and
+             params.get("lgpassword") == self.bot_password)
+        )
+        if not is_valid_token:
+            return {"login": {"result": "WrongToken"}}
+        if not is_valid_password:
+            return {"login": {"result": "Failed"}}
+        session["user"] = params.get("lgname")
+        session["csrftoken"] = None
+        return {"login": {"result": "Success", "lgusername": session["user"]}}
+
+    def action_checktoken(self, params: dict, session: dict) -> dict:
+        is_valid = (
+            session["csrftoken"] is not None and
+            params.get("token") == session["csrftoken"]
+        )
+        return {"checktoken": {"result": "valid" if is_valid else "invalid"}}
+
+    def action_parse(self, params: dict, session: dict) -> dict:
+        title = self.normalize_title(params["page"])
+        revisions = self.pages.get(title)
+        if not revisions:
+            return {"error": {"code": "missingtitle", "info": "missingtitle"}}
+        return {"parse": {
+            "title": title,
+            "pageid": 1,
+            "wikitext": {"*": revisions[-1]["text"]}
+        }}
+
+    def action_edit(self, params: dict, session: dict) -> dict:
+        if (session["csrftoken"] is None or
+           params.get("token") != session["csrftoken"]):
+            return {"error": {"code": "badtoken", "info": "badtoken"}}
+        title = self.normalize_title(params["title"])
+        revisions = self.pages.get(title)
+        if title in self.protected_titles:
+            return {"error": {"code": "protectedpage", "info": "protected"}}
+        if params.get("createonly") and revisions:
+            return {"error": {"code": "articleexists", "info": "exists"}}
+        if params.get("nocreate") and not revisions:
+            return {"error": {"code": "missingtitle", "info": "missing"}}
+        if revisions and not self.can_merge(revisions, params):
+            return {"error": {"code": "editconflict", "info": "conflict"}}
+
+        text = params.get("text", "")
+        if "section" in params:
+            text = self.replace_section(
+                revisions[-1]["text"] if revisions else "",
+                int(params["section"]),
+                text
+            )
+        if revisions and revisions[-1]["text"] == text.rstrip():
+            return {"edit": {
+                "result": "Success", "title": title, "nochange": ""
+            }}
+        edit = {"result": "Success", "title": title}
+        if revisions is None:
+            edit["new"] = ""
+        else:
+            edit["oldrevid"] = revisions[-1]["revid"]
+        edit["newrevid"] = self._save_revision(title, text)
+        edit["newtimestamp"] = self.pages[title][-1]["timestamp"]
+        return {"edit": edit}
+
+    def get_base_revision(self, revisions: list, params: dict) -> dict:
+        """
+        Get the revision an edit is based on, from its baserevid or
+        basetimestamp
+
+        Keyword arguments:
+        revisions -- The revisions of the edited page
+        params -- The parameters of the edit
+
+        Returns:
+        revision -- The base revision, the latest one when the edit
+                    names none, or None if it is unknown
+        """
+        base_revision = revisions[-1]
+        if params.get("baserevid"):
+            base_revision = next((
+                revision for revision in revisions
+                if revision["revid"] == int(params["baserevid"])
+            ), None)
+        if base_revision is not None and params.get("basetimestamp"):
+            base_revision = next((
+                revision for revision in reversed(revisions)
+                if revision["timestamp"] <= params["basetimestamp"] and
+                revision["revid"] <= base_revision["revid"]
+            ), None)
+        return base_revision
+
+    def can_merge(self, revisions: list, params: dict) -> bool:
+        """
+        Check if an edit can be applied to the latest revision of a
+        page. Like MediaWiki, an edit based on an older revision is
+        merged when the page only changed outside the edited section
+        since then, otherwise it is an edit conflict
+
+        Keyword arguments:
+        revisions -- The revisions of the edited page
+        params -- The parameters of the edit
+
+        Returns:
+        bool -- Whether the edit can be applied
+        """
+        base_revision = self.get_base_revision(revisions, params)
+        if base_revision is revisions[-1]:
+            return True
+        if base_revision is None or "section" not in params:
+            return False
+        base_text = base_revision["text"]
+        current_text = revisions[-1]["text"]
+        section_number = int(params["section"])
+        headings = [
+            heading.group(0)
+            for heading in self.HEADING_REGEX.finditer(base_text)
+        ]
+        if headings != [
+                heading.group(0)
+                for heading in self.HEADING_REGEX.finditer(current_text)]:
+            return False
+        base_start, base_end = self.get_section_span(
+            base_text, section_number
+        )
+        current_start, current_end = self.get_section_span(
+            current_text, section_number
+        )
+        return (
+            base_text[base_start:base_end].rstrip() ==
+            current_text[current_start:current_end].rstrip()
+        )
+
+    def get_section_span(self, page_text: str,
+                         section_number: int) -> tuple:
+        """
+        Find a section of a page the way MediaWiki does
+
+        Keyword arguments:
+        page_text -- The text of the page
+        section_number -- The number of the section, 0 being the text
+                          before the first heading
+
+        Returns:
+        span -- Tuple with the start and end offsets of the section,
+                including its subsections
+        """
+        headings = list(self.HEADING_REGEX.finditer(page_text))
+        if section_number == 0:
+            return 0, headings[0].start() if headings else len(page_text)
+        heading = headings[section_number - 1]
+        level = len(heading.group(1))
+        for next_heading in headings[section_number:]:
+            if len(next_heading.group(1)) <= level:
+                return heading.start(), next_heading.start()
+        return heading.start(), len(page_text)
+
+    def replace_section(self, page_text: str, section_number: int,
+                        section_text: str) -> str:
+        """
+        Replace a section of a page the way MediaWiki does
+
+        Keyword arguments:
+        page_text -- The current text of the page
+        section_number -- The number of the section, 0 being the text
+                          before the first heading
+        section_text -- The new text of the section
+
+        Returns:
+        text -- The text of the page after the edit
+        """
+        start, end = self.get_section_span(page_text, section_number)
+        text_after = page_text[end:]
+        text = page_text[:start] + section_text
+        if text_after:
+            text += "\n\n" + text_after
+        return text
+
+    def _save_revision(self, title: str, text: str) -> int:
+        revid = next(self._revision_ids)
+        # Timestamps have a one second resolution, revisions get
+        # increasing ones so basetimestamp can tell them apart
+        self._last_timestamp = max(
+            datetime.now(timezone.utc).replace(microsecond=0),
+            self._last_timestamp + timedelta(seconds=1)
+        )
+        self.pages.setdefault(title, []).append({
+            "revid": revid,
+            "timestamp": self._last_timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            # MediaWiki strips trailing whitespace when saving
+            "text": text.rstrip()
+        })
+        return revid
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve a fake MediaWiki API for tests and benchmarks"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--bot-name", default=None)
+    parser.add_argument("--bot-password", default=None)
+    parser.add_argument(
+        "--latency", type=float, default=0,
+        help="Seconds added to every API call"
+    )
+    parser.add_argument(
+        "--edit-latency", type=float, default=None,
+        help="Seconds added to edit calls, overriding --latency"
+    )
+    parser.add_argument(
+        "--lag", type=float, default=0,
+        help="Replication lag reported to requests sending maxlag"
+    )
+    arguments = parser.parse_args()
+
+    action_latency = {}
+    if arguments.edit_latency is not None:
+        action_latency["edit"] = arguments.edit_latency
+    fake_wiki = FakeWiki(
+        bot_name=arguments.bot_name,
+        bot_password=arguments.bot_password,
+        latency=arguments.latency,
+        action_latency=action_latency,
+        lag=arguments.lag
+    )
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    fake_wiki.start(arguments.host, arguments.port)
+    print(f"WIKI_API_ENDPOINT={fake_wiki.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake_wiki.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import TestCase, mock
+from server.services.job_service import (
+    JobQueue,
+    JobService,
+    JobServiceError
+)
+from server.tests.base_test_config import BaseTestCase
+from server.tests.benchmarks.sample_pages import get_document
+from server.tests.fake_wiki import FakeWiki
+
+
+class TestJobQueue(TestCase):
+    def setUp(self):
+        self.queue_dir = tempfile.TemporaryDirectory()
+        self.queue = JobQueue(
+            os.path.join(self.queue_dir.name, "jobs.sqlite3")
+        )
+
+    def tearDown(self):
+        self.queue_dir.cleanup()
+
+    def test_claim_must_return_oldest_pending_job(self):
+        first_job = self.queue.put("kind", {"number": 1})
+        self.queue.put("kind", {"number": 2})
+
+        claimed_job = self.queue.claim("host:1")
+        self.assertEqual(claimed_job["id"], first_job["id"])
+        self.assertEqual(claimed_job["status"], JobQueue.RUNNING)
+        self.assertEqual(claimed_job["payload"], {"number": 1})
+        self.assertEqual(self.queue.count_pending(), 1)
+
+    def test_claim_must_return_none_without_pending_jobs(self):
+        self.assertIsNone(self.queue.claim("host:1"))
+
+    def test_finish_must_store_result_and_error(self):
+        job = self.queue.put("kind", {})
+        self.queue.claim("host:1")
+        self.queue.finish(job["id"], result={"page": "failed"}, error="Error")
+
+        finished_job = self.queue.get(job["id"])
+        self.assertEqual(finished_job["status"], JobQueue.FAILED)
+        self.assertEqual(finished_job["result"], {"page": "failed"})
+        self.assertEqual(finished_job["error"], "Error")
+
+    def test_requeue_abandoned_must_only_requeue_stopped_owners(self):
+        abandoned_job = self.queue.put("kind", {})
+        self.queue.claim("stopped:1")
+        running_job = self.queue.put("kind", {})
+        self.queue.claim("running:1")
+
+        requeued_jobs = self.queue.requeue_abandoned(
+            lambda owner: owner.startswith("running")
+        )
+        self.assertEqual(requeued_jobs, 1)
+        self.assertEqual(
+            self.queue.get(abandoned_job["id"])["status"], JobQueue.PENDING
+        )
+        self.assertEqual(
+            self.queue.get(running_job["id"])["status"], JobQueue.RUNNING
+        )
+
+
+class TestJobService(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.queue_dir = tempfile.TemporaryDirectory()
+        self.app.config["JOB_QUEUE_PATH"] = os.path.join(
+            self.queue_dir.name, "jobs.sqlite3"
+        )
+        self.job_service = self.create_job_service()
+
+    def tearDown(self):
+        self.job_service.shutdown()
+        self.queue_dir.cleanup()
+
+    def create_job_service(self):
+        job_service = JobService(workers=1, shutdown_timeout=5)
+        job_service.register_handler("echo", lambda payload: payload)
+        job_service.init_app(self.app)
+        return job_service
+
+    def wait_for_job(self, job_id):
+        for _ in range(100):
+            job = self.job_service.get_job(job_id)
+            if job["status"] in (JobQueue.SUCCEEDED, JobQueue.FAILED):
+                return job
+            time.sleep(0.05)
+        self.fail(f"Job {job_id} didn't finish")
+
+    def test_failed_jobs_must_store_their_error(self):
+        def fail_with_result(payload):
+            raise JobServiceError("Page not written", result={"page": "x"})
+
+        def fail(payload):
+            raise ValueError("Unexpected error")
+        self.job_service.register_handler("fail_with_result", fail_with_result)
+        self.job_service.register_handler("fail", fail)
+
+        job = self.wait_for_job(
+            self.job_service.submit("fail_with_result", {})["id"]
+        )
+        self.assertEqual(job["status"], JobQueue.FAILED)
+        self.assertEqual(job["error"], "Page not written")
+        self.assertEqual(job["result"], {"page": "x"})
+
+        job = self.wait_for_job(self.job_service.submit("fail", {})["id"])
+        self.assertEqual(job["status"], JobQueue.FAILED)
+        self.assertEqual(job["error"], "Unexpected error")
+        self.assertIsNone(job["result"])
+
+        with self.assertRaises(JobServiceError):
+            self.job_service.submit("unknown", {})
+
+    def test_jobs_of_stopped_process_must_run_again_on_start(self):
+        queue = self.job_service.get_queue()
+        job = queue.put("echo", {"number": 1})
+        # Claimed by this process before it was restarted
+        queue.claim(self.job_service.owner)
+
+        self.job_service = self.create_job_service()
+
+        job = self.wait_for_job(job["id"])
+        self.assertEqual(job["status"], JobQueue.SUCCEEDED)
+        self.assertEqual(job["result"], {"number": 1})
+
+    def test_async_request_must_be_accepted_as_job(self):
+        self.job_service.register_handler(
+            "wiki_document", lambda document_data: {"project": "ok"}
+        )
+        for module in ("jobs", "wiki_documents"):
+            job_service = mock.patch(
+                f"server.api.{module}.resources.job_service",
+                self.job_service
+            )
+            job_service.start()
+            self.addCleanup(job_service.stop)
+
+        response = self.client.post(
+            "/wiki-document/?async=true", json=get_document(1)
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(
+            response.json["location"], f"/jobs/{response.json['jobId']}"
+        )
+        self.wait_for_job(response.json["jobId"])
+
+        response = self.client.get(response.json["location"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["status"], JobQueue.SUCCEEDED)
+        self.assertEqual(response.json["result"], {"project": "ok"})
+        self.assertGreaterEqual(response.json["runSeconds"], 0)
+
+        response = self.client.get("/jobs/missing")
+        self.assertEqual(response.status_code, 404)
+
+
+class TestJobServiceShutdown(TestCase):
+    # Queues wiki_document jobs and exits right away, leaving the jobs
+    # to the shutdown of the job service
+    SUBMIT_JOBS_SCRIPT = (
+        "from server import create_app\n"
+        "from server.services.job_service import job_service\n"
+        "from server.tests.benchmarks.sample_pages import get_document\n"
+        "with create_app().app_context():\n"
+        "    for number in (1, 2, 3):\n"
+        "        job_service.submit('wiki_document', get_document(number))\n"
+    )
+
+    def setUp(self):
+        self.queue_dir = tempfile.TemporaryDirectory()
+        self.queue_path = os.path.join(self.queue_dir.name, "jobs.sqlite3")
+        self.fake_wiki = FakeWiki(
+            bot_name="bot", bot_password="password", latency=0.02
+        ).start()
+
+    def tearDown(self):
+        self.fake_wiki.stop()
+        self.queue_dir.cleanup()
+
+    def submit_jobs_and_exit(self, shutdown_timeout: float) -> list:
+        subprocess.run(
+            [sys.executable, "-c", self.SUBMIT_JOBS_SCRIPT],
+            cwd=os.path.join(os.path.dirname(__file__), "..", ".."),
+            env={
+                **os.environ,
+                "WIKI_API_ENDPOINT": self.fake_wiki.url,
+                "MEDIAWIKI_BOT_NAME": "bot",
+                "MEDIAWIKI_BOT_PASSWORD": "password",
+                "JOB_QUEUE_PATH": self.queue_path,
+                "JOB_WORKERS": "1",
+                "JOB_SHUTDOWN_TIMEOUT": str(shutdown_timeout)
+            },
+            check=True,
+            capture_output=True,
+            timeout=60
+        )
+        connection = JobQueue(self.queue_path)._connection()
+        return [
+            dict(row) for row in connection.execute(
+                "SELECT status, result FROM jobs ORDER BY created_at, rowid"
+            )
+        ]
+
+    def test_shutdown_must_drain_pending_wiki_document_jobs(self):
+        jobs = self.submit_jobs_and_exit(shutdown_timeout=30)
+
+        self.assertEqual(
+            [job["status"] for job in jobs], [JobQueue.SUCCEEDED] * 3
+        )
+        for number in (1, 2, 3):
+            self.assertIsNotNone(
+                self.fake_wiki.get_page_text(f"Project {number}")
+            )
+
+    def test_jobs_not_drained_in_time_must_stay_pending(self):
+        # The first job is still writing its pages when the drain ends
+        self.fake_wiki.latency = 0.2
+        jobs = self.submit_jobs_and_exit(shutdown_timeout=0.5)
+
+        self.assertIn(
+            jobs[0]["status"], (JobQueue.RUNNING, JobQueue.PENDING)
+        )
+        self.assertEqual(
+            [job["status"] for job in jobs[1:]], [JobQueue.PENDING] * 2
+        )
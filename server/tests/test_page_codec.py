@@ -0,0 +1,155 @@
+from unittest import TestCase
+
+from server.services.page_codec import (
+    ORGANISATION_PAGE_CODEC,
+    OVERVIEW_PAGE_CODEC,
+    PROJECT_PAGE_CODEC,
+    ExternalLink,
+    PageCodec,
+    PageCodecError,
+    TextField,
+    WikiLink
+)
+from server.services.organisation_page_service import (
+    OrganisationPageService
+)
+from server.services.overview_page_service import OverviewPageService
+from server.services.page_template import PROJECT_PAGE_TEMPLATE
+from server.services.project_page_service import ProjectPageService
+
+
+class TestPageCodec(TestCase):
+    def setUp(self):
+        self.new_page = {"exists": False, "text": None}
+        self.document = {
+            "project": {
+                "name": "Project 1",
+                "author": "mapper",
+                "status": "Active",
+                "shortDescription": "Map buildings",
+                "changesetComment": "#hotosm #project-1",
+                "url": "https://tasks.hotosm.org/projects/1",
+                "created": "2020-05-21T00:00:00.000000Z",
+                "externalSource": {
+                    "imagery": "Bing",
+                    "license": "CC-BY",
+                    "instructions": "Map all buildings\nand roads",
+                    "perTaskInstructions": "Map the buildings"
+                },
+                "users": [
+                    {"userId": 1, "userName": "mapper"},
+                    {"userId": 2, "userName": "validator"}
+                ]
+            },
+            "organisation": {
+                "name": "Organisation",
+                "description": "Humanitarian mapping",
+                "url": "https://example.org"
+            },
+            "platform": {
+                "name": "HOT Tasking Manager",
+                "url": "https://tasks.hotosm.org"
+            }
+        }
+
+    def test_links_must_round_trip_as_tokens(self):
+        self.assertEqual(
+            WikiLink.parse(WikiLink("Page", "Text | more").string),
+            WikiLink("Page", "Text | more")
+        )
+        self.assertEqual(WikiLink.parse(" [[Page]] "), WikiLink("Page", None))
+        self.assertEqual(
+            ExternalLink.parse("[https://example.org Example site]"),
+            ExternalLink("https://example.org", "Example site")
+        )
+        with self.assertRaises(PageCodecError):
+            ExternalLink.parse("https://example.org")
+
+    def test_project_page_must_round_trip(self):
+        page_text = ProjectPageService().generate_page_text(self.document)
+
+        self.assertIn("21 May 2020", page_text)
+        self.assertEqual(
+            PROJECT_PAGE_CODEC.decode(page_text),
+            {"project": {
+                key: value for key, value in self.document["project"].items()
+                if key not in ("name", "author", "status")
+            }}
+        )
+
+    def test_organisation_and_overview_pages_must_round_trip(self):
+        organisation_document = ORGANISATION_PAGE_CODEC.decode(
+            OrganisationPageService().generate_page_text(
+                self.document, self.new_page
+            )
+        )
+        self.assertEqual(
+            organisation_document.pop("projects"),
+            [{
+                "project": {
+                    key: self.document["project"][key]
+                    for key in ("name", "author", "status")
+                },
+                "platform": self.document["platform"]
+            }]
+        )
+        self.assertEqual(organisation_document, {
+            "organisation": self.document["organisation"],
+            "platform": self.document["platform"]
+        })
+
+        overview_document = OVERVIEW_PAGE_CODEC.decode(
+            OverviewPageService().generate_page_text(
+                self.document, self.new_page
+            )
+        )
+        self.assertEqual(overview_document, {"activities": [{
+            "organisation": {"name": "Organisation"},
+            "platform": self.document["platform"]
+        }]})
+
+    def test_codec_must_reject_sections_missing_from_page(self):
+        with self.assertRaises(PageCodecError):
+            PageCodec(PROJECT_PAGE_TEMPLATE, {
+                "Missing": TextField(("project", "name"))
+            })
+        with self.assertRaises(PageCodecError):
+            PROJECT_PAGE_CODEC.decode("==Project==\n===Url===\nurl\n")
+
+    def test_update_must_rewrite_only_sections_displaying_fields(self):
+        update_fields = {"project": {"url": "https://example.org/1"}}
+        self.assertEqual(
+            [
+                field.section_path for field in
+                PROJECT_PAGE_CODEC.get_updated_fields(update_fields)
+            ],
+            ["Url"]
+        )
+        self.assertEqual(
+            OVERVIEW_PAGE_CODEC.get_updated_fields(update_fields), []
+        )
+
+        page_text = ProjectPageService().generate_page_text(self.document)
+        updated_page_text = PROJECT_PAGE_CODEC.update(
+            page_text, "Project 1", update_fields
+        )
+        self.assertEqual(
+            updated_page_text,
+            page_text.replace(
+                "https://tasks.hotosm.org/projects/1", "https://example.org/1"
+            )
+        )
+
+    def test_table_rows_edited_by_hand_must_decode_as_encoded_rows(self):
+        page_text = OverviewPageService().generate_page_text(
+            self.document, self.new_page
+        )
+        edited_page_text = page_text.replace(
+            "\n| [[", '\n| style="" | [['
+        ).replace("]]\n| [", "]] || [")
+
+        self.assertNotEqual(edited_page_text, page_text)
+        self.assertEqual(
+            OVERVIEW_PAGE_CODEC.decode(edited_page_text),
+            OVERVIEW_PAGE_CODEC.decode(page_text)
+        )
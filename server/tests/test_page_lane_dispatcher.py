@@ -0,0 +1,40 @@
+import threading
+import time
+from unittest import TestCase
+from server.services.page_lane_dispatcher import PageLaneDispatcher
+
+
+class TestPageLaneDispatcher(TestCase):
+    def setUp(self):
+        self.dispatcher = PageLaneDispatcher(lanes=4)
+
+    def test_titles_of_same_page_must_share_a_lane(self):
+        self.assertIs(
+            self.dispatcher.get_lane("Organised_Editing/Activities/Org"),
+            self.dispatcher.get_lane("organised Editing/Activities/Org")
+        )
+
+    def test_operations_of_a_page_must_run_in_order(self):
+        lane_number = self.dispatcher.get_lane("Project 1").number
+        is_released = threading.Event()
+        operations = []
+
+        self.dispatcher.submit("Project 1", is_released.wait)
+        futures = [
+            self.dispatcher.submit("Project_1", operations.append, number)
+            for number in range(5)
+        ]
+        self.assertEqual(
+            self.dispatcher.get_stats()[lane_number]["depth"], 6
+        )
+
+        time.sleep(0.05)
+        is_released.set()
+        for future in futures:
+            future.result()
+
+        self.assertEqual(operations, [0, 1, 2, 3, 4])
+        lane_stats = self.dispatcher.get_stats()[lane_number]
+        self.assertEqual(lane_stats["depth"], 0)
+        self.assertEqual(lane_stats["completed"], 6)
+        self.assertGreaterEqual(lane_stats["max_latency"], 0.05)
@@ -0,0 +1,84 @@
+from unittest import TestCase, mock
+
+from server.services.page_template import (
+    ORGANISATION_PAGE_TEMPLATE,
+    PROJECT_PAGE_TEMPLATE,
+    PageTemplate,
+    get_page_template
+)
+from server.services.project_page_service import ProjectPageService
+from server.services.templates import ProjectPage
+
+
+class TestPageTemplate(TestCase):
+    def setUp(self):
+        self.document = {
+            "project": {
+                "projectId": 1,
+                "status": "Active",
+                "name": "Project",
+                "shortDescription": "Map buildings",
+                "changesetComment": "#project",
+                "author": "mapper",
+                "url": "https://tasks.hotosm.org/projects/1",
+                "created": "2020-05-21T10:11:12.000123Z",
+                "externalSource": {
+                    "imagery": "Bing",
+                    "license": "CC-BY",
+                    "instructions": "Map all buildings",
+                    "perTaskInstructions": "Map the buildings"
+                },
+                "users": [{"userId": 1, "userName": "mapper"}]
+            },
+            "organisation": {
+                "name": "Organisation",
+                "description": "Mapping",
+                "url": "https://example.org"
+            },
+            "platform": {
+                "name": "Tasking Manager",
+                "url": "https://tasks.hotosm.org"
+            }
+        }
+
+    def test_get_page_template_must_reuse_compiled_template(self):
+        # An equal copy of the template text
+        template_text = "".join(ProjectPage.PAGE_TEMPLATE.value)
+
+        self.assertIs(get_page_template(template_text), PROJECT_PAGE_TEMPLATE)
+        self.assertIsNot(
+            get_page_template("==Section==\ntext"), PROJECT_PAGE_TEMPLATE
+        )
+
+    def test_get_table_anchor_must_locate_table_header(self):
+        text = ORGANISATION_PAGE_TEMPLATE.text
+        table_anchor = ORGANISATION_PAGE_TEMPLATE.get_table_anchor(
+            ORGANISATION_PAGE_TEMPLATE.get_section("Project list")
+        )
+
+        self.assertTrue(text[table_anchor.start:].startswith("{|"))
+        self.assertTrue(
+            text[:table_anchor.header_end].endswith("Status\n|-")
+        )
+        self.assertEqual(text[table_anchor.end - 2:table_anchor.end], "|}")
+        self.assertIsNone(ORGANISATION_PAGE_TEMPLATE.get_table_anchor(
+            ORGANISATION_PAGE_TEMPLATE.get_section("Link")
+        ))
+
+    def test_new_project_page_must_render_without_parsing_wikitext(self):
+        with mock.patch("wikitextparser.parse") as parse:
+            page_text = ProjectPageService().generate_page_text(
+                self.document
+            )
+        parse.assert_not_called()
+
+        # The compiled template renders like the template scanned again
+        with mock.patch(
+            "server.services.wiki_service.get_page_template",
+            lambda text: PageTemplate(text)
+        ):
+            self.assertEqual(
+                ProjectPageService().generate_page_text(self.document),
+                page_text
+            )
+        self.assertIn("| 1\n| mapper\n|-\n|}", page_text)
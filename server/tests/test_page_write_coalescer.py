@@ -0,0 +1,99 @@
+import threading
+import time
+from unittest import mock
+
+from server.services.page_write_coalescer import PageWriteCoalescer
+from server.services.wiki_request_scheduler import WikiRequestScheduler
+from server.services.wiki_service import WikiServiceError, WikiSessionPool
+from server.tests.base_test_config import BaseTestCase
+from server.tests.fake_wiki import FakeWiki
+
+
+class TestPageWriteCoalescer(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.fake_wiki = FakeWiki(
+            bot_name="bot", bot_password="password"
+        ).start()
+        pool = WikiSessionPool(
+            endpoint=self.fake_wiki.url,
+            bot_name="bot",
+            bot_password="password",
+            size=2
+        )
+        pool.scheduler = WikiRequestScheduler(maxlag=5, max_retries=2)
+        session_pool = mock.patch(
+            "server.services.wiki_service.session_pool", pool
+        )
+        session_pool.start()
+        self.addCleanup(session_pool.stop)
+
+        self.fake_wiki.set_page("Overview", "==Activities==\nrows")
+        self.coalescer = PageWriteCoalescer("Overview", window=5)
+
+    def tearDown(self):
+        self.fake_wiki.stop()
+
+    def submit_rows(self, rows: list) -> list:
+        futures = []
+        futures_lock = threading.Lock()
+
+        def submit(row):
+            future = self.coalescer.submit(
+                lambda page: f"{page['text']}\n{row}"
+            )
+            with futures_lock:
+                futures.append(future)
+        threads = [
+            threading.Thread(target=submit, args=(row,)) for row in rows
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return futures
+
+    def test_lone_write_must_be_published_without_waiting(self):
+        started_at = time.monotonic()
+        self.submit_rows(["row 1"])[0].result(timeout=5)
+
+        self.assertLess(time.monotonic() - started_at, self.coalescer.window)
+        self.assertEqual(self.fake_wiki.count_calls("edit"), 1)
+
+    def test_writes_during_an_edit_must_be_published_as_one_edit(self):
+        self.fake_wiki.action_latency["edit"] = 0.3
+        first_future = self.submit_rows(["row 0"])[0]
+        time.sleep(0.1)
+        rows = [f"row {number}" for number in range(1, 5)]
+
+        futures = self.submit_rows(rows)
+        first_future.result(timeout=5)
+        results = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(self.fake_wiki.count_calls("edit"), 2)
+        self.assertTrue(all(result == results[0] for result in results))
+        page_text = self.fake_wiki.get_page_text("Overview")
+        for row in ["row 0"] + rows:
+            self.assertIn(f"\n{row}", page_text)
+        stats = self.coalescer.get_stats()
+        self.assertEqual(stats["largest_batch"], 4)
+        self.assertEqual(stats["publishing"], 0)
+
+    def test_failed_edit_must_fail_every_waiting_write(self):
+        self.fake_wiki.action_latency["edit"] = 0.3
+        self.fake_wiki.inject_error("edit", "protectedpage", count=2)
+        futures = self.submit_rows(["row 0"])
+        time.sleep(0.1)
+
+        futures += self.submit_rows(["row 1", "row 2", "row 3"])
+        failing_change = self.coalescer.submit(lambda page: 1 / 0)
+
+        for future in futures:
+            with self.assertRaises(WikiServiceError):
+                future.result(timeout=5)
+        with self.assertRaises(ZeroDivisionError):
+            failing_change.result(timeout=5)
+        self.assertEqual(self.fake_wiki.count_calls("edit"), 2)
+        self.assertEqual(
+            self.fake_wiki.get_page_text("Overview"), "==Activities==\nrows"
+        )
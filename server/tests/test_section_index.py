@@ -0,0 +1,62 @@
+from unittest import TestCase
+import wikitextparser as wtp
+
+from server.services.section_index import SectionIndex
+from server.services.wiki_page_service import WikiPageService
+from server.services.templates import OrgActivityPage, ProjectPage
+
+
+class TestSectionIndex(TestCase):
+    def assert_same_sections_as_wikitextparser(self, text):
+        sections = [
+            (section.title, section.level, section.span, section.string)
+            for section in wtp.parse(text).sections[1:]
+        ]
+        indexed_sections = [
+            (section.title, section.level, section.span, section.string)
+            for section in SectionIndex(text).sections
+        ]
+        self.assertEqual(indexed_sections, sections)
+
+    def test_sections_must_match_wikitextparser(self):
+        self.assert_same_sections_as_wikitextparser(
+            OrgActivityPage.PAGE_TEMPLATE.value
+        )
+        self.assert_same_sections_as_wikitextparser(
+            ProjectPage.PAGE_TEMPLATE.value
+        )
+        self.assert_same_sections_as_wikitextparser(
+            "lead\n=A=\n==B== \nb\n===Unbalanced==\nc\n== D ==\nd"
+        )
+
+    def test_title_span_must_include_section_markers(self):
+        text = "=Activity=\n==Organisation==\n===Link===\nlink\n"
+        section = SectionIndex(text).get_section("Organisation")
+
+        start_index, end_index = section.title_span
+        self.assertEqual(text[start_index:end_index], "==Organisation==")
+        self.assertEqual(section.contents, "\n===Link===\nlink\n")
+
+    def test_get_section_must_return_first_section_with_title(self):
+        section_index = SectionIndex("==A==\n===Link===\na\n==B==\n===Link===")
+
+        self.assertEqual(section_index.get_section("Link").span, (6, 19))
+        self.assertIsNone(section_index.get_section("Missing"))
+
+    def test_sections_to_dict_must_read_second_level_sections(self):
+        text = (
+            "=Activity=\n"
+            "==Organisation==\n===Link===\nlink\n===Description===\ndesc\n"
+            "==Platform==\nplatform\n"
+            "==Ignored== \nignored\n"
+            "==Projects==\n===Project list===\n====Notes====\nnotes"
+        )
+
+        self.assertEqual(WikiPageService.sections_to_dict(text), {
+            "Organisation": {"Link": "\nlink\n", "Description": "\ndesc\n"},
+            "Platform": "platform\n",
+            "Projects": {
+                "Project list": "\n====Notes====\nnotes",
+                "Notes": "=\nnotes"
+            }
+        })
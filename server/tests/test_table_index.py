@@ -0,0 +1,120 @@
+from unittest import TestCase
+
+from server.services.table_index import (
+    TableIndex,
+    get_header_end,
+    get_row_cells,
+    get_table_span,
+    iter_table_rows
+)
+
+
+class TestTableIndex(TestCase):
+    def setUp(self):
+        self.table = (
+            "{|class='wikitable sortable'\n"
+            "|-\n"
+            '! scope="col" | Name\n'
+            '! scope="col" | Status\n'
+            "|-\n"
+            "| [[Project B | Project B]]\n"
+            "| Active\n"
+            "|-\n"
+            "| [[Project D | Project D]]\n"
+            "| Archived\n"
+            "|-\n"
+            "|}"
+        )
+
+    def test_string_must_keep_table_unchanged(self):
+        table_index = TableIndex(self.table)
+
+        self.assertEqual(table_index.string, self.table)
+        self.assertEqual(
+            table_index.keys(),
+            ["[[Project B | Project B]]", "[[Project D | Project D]]"]
+        )
+
+    def test_get_row_cells_must_ignore_separators_inside_links(self):
+        self.assertEqual(
+            get_row_cells('\n| style="" | [[A | B]] || {{T|x}}\n|-'),
+            ["[[A | B]]", "{{T|x}}"]
+        )
+
+    def test_replace_and_delete_row_must_edit_only_that_row(self):
+        table_index = TableIndex(self.table)
+
+        self.assertTrue(table_index.replace_row(
+            " [[Project D | Project D]] ",
+            "\n| [[Project E | Project E]]\n| Active\n|-"
+        ))
+        self.assertTrue(table_index.delete_row("[[Project B | Project B]]"))
+        self.assertFalse(table_index.delete_row("[[Project B | Project B]]"))
+        self.assertEqual(
+            table_index.get_row("[[Project E | Project E]]"),
+            "\n| [[Project E | Project E]]\n| Active\n|-"
+        )
+        self.assertEqual(
+            table_index.string,
+            self.table.replace(
+                "| [[Project B | Project B]]\n| Active\n|-\n", ""
+            ).replace("Project D", "Project E").replace("Archived", "Active")
+        )
+
+    def test_insert_row_sorted_must_keep_rows_sorted(self):
+        table_index = TableIndex(self.table)
+
+        table_index.insert_row_sorted("\n| [[Project C | Project C]]\n|-")
+        table_index.insert_row_sorted("\n| [[Project A | Project A]]\n|-")
+        self.assertEqual(
+            [key[2:11] for key in table_index.keys()],
+            ["Project A", "Project B", "Project C", "Project D"]
+        )
+        self.assertIn("[[Project C | Project C]]", table_index)
+        self.assertTrue(table_index.string.endswith(
+            "| [[Project C | Project C]]\n|-\n"
+            "| [[Project D | Project D]]\n| Archived\n|-\n|}"
+        ))
+
+    def test_index_must_follow_inserted_rows_sharing_a_key(self):
+        table_index = TableIndex(self.table)
+        first_row = "\n| [[Project D | Project D]]\n| First\n|-"
+
+        table_index.insert_row(first_row)
+        table_index.insert_row_sorted("\n| [[Project C | Project C]]\n|-")
+        self.assertEqual(table_index.get_row("[[Project D | Project D]]"),
+                         first_row)
+        self.assertTrue(table_index.delete_row("[[Project D | Project D]]"))
+        self.assertTrue(table_index.replace_row(
+            "[[Project D | Project D]]",
+            "\n| [[Project A | Project A]]\n| Active\n|-"
+        ))
+        table_index.insert_row_sorted("\n| [[Project B | Project B]]\n|-")
+        self.assertEqual(
+            [key[2:11] for key in table_index.keys()],
+            ["Project B", "Project B", "Project C", "Project A"]
+        )
+        self.assertEqual(len(table_index), 4)
+
+    def test_get_header_end_must_find_row_separator_after_header(self):
+        table = "{|\n|-\n! Name (*)\n! [[Status | status]]\n|-\n| a\n|-\n|}"
+
+        header_end = get_header_end(table)
+        self.assertEqual(table[:header_end], table[:table.index("\n| a")])
+        self.assertEqual(get_header_end("{|\n|-\n| a\n|-\n|}"), 5)
+
+    def test_get_table_span_must_include_nested_tables(self):
+        text = "==A==\n{|\n|-\n|\n{|\n| b\n|}\n|}\ntext"
+
+        start, end = get_table_span(text)
+        self.assertEqual(text[start:end], text[6:-5])
+        self.assertIsNone(get_table_span("==A==\ntext"))
+
+    def test_iter_table_rows_must_read_cells_of_each_row(self):
+        text = "===Project list===\n" + self.table.replace("|-\n|}", "|}")
+
+        self.assertEqual(list(iter_table_rows(text)), [
+            ["[[Project B | Project B]]", "Active"],
+            ["[[Project D | Project D]]", "Archived"]
+        ])
+        self.assertEqual(list(iter_table_rows("no table")), [])
@@ -0,0 +1,367 @@
+import copy
+import json
+from unittest import mock
+
+from server.services.organisation_page_service import (
+    OrganisationPageService
+)
+from server.services.overview_page_service import OverviewPageService
+from server.services.project_page_service import ProjectPageService
+from server.services.wiki_document_service import WikiDocumentService
+from server.services.wiki_request_scheduler import WikiRequestScheduler
+from server.services.wiki_service import (
+    WikiEditConflictError,
+    WikiSessionPool
+)
+from server.services.wiki_unit_of_work import WikiUnitOfWork
+from server.tests.base_test_config import BaseTestCase
+from server.tests.benchmarks.sample_pages import get_document
+from server.tests.fake_wiki import FakeWiki
+
+
+class TestWikiDocumentService(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.fake_wiki = FakeWiki(
+            bot_name="bot", bot_password="password"
+        ).start()
+        pool = WikiSessionPool(
+            endpoint=self.fake_wiki.url,
+            bot_name="bot",
+            bot_password="password",
+            size=2
+        )
+        pool.scheduler = WikiRequestScheduler(maxlag=5, max_retries=2)
+        session_pool = mock.patch(
+            "server.services.wiki_service.session_pool", pool
+        )
+        session_pool.start()
+        self.addCleanup(session_pool.stop)
+
+        # An organisation page listing two projects
+        self.document = get_document(21)
+        self.document["organisation"]["name"] = "Patched Organisation"
+        other_document = copy.deepcopy(self.document)
+        other_document["project"]["name"] = "Other Project"
+
+        new_page = {"exists": False, "text": None}
+        organisation_page = OrganisationPageService()
+        organisation_page_text = organisation_page.generate_page_text(
+            other_document,
+            {
+                "exists": True,
+                "text": organisation_page.generate_page_text(
+                    self.document, new_page
+                )
+            }
+        )
+        self.organisation_page_title = (
+            "Organised_Editing/Activities/Patched Organisation"
+        )
+        self.fake_wiki.set_page(
+            self.organisation_page_title, organisation_page_text
+        )
+        self.fake_wiki.set_page(
+            "Project 21",
+            ProjectPageService().generate_page_text(self.document)
+        )
+
+    def tearDown(self):
+        self.fake_wiki.stop()
+
+    def test_patch_must_edit_only_sections_displaying_updated_fields(self):
+        project_page_text = self.fake_wiki.get_page_text("Project 21")
+
+        response = self.client.patch(
+            "/wiki-document/Patched_Organisation/Project_21/",
+            json={"project": {"status": "Archived"}}
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json["pages"], {"organisation": {
+            "title": self.organisation_page_title,
+            "sections": ["Projects/Project list"],
+            "result": "ok"
+        }})
+        # Only the table section of the organisation page was edited
+        edits = [
+            call for call in self.fake_wiki.calls if call["action"] == "edit"
+        ]
+        self.assertEqual(len(edits), 1)
+        self.assertIn("section", edits[0])
+        self.assertEqual(
+            self.fake_wiki.get_page_text("Project 21"), project_page_text
+        )
+
+        organisation_page_text = self.fake_wiki.get_page_text(
+            self.organisation_page_title
+        )
+        self.assertIn(
+            "| [[Project 21 | Project 21]]\n"
+            "| [https://tasks.hotosm.org HOT Tasking Manager]\n"
+            "| mapper\n| Archived\n|-",
+            organisation_page_text
+        )
+        self.assertIn(
+            "| [[Other Project | Other Project]]\n"
+            "| [https://tasks.hotosm.org HOT Tasking Manager]\n"
+            "| mapper\n| Active\n|-",
+            organisation_page_text
+        )
+
+    def test_create_document_must_read_all_pages_in_one_query(self):
+        document = get_document(22)
+        document["organisation"]["name"] = "Batched Organisation"
+        # The overview page exists, listing another organisation
+        self.fake_wiki.set_page(
+            "Organised_Editing/Activities",
+            OverviewPageService().generate_page_text(
+                self.document, {"exists": False, "text": None}
+            )
+        )
+
+        page_results = WikiDocumentService().create_document(document)
+
+        self.assertEqual(page_results, {
+            "overview": "ok", "organisation": "ok", "project": "ok"
+        })
+        page_queries = [
+            call for call in self.fake_wiki.calls
+            if call["action"] == "query" and "titles" in call
+        ]
+        self.assertEqual(len(page_queries), 1)
+        self.assertEqual(self.fake_wiki.count_calls("edit"), 3)
+
+    def test_create_document_must_report_the_result_of_each_page(self):
+        document = get_document(22)
+        document["organisation"]["name"] = "Protected Organisation"
+        self.fake_wiki.protect_page(
+            "Organised_Editing/Activities/Protected Organisation"
+        )
+
+        page_results = WikiDocumentService().create_document(document)
+
+        self.assertEqual(page_results["overview"], "ok")
+        self.assertEqual(page_results["project"], "ok")
+        self.assertTrue(page_results["organisation"].startswith("failed: "))
+        self.assertIn("protectedpage", page_results["organisation"])
+        self.assertIsNone(self.fake_wiki.get_page_text(
+            "Organised_Editing/Activities/Protected Organisation"
+        ))
+        self.assertIsNotNone(self.fake_wiki.get_page_text("Project 22"))
+
+    def test_write_back_must_fail_when_page_changed_after_read_ahead(self):
+        unit_of_work = WikiUnitOfWork(max_conflict_retries=0)
+        unit_of_work.read_ahead(["Project 21"])
+        self.fake_wiki.set_page("Project 21", "Edited by someone else")
+        unit_of_work.stage(
+            "Project 21", lambda page: page["text"] + "\n==New==\nnew"
+        )
+
+        with self.assertRaises(WikiEditConflictError) as context:
+            unit_of_work.write_back("Project 21")
+        self.assertIn("editconflict", str(context.exception))
+        self.assertEqual(
+            self.fake_wiki.get_page_text("Project 21"),
+            "Edited by someone else"
+        )
+
+    def test_concurrent_rows_must_be_rebased_after_edit_conflict(self):
+        organisation_page = OrganisationPageService()
+        unit_of_works = []
+        for project_name in ("Project A", "Project B"):
+            document = copy.deepcopy(self.document)
+            document["project"]["name"] = project_name
+            unit_of_work = WikiUnitOfWork()
+            unit_of_work.read_ahead([self.organisation_page_title])
+            organisation_page.stage_page(document, unit_of_work)
+            unit_of_works.append(unit_of_work)
+
+        for unit_of_work in unit_of_works:
+            unit_of_work.write_back(self.organisation_page_title)
+
+        self.assertEqual(self.fake_wiki.count_calls("edit"), 3)
+        organisation_page_text = self.fake_wiki.get_page_text(
+            self.organisation_page_title
+        )
+        for project_name in (
+                "Project 21", "Other Project", "Project A", "Project B"):
+            self.assertIn(
+                f"[[{project_name} | {project_name}]]",
+                organisation_page_text
+            )
+
+    def test_edit_merged_by_wiki_must_be_kept_by_later_writes(self):
+        organisation_page = OrganisationPageService()
+        document = copy.deepcopy(self.document)
+        document["project"]["name"] = "Project A"
+
+        unit_of_work = WikiUnitOfWork(max_conflict_retries=0)
+        unit_of_work.read_ahead([self.organisation_page_title])
+        # Someone else edits another section of the page meanwhile
+        self.fake_wiki.set_page(
+            self.organisation_page_title,
+            self.fake_wiki.get_page_text(self.organisation_page_title)
+            .replace("Humanitarian mapping", "Edited by someone else")
+        )
+        organisation_page.stage_page(document, unit_of_work)
+        unit_of_work.write_back(self.organisation_page_title)
+
+        unit_of_work = WikiUnitOfWork(max_conflict_retries=0)
+        unit_of_work.read_ahead([self.organisation_page_title])
+        self.assertIn(
+            "Edited by someone else",
+            unit_of_work.get_page(self.organisation_page_title)["text"]
+        )
+        organisation_page.stage_page_update(
+            WikiDocumentService().get_document_key(
+                "Patched Organisation", "Project A"
+            ),
+            {"project": {"status": "Archived"}},
+            unit_of_work
+        )
+        unit_of_work.write_back(self.organisation_page_title)
+
+        self.assertEqual(self.fake_wiki.count_calls("edit"), 2)
+        organisation_page_text = self.fake_wiki.get_page_text(
+            self.organisation_page_title
+        )
+        self.assertIn("Edited by someone else", organisation_page_text)
+        self.assertIn(
+            "| [[Project A | Project A]]\n"
+            "| [https://tasks.hotosm.org HOT Tasking Manager]\n"
+            "| mapper\n| Archived\n|-",
+            organisation_page_text
+        )
+
+    def test_bulk_must_edit_each_organisation_page_once_per_batch(self):
+        self.fake_wiki.set_page(
+            "Organised_Editing/Activities",
+            OverviewPageService().generate_page_text(
+                self.document, {"exists": False, "text": None}
+            )
+        )
+        documents = []
+        for number, organisation_name in [
+                (23, "Bulk Organisation"),
+                (24, "Bulk Organisation"),
+                (25, "Other Bulk Organisation")]:
+            document = get_document(number)
+            document["organisation"]["name"] = organisation_name
+            documents.append(json.dumps(document))
+        documents.insert(1, "{not json")
+
+        response = self.client.post(
+            "/wiki-document/bulk/",
+            data="\n".join(documents),
+            content_type="application/x-ndjson"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        document_results = [
+            json.loads(line) for line in response.data.splitlines()
+        ]
+        self.assertEqual(
+            [
+                (document_result["line"], document_result["result"])
+                for document_result in document_results
+            ],
+            [
+                (2, "failed: Expecting property name enclosed in double "
+                    "quotes: line 1 column 2 (char 1)"),
+                (1, "ok"), (3, "ok"), (4, "ok")
+            ]
+        )
+
+        edited_titles = [
+            call["title"] for call in self.fake_wiki.calls
+            if call["action"] == "edit"
+        ]
+        self.assertEqual(sorted(edited_titles), sorted([
+            "Organised_Editing/Activities",
+            "Organised_Editing/Activities/Bulk Organisation",
+            "Organised_Editing/Activities/Other Bulk Organisation",
+            "Project 23",
+            "Project 24",
+            "Project 25"
+        ]))
+        organisation_page_text = self.fake_wiki.get_page_text(
+            "Organised_Editing/Activities/Bulk Organisation"
+        )
+        self.assertIn("[[Project 23 | Project 23]]", organisation_page_text)
+        self.assertIn("[[Project 24 | Project 24]]", organisation_page_text)
+        overview_page_text = self.fake_wiki.get_page_text(
+            "Organised_Editing/Activities"
+        )
+        for organisation_name in (
+                "Bulk Organisation", "Other Bulk Organisation"):
+            self.assertIn(
+                f"[[Organised_Editing/Activities/{organisation_name} | "
+                f"{organisation_name}]]",
+                overview_page_text
+            )
+
+    def test_bulk_must_fail_only_documents_with_invalid_titles(self):
+        documents = []
+        for number in (30, 31):
+            document = get_document(number)
+            document["organisation"]["name"] = "Bulk Organisation"
+            documents.append(document)
+        documents[1]["project"]["name"] = "Project [31]"
+
+        response = self.client.post(
+            "/wiki-document/bulk/",
+            data="\n".join(json.dumps(document) for document in documents),
+            content_type="application/x-ndjson"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        document_results = [
+            json.loads(line) for line in response.data.splitlines()
+        ]
+        self.assertEqual(
+            [
+                (document_result["line"], document_result["result"])
+                for document_result in document_results
+            ],
+            [
+                (2, "failed: Invalid page title Project [31]: illegal "
+                    "character ["),
+                (1, "ok")
+            ]
+        )
+        self.assertIsNotNone(self.fake_wiki.get_page_text("Project 30"))
+        self.assertNotIn(
+            "Project [31]",
+            self.fake_wiki.get_page_text(
+                "Organised_Editing/Activities/Bulk Organisation"
+            )
+        )
+
+    def test_bulk_must_report_every_document_of_a_failed_batch(self):
+        documents = []
+        for number in (23, 24):
+            document = get_document(number)
+            document["organisation"]["name"] = "Bulk Organisation"
+            documents.append(json.dumps(document))
+        self.fake_wiki.inject_http_error("query", 500, count=3)
+
+        response = self.client.post(
+            "/wiki-document/bulk/",
+            data="\n".join(documents),
+            content_type="application/x-ndjson"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        document_results = [
+            json.loads(line) for line in response.data.splitlines()
+        ]
+        self.assertEqual(
+            [document_result["line"] for document_result in document_results],
+            [1, 2]
+        )
+        for document_result in document_results:
+            self.assertTrue(
+                document_result["result"].startswith("failed: ")
+            )
+        self.assertEqual(self.fake_wiki.count_calls("edit"), 0)
@@ -0,0 +1,95 @@
+from unittest import TestCase
+from server.services.wiki_request_scheduler import WikiRequestScheduler
+
+
+class TestWikiRequestScheduler(TestCase):
+    def setUp(self):
+        self.scheduler = WikiRequestScheduler(
+            maxlag=5,
+            max_retries=3,
+            max_edit_concurrency=8,
+            edit_latency_target=3
+        )
+
+    def send_edit(self, latency, is_throttled, edit_number=None):
+        if edit_number is None:
+            edit_number = self.scheduler.acquire_edit_slot()
+            self.scheduler.release_edit_slot()
+        # Callers of adjust_edit_concurrency hold the scheduler lock
+        with self.scheduler._lock:
+            self.scheduler.adjust_edit_concurrency(
+                latency, is_throttled, edit_number
+            )
+
+    def get_edit_concurrency_limit(self):
+        return self.scheduler.get_stats()["edit_concurrency_limit"]
+
+    def test_get_params_must_send_maxlag(self):
+        self.assertEqual(self.scheduler.get_params(), {"maxlag": 5})
+
+    def test_get_retry_delay_must_ignore_successful_responses(self):
+        self.assertIsNone(
+            self.scheduler.get_retry_delay(200, {}, {"query": {}}, 0)
+        )
+        self.assertIsNone(
+            self.scheduler.get_retry_delay(
+                200, {}, {"error": {"code": "articleexists"}}, 0
+            )
+        )
+
+    def test_get_retry_delay_must_honour_retry_after(self):
+        self.assertEqual(
+            self.scheduler.get_retry_delay(
+                200, {"Retry-After": "7"}, {"error": {"code": "maxlag"}}, 0
+            ),
+            7
+        )
+        self.assertEqual(
+            self.scheduler.get_retry_delay(503, {"Retry-After": "2"}, None, 0),
+            2
+        )
+
+    def test_get_retry_delay_must_back_off_exponentially(self):
+        ratelimited = {"error": {"code": "ratelimited"}}
+        first_delay = self.scheduler.get_retry_delay(200, {}, ratelimited, 0)
+        third_delay = self.scheduler.get_retry_delay(200, {}, ratelimited, 2)
+        self.assertTrue(1 <= first_delay <= 2)
+        self.assertTrue(4 <= third_delay <= 8)
+
+    def test_get_retry_delay_must_retry_edits_only_when_not_saved(self):
+        self.assertIsNone(
+            self.scheduler.get_retry_delay(503, {}, None, 0, is_edit=True)
+        )
+        self.assertIsNone(
+            self.scheduler.get_retry_delay(None, {}, None, 0, is_edit=True)
+        )
+        self.assertEqual(
+            self.scheduler.get_retry_delay(
+                429, {"Retry-After": "2"}, None, 0, is_edit=True
+            ),
+            2
+        )
+
+    def test_adjust_edit_concurrency_must_increase_additively(self):
+        self.scheduler.edit_concurrency_limit = 2.0
+        self.send_edit(0.1, is_throttled=False)
+        self.send_edit(0.1, is_throttled=False)
+        self.assertEqual(self.get_edit_concurrency_limit(), 2)
+        self.send_edit(0.1, is_throttled=False)
+        self.assertEqual(self.get_edit_concurrency_limit(), 3)
+
+    def test_adjust_edit_concurrency_must_decrease_multiplicatively(self):
+        self.scheduler.edit_concurrency_limit = 8.0
+        self.send_edit(0.1, is_throttled=True)
+        self.assertEqual(self.get_edit_concurrency_limit(), 4)
+        self.send_edit(5, is_throttled=False)
+        self.assertEqual(self.get_edit_concurrency_limit(), 2)
+
+    def test_adjust_edit_concurrency_must_decrease_once_per_window(self):
+        self.scheduler.edit_concurrency_limit = 8.0
+        edit_numbers = [self.scheduler.acquire_edit_slot() for _ in range(3)]
+        for edit_number in edit_numbers:
+            self.scheduler.release_edit_slot()
+            self.send_edit(5, is_throttled=False, edit_number=edit_number)
+        self.assertEqual(self.get_edit_concurrency_limit(), 4)
+        self.assertEqual(self.scheduler.concurrency_decreases, 1)
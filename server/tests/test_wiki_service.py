@@ -0,0 +1,335 @@
+from unittest import TestCase
+from server.services.wiki_service import (
+    PageTextCache,
+    WikiEditConflictError,
+    WikiService,
+    WikiServiceError,
+    WikiSessionPool
+)
+from server.services.wiki_request_scheduler import WikiRequestScheduler
+from server.tests.base_test_config import BaseTestCase
+from server.tests.fake_wiki import FakeWiki
+
+
+class TestWikiService(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.fake_wiki = FakeWiki(
+            bot_name="bot", bot_password="password"
+        ).start()
+        pool = WikiSessionPool(
+            endpoint=self.fake_wiki.url,
+            bot_name="bot",
+            bot_password="password",
+            size=2
+        )
+        pool.scheduler = WikiRequestScheduler(
+            maxlag=5,
+            max_retries=2,
+            max_edit_concurrency=2,
+            edit_latency_target=3
+        )
+        self.wiki_obj = WikiService(pool)
+
+    def tearDown(self):
+        self.fake_wiki.stop()
+
+    def count_token_queries(self):
+        return len([
+            call for call in self.fake_wiki.calls
+            if call.get("meta") == "tokens" and call.get("type") != "login"
+        ])
+
+    def count_page_queries(self):
+        page_queries = {}
+        for call in self.fake_wiki.calls:
+            if "titles" in call:
+                page_queries[call["prop"]] = (
+                    page_queries.get(call["prop"], 0) + 1
+                )
+        return page_queries
+
+    def test_services_must_share_the_login_of_their_pool(self):
+        for number in range(3):
+            self.fake_wiki.set_page(f"Project {number}", "text")
+            WikiService(self.wiki_obj.pool).get_page_text(f"Project {number}")
+        self.assertEqual(self.fake_wiki.count_calls("query"), 4)
+        self.assertEqual(self.fake_wiki.count_calls("login"), 1)
+        self.assertEqual(self.wiki_obj.pool.get_stats()["logins"], 1)
+
+    def test_login_must_fail_without_bot_credentials(self):
+        pool = WikiSessionPool(
+            endpoint=self.fake_wiki.url,
+            bot_name=None,
+            bot_password=None
+        )
+
+        with self.assertRaises(WikiServiceError):
+            pool.login()
+        self.assertFalse(pool.is_logged_in)
+
+    def test_get_pages_must_fetch_all_pages_in_one_query(self):
+        self.fake_wiki.set_page("Organised Editing/Activities", "text")
+
+        pages = self.wiki_obj.get_pages(
+            ["Organised_Editing/Activities", "Missing page"]
+        )
+        self.assertEqual(pages["Organised_Editing/Activities"]["text"], "text")
+        self.assertTrue(pages["Organised_Editing/Activities"]["exists"])
+        self.assertFalse(pages["Missing page"]["exists"])
+        self.assertEqual(self.fake_wiki.count_calls("query"), 2)
+
+    def test_get_pages_must_query_up_to_50_titles_at_once(self):
+        page_titles = [f"Project {number}" for number in range(51)]
+        for page_title in page_titles[:2]:
+            self.fake_wiki.set_page(page_title, page_title)
+
+        pages = self.wiki_obj.get_pages(page_titles + ["Project_1"])
+        self.assertEqual(len(pages), 52)
+        self.assertEqual(pages["Project_1"], {
+            **pages["Project 1"], "title": "Project_1"
+        })
+        self.assertEqual(pages["Project 0"]["text"], "Project 0")
+        self.assertFalse(pages["Project 50"]["exists"])
+        page_queries = [
+            call["titles"].split("|") for call in self.fake_wiki.calls
+            if "titles" in call
+        ]
+        self.assertEqual([len(titles) for titles in page_queries], [50, 2])
+
+    def test_get_pages_must_reject_invalid_titles(self):
+        for page_title in ("Project|Other project", "Project [1]", " "):
+            with self.assertRaises(WikiServiceError):
+                self.wiki_obj.get_pages(["Project", page_title])
+        self.assertEqual(self.count_page_queries(), {})
+
+        # Titles MediaWiki reports as invalid, e.g. too long ones
+        with self.assertRaises(WikiServiceError):
+            self.wiki_obj.get_pages(["Project", "P" * 256])
+        self.assertEqual(self.count_page_queries(), {"revisions|info": 1})
+
+    def test_is_existing_page_must_probe_page_info_once(self):
+        self.fake_wiki.set_page("Project", "text")
+
+        for _ in range(2):
+            self.assertTrue(self.wiki_obj.is_existing_page("Project"))
+            self.assertFalse(self.wiki_obj.is_existing_page("Missing page"))
+        self.assertEqual(self.count_page_queries(), {"info": 2})
+
+        # Pages read in the request answer existence checks too
+        self.wiki_obj.get_pages(["Other project"])
+        self.assertFalse(self.wiki_obj.is_existing_page("Other project"))
+        self.assertEqual(
+            self.count_page_queries(), {"info": 2, "revisions|info": 1}
+        )
+
+    def test_cached_pages_must_be_revalidated_by_revision(self):
+        # Cached pages must be revalidated on every read
+        self.wiki_obj.pool.page_cache = PageTextCache(ttl=0)
+        self.fake_wiki.set_page("Project", "text")
+
+        def get_page_text():
+            # Page metadata is memoized in the app context of a request
+            with self.app.app_context():
+                return self.wiki_obj.get_page_text("Project")
+
+        self.assertEqual(get_page_text(), "text")
+        self.assertEqual(get_page_text(), "text")
+        self.assertEqual(
+            self.count_page_queries(), {"revisions|info": 1, "info": 1}
+        )
+
+        self.fake_wiki.set_page("Project", "changed text")
+        self.assertEqual(get_page_text(), "changed text")
+        self.assertEqual(
+            self.count_page_queries(), {"revisions|info": 2, "info": 2}
+        )
+
+        # Our own edits are cached under the revision they created
+        page = self.wiki_obj.get_pages(["Project"])["Project"]
+        self.wiki_obj.edit_page(
+            self.wiki_obj.get_token(), "Project", "edited text",
+            base_revid=page["revid"]
+        )
+        self.assertEqual(get_page_text(), "edited text")
+        self.assertEqual(
+            self.count_page_queries(), {"revisions|info": 2, "info": 4}
+        )
+        self.assertEqual(
+            self.wiki_obj.pool.page_cache.get_stats()["revalidations"], 3
+        )
+
+    def test_create_page_must_not_overwrite_existing_page(self):
+        token = self.wiki_obj.get_token()
+        self.wiki_obj.create_page(token, "Project", "first")
+
+        with self.assertRaises(WikiServiceError):
+            self.wiki_obj.create_page(token, "Project", "second")
+        self.assertEqual(self.fake_wiki.get_page_text("Project"), "first")
+
+    def test_edit_page_must_not_create_missing_page(self):
+        token = self.wiki_obj.get_token()
+
+        with self.assertRaises(WikiServiceError):
+            self.wiki_obj.edit_page(token, "Project", "text")
+        self.assertIsNone(self.fake_wiki.get_page_text("Project"))
+
+    def test_get_token_must_reuse_cached_token(self):
+        self.fake_wiki.set_page("Project", "text")
+        self.wiki_obj.get_pages(["Project"])
+        self.assertEqual(self.count_token_queries(), 0)
+
+        token = self.wiki_obj.get_token()
+        self.assertEqual(WikiService(self.wiki_obj.pool).get_token(), token)
+        self.assertEqual(self.count_token_queries(), 1)
+        self.assertEqual(self.fake_wiki.count_calls("checktoken"), 0)
+        token_stats = self.wiki_obj.pool.token_cache.get_stats()
+        self.assertEqual(token_stats["hits"], 1)
+        self.assertEqual(token_stats["misses"], 1)
+
+    def test_submit_edit_must_retry_with_new_token_on_badtoken(self):
+        token = self.wiki_obj.get_token()
+        self.fake_wiki.inject_error("edit", "badtoken")
+
+        self.wiki_obj.create_page(token, "Project", "text")
+        self.assertEqual(self.fake_wiki.get_page_text("Project"), "text")
+        self.assertEqual(self.fake_wiki.count_calls("edit"), 2)
+        self.assertEqual(self.count_token_queries(), 2)
+        self.assertEqual(
+            self.wiki_obj.pool.token_cache.get_stats()["refreshes"], 1
+        )
+
+    def test_request_must_login_again_when_session_is_lost(self):
+        self.wiki_obj.get_token()
+        self.fake_wiki.sessions.clear()
+
+        self.fake_wiki.set_page("Project", "text")
+        self.assertEqual(self.wiki_obj.get_page_text("Project"), "text")
+        self.assertEqual(self.fake_wiki.count_calls("login"), 2)
+
+    def test_request_must_retry_when_wiki_asks_to_back_off(self):
+        self.fake_wiki.set_page("Project", "text")
+        self.wiki_obj.login()
+        self.fake_wiki.inject_error("query", "maxlag", retry_after=0)
+        self.fake_wiki.inject_http_error("query", 503, retry_after=0)
+
+        self.assertTrue(self.wiki_obj.is_existing_page("Project"))
+        self.assertEqual(self.wiki_obj.pool.scheduler.retries, 2)
+
+    def test_edit_page_sections_must_send_only_changed_section(self):
+        page_text = "==A==\na\n==B==\n===B1===\nb"
+        updated_text = "==A==\na\n==B==\n===B1===\nb\nc"
+        self.fake_wiki.set_page("Project", page_text)
+        token = self.wiki_obj.get_token()
+
+        self.wiki_obj.edit_page_sections(
+            token, "Project", page_text, updated_text
+        )
+        edit = self.fake_wiki.calls[-1]
+        self.assertEqual(edit["section"], "3")
+        self.assertEqual(edit["text"], "===B1===\nb\nc")
+        self.assertEqual(self.fake_wiki.get_page_text("Project"), updated_text)
+        self.assertEqual(self.wiki_obj.get_page_text("Project"), updated_text)
+
+    def test_edit_page_sections_must_skip_edit_not_changing_page(self):
+        page_text = "==A==\na\n==B==\nb"
+        self.fake_wiki.set_page("Project", page_text)
+        token = self.wiki_obj.get_token()
+
+        data = self.wiki_obj.edit_page_sections(
+            token, "Project", page_text, page_text + "\n"
+        )
+        self.assertIn("nochange", data["edit"])
+        self.assertEqual(self.fake_wiki.count_calls("edit"), 0)
+        self.assertEqual(
+            self.wiki_obj.pool.noop_edit_filter.get_stats()["skipped_edits"], 1
+        )
+
+    def test_edit_of_old_revision_must_merge_changes_of_other_sections(self):
+        page_text = "==A==\na\n==B==\nb"
+        base_revid = self.fake_wiki.set_page("Project", page_text)
+        self.fake_wiki.set_page("Project", "==A==\na\n==B==\nb by other")
+        token = self.wiki_obj.get_token()
+
+        data = self.wiki_obj.edit_page_sections(
+            token, "Project", page_text, "==A==\na\nc\n==B==\nb",
+            base_revid=base_revid
+        )
+        self.assertNotEqual(data["edit"]["oldrevid"], base_revid)
+        merged_text = "==A==\na\nc\n\n==B==\nb by other"
+        self.assertEqual(self.fake_wiki.get_page_text("Project"), merged_text)
+        self.assertEqual(self.wiki_obj.get_page_text("Project"), merged_text)
+
+    def test_edit_of_old_revision_must_conflict_on_changed_section(self):
+        page_text = "==A==\na\n==B==\nb"
+        base_revid = self.fake_wiki.set_page("Project", page_text)
+        self.fake_wiki.set_page("Project", "==A==\na by other\n==B==\nb")
+        token = self.wiki_obj.get_token()
+
+        with self.assertRaises(WikiEditConflictError):
+            self.wiki_obj.edit_page_sections(
+                token, "Project", page_text, "==A==\na\nc\n==B==\nb",
+                base_revid=base_revid
+            )
+        self.assertEqual(
+            self.fake_wiki.get_page_text("Project"),
+            "==A==\na by other\n==B==\nb"
+        )
+
+
+class TestEditedSection(TestCase):
+    def setUp(self):
+        self.page_text = (
+            "lead\n\n==A==\na\n\n==B==\nb\n\n===B1===\nb1\n\n"
+            "===B2===\nb2\n\n==C==\nc"
+        )
+
+    def assert_edited_section(self, updated_text, number):
+        edited_section = WikiService.get_edited_section(
+            self.page_text, updated_text
+        )
+        self.assertEqual(edited_section["number"], number)
+        # Splicing the section must give the text MediaWiki saves
+        self.assertEqual(
+            WikiService.replace_section_text(self.page_text, edited_section),
+            updated_text
+        )
+        self.assertEqual(
+            FakeWiki().replace_section(
+                self.page_text, number, edited_section["text"]
+            ),
+            updated_text
+        )
+
+    def test_smallest_section_holding_all_changes_must_be_edited(self):
+        self.assert_edited_section(
+            self.page_text.replace("b1", "b1 edited"), 3
+        )
+        self.assert_edited_section(
+            self.page_text.replace("b1", "b1 edited")
+            .replace("b2", "b2 edited"),
+            2
+        )
+        self.assert_edited_section(self.page_text.replace("c", "c\nd"), 5)
+
+    def test_lead_section_must_be_edited_as_section_0(self):
+        self.assert_edited_section(
+            self.page_text.replace("lead", "new lead"), 0
+        )
+        self.assertIsNone(WikiService.get_edited_section(
+            self.page_text,
+            self.page_text.replace("lead", "new lead").replace("c", "d")
+        ))
+
+    def test_whole_page_must_be_sent_when_sections_change(self):
+        for updated_text in (
+                self.page_text + "\n\n==D==\nd",
+                self.page_text.replace("===B2===\nb2\n\n", ""),
+                self.page_text.replace("==A==", "==Renamed=="),
+                self.page_text.replace("==A==", "===A===")):
+            self.assertIsNone(
+                WikiService.get_edited_section(self.page_text, updated_text)
+            )
+        self.assertIsNone(
+            WikiService.get_edited_section(self.page_text, self.page_text)
+        )